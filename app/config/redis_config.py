@@ -1,6 +1,7 @@
 # app\config\redis_config.py
 import os
 import redis
+import redis.asyncio as aioredis
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -18,24 +19,32 @@ class RedisConfig:
         self.max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS"))
         self.socket_timeout = int(os.getenv("REDIS_SOCKET_TIMEOUT"))
         self.socket_connect_timeout = int(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT"))
+        # Seconds an asyncio caller waits for a free pooled connection before erroring
+        self.pool_timeout = float(os.getenv("REDIS_POOL_TIMEOUT", 2.0))
         self.decode_responses = True
         
         self._client: Optional[redis.Redis] = None
         self._connection_pool: Optional[redis.ConnectionPool] = None
+        self._async_client: Optional[aioredis.Redis] = None
+        self._async_connection_pool: Optional[aioredis.ConnectionPool] = None
+    
+    def _pool_kwargs(self) -> dict:
+        """Pool settings shared by the sync and asyncio clients"""
+        return {
+            "host": self.host,
+            "port": self.port,
+            "password": self.password if self.password else None,
+            "db": self.db,
+            "max_connections": self.max_connections,
+            "socket_timeout": self.socket_timeout,
+            "socket_connect_timeout": self.socket_connect_timeout,
+            "decode_responses": self.decode_responses
+        }
     
     def get_connection_pool(self) -> redis.ConnectionPool:
         """Create and return Redis connection pool"""
         if not self._connection_pool:
-            self._connection_pool = redis.ConnectionPool(
-                host=self.host,
-                port=self.port,
-                password=self.password if self.password else None,
-                db=self.db,
-                max_connections=self.max_connections,
-                socket_timeout=self.socket_timeout,
-                socket_connect_timeout=self.socket_connect_timeout,
-                decode_responses=self.decode_responses
-            )
+            self._connection_pool = redis.ConnectionPool(**self._pool_kwargs())
         return self._connection_pool
     
     def get_client(self) -> redis.Redis:
@@ -46,6 +55,27 @@ class RedisConfig:
             )
         return self._client
     
+    def get_async_connection_pool(self) -> aioredis.ConnectionPool:
+        """
+        ⚡ asyncio connection pool - never blocks the event loop. When every
+        connection is in use (a burst of turns, speculations, summaries), callers
+        wait up to pool_timeout for one instead of failing with "Too many connections".
+        """
+        if not self._async_connection_pool:
+            self._async_connection_pool = aioredis.BlockingConnectionPool(
+                timeout=self.pool_timeout,
+                **self._pool_kwargs()
+            )
+        return self._async_connection_pool
+    
+    def get_async_client(self) -> aioredis.Redis:
+        """Get asyncio Redis client instance"""
+        if not self._async_client:
+            self._async_client = aioredis.Redis(
+                connection_pool=self.get_async_connection_pool()
+            )
+        return self._async_client
+    
     def test_connection(self) -> bool:
         """Test Redis connection"""
         try:
@@ -68,6 +98,15 @@ class RedisConfig:
         if self._connection_pool:
             self._connection_pool.disconnect()
             self._connection_pool = None
+    
+    async def close_async(self):
+        """Close asyncio Redis connections"""
+        if self._async_client:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._async_connection_pool:
+            await self._async_connection_pool.disconnect()
+            self._async_connection_pool = None
 
 
 # Redis instance
@@ -77,3 +116,8 @@ redis_config = RedisConfig()
 def get_redis_client() -> redis.Redis:
     """Dependency injection for Redis client"""
     return redis_config.get_client()
+
+
+def get_async_redis_client() -> aioredis.Redis:
+    """asyncio Redis client for code running on the event loop"""
+    return redis_config.get_async_client()
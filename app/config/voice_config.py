@@ -7,6 +7,16 @@ from datetime import datetime
 load_dotenv()
 
 
+def _parse_overrides(raw: str, cast=float) -> dict:
+    """Parse "name=value,name=value" into a dict (used for per-tool settings)"""
+    overrides = {}
+    for item in (raw or "").split(","):
+        name, sep, value = item.partition("=")
+        if sep and name.strip() and value.strip():
+            overrides[name.strip()] = cast(value.strip())
+    return overrides
+
+
 class VoiceAgentConfig:
     """Voice agent configuration settings"""
 
@@ -17,6 +27,16 @@ class VoiceAgentConfig:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
     OPENAI_FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-4o-mini")
+    # ⚡ Model tiering: routine turns on OPENAI_FAST_MODEL, escalate to OPENAI_MODEL when unsure
+    MODEL_TIERING_ENABLED = os.getenv("MODEL_TIERING_ENABLED", "true").lower() == "true"
+    FAST_TIER_MAX_WORDS = int(os.getenv("FAST_TIER_MAX_WORDS", 30))
+    MODEL_LONG_CONTEXT_TOKENS = int(os.getenv("MODEL_LONG_CONTEXT_TOKENS", 1500))
+    FAST_TIER_MIN_AVG_LOGPROB = float(os.getenv("FAST_TIER_MIN_AVG_LOGPROB", -0.7))
+    FAST_TIER_CONFIDENCE_TOKENS = int(os.getenv("FAST_TIER_CONFIDENCE_TOKENS", 12))
+    # ⚡ Rule-based router answers slot-filling turns (hour, name, phone, yes/no) without the LLM
+    FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+    # ⚡ Static system prompt + tools first, date / KB / session facts last (prompt caching)
+    PROMPT_CACHE_LAYOUT = os.getenv("PROMPT_CACHE_LAYOUT", "true").lower() == "true"
     OPENAI_VOICE = os.getenv("OPENAI_VOICE")
     OPENAI_TTS_MODEL = os.getenv("OPENAI_TTS_MODEL")
     OPENAI_STT_MODEL = os.getenv("OPENAI_STT_MODEL")
@@ -24,9 +44,35 @@ class VoiceAgentConfig:
     ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
     ELEVENLABS_VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID")
 
+    # ⚡ Persistent per-call ElevenLabs WebSocket (falls back to HTTP streaming)
+    ELEVENLABS_WS_ENABLED = os.getenv("ELEVENLABS_WS_ENABLED", "false").lower() == "true"
+    ELEVENLABS_WS_INACTIVITY_TIMEOUT = int(os.getenv("ELEVENLABS_WS_INACTIVITY_TIMEOUT", 180))
+    ELEVENLABS_WS_IDLE_TIMEOUT = float(os.getenv("ELEVENLABS_WS_IDLE_TIMEOUT", 3.0))
+
+    # ⚡ Paced playout: send 20ms frames on a real-time clock with a small look-ahead
+    AUDIO_PACED_PLAYOUT = os.getenv("AUDIO_PACED_PLAYOUT", "true").lower() == "true"
+    AUDIO_PLAYOUT_LOOKAHEAD_MS = int(os.getenv("AUDIO_PLAYOUT_LOOKAHEAD_MS", 100))
+
+    # ⚡ Sentence-level TTS: speak each sentence as soon as the LLM finishes it
+    TTS_SENTENCE_STREAMING = os.getenv("TTS_SENTENCE_STREAMING", "false").lower() == "true"
+    TTS_MIN_SEGMENT_CHARS = int(os.getenv("TTS_MIN_SEGMENT_CHARS", 20))
+    TTS_CLAUSE_MIN_CHARS = int(os.getenv("TTS_CLAUSE_MIN_CHARS", 60))
+
     DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY")
+    # ⚡ Speculative LLM: start the first completion on a stable interim transcript
+    SPECULATIVE_LLM_ENABLED = os.getenv("SPECULATIVE_LLM_ENABLED", "false").lower() == "true"
+    SPECULATIVE_MIN_WORDS = int(os.getenv("SPECULATIVE_MIN_WORDS", 3))
+    SPECULATIVE_STABLE_INTERIMS = int(os.getenv("SPECULATIVE_STABLE_INTERIMS", 2))
+    SPECULATIVE_MAX_PER_TURN = int(os.getenv("SPECULATIVE_MAX_PER_TURN", 2))
+    SPECULATIVE_MAX_PER_CALL = int(os.getenv("SPECULATIVE_MAX_PER_CALL", 30))
     VOICE_MODEL: str = os.getenv("VOICE_MODEL")
     CALL_SESSION_TTL = int(os.getenv("CALL_SESSION_TTL"))
+    # ⚡ Messages read back per turn from the Redis conversation list (full log kept for end_call)
+    SESSION_HISTORY_WINDOW = int(os.getenv("SESSION_HISTORY_WINDOW", 40))
+    # ⚡ Token budget of the in-memory conversation window sent to the LLM
+    CONVERSATION_WINDOW_TOKENS = int(os.getenv("CONVERSATION_WINDOW_TOKENS", 2000))
+    # ⚡ Fold turns trimmed from the window into the session's call facts (background)
+    CALL_SUMMARY_ENABLED = os.getenv("CALL_SUMMARY_ENABLED", "true").lower() == "true"
     MAX_CALL_DURATION = int(os.getenv("MAX_CALL_DURATION"))
     MAX_RETRY_ATTEMPTS = int(os.getenv("MAX_RETRY_ATTEMPTS"))
 
@@ -35,6 +81,33 @@ class VoiceAgentConfig:
     QDRANT_COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME")
     QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
     EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME")
+    # ⚡ Query embeddings: in-process LRU entries + Redis (float16) TTL
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", 2000))
+    EMBEDDING_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", 7 * 24 * 3600))
+    # ⚡ Recommended doctors whose profile scores at least this for the symptom get "has_experience"
+    RAG_EXPERIENCE_MIN_SCORE = float(os.getenv("RAG_EXPERIENCE_MIN_SCORE", 0.5))
+
+    # ⚡ In-memory doctor roster (invalidated on writes + Redis pub/sub; max age as a backstop)
+    DOCTOR_ROSTER_MAX_AGE = int(os.getenv("DOCTOR_ROSTER_MAX_AGE", 300))
+
+    # ⚡ Symptom -> specialization: memo / keywords / centroid embeddings before the LLM
+    SPECIALIZATION_CLASSIFIER_ENABLED = os.getenv("SPECIALIZATION_CLASSIFIER_ENABLED", "true").lower() == "true"
+    SPECIALIZATION_MIN_SIMILARITY = float(os.getenv("SPECIALIZATION_MIN_SIMILARITY", 0.4))
+    SPECIALIZATION_MEMO_TTL = int(os.getenv("SPECIALIZATION_MEMO_TTL", 30 * 24 * 3600))
+
+    # ⚡ Semantic answer cache for context-free informational turns
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.92))
+    SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", 3600))
+    SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", 500))
+
+    # ⚡ Tool execution - blocking tool code runs on a dedicated, bounded thread pool
+    TOOL_EXECUTOR_THREADS = int(os.getenv("TOOL_EXECUTOR_THREADS", 8))
+    TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", 8.0))
+    TOOL_MAX_CONCURRENCY = int(os.getenv("TOOL_MAX_CONCURRENCY", 4))
+    # Per-tool overrides: "tool_name=value,tool_name=value" (read-only tools only - writers are never timed out)
+    TOOL_TIMEOUTS = _parse_overrides(os.getenv("TOOL_TIMEOUTS", "get_available_doctors=10"))
+    TOOL_CONCURRENCY_LIMITS = _parse_overrides(os.getenv("TOOL_CONCURRENCY_LIMITS", ""), cast=int)
 
     VOICE_AGENT_ENABLED = os.getenv("VOICE_AGENT_ENABLED").lower() == "true"
     ENABLE_CALL_RECORDING = os.getenv("ENABLE_CALL_RECORDING").lower() == "true"
@@ -44,6 +117,11 @@ class VoiceAgentConfig:
     CLINIC_ADDRESS = os.getenv("CLINIC_ADDRESS", "123 Health Street")
     CLINIC_PHONE = os.getenv("CLINIC_PHONE", TWILIO_PHONE_NUMBER)
 
+    # ⚡ Fixed phrases - pre-rendered at startup by the phrase audio cache
+    GREETING_TEXT = f"Thank you for calling {CLINIC_NAME}! How can I help you today?"
+    ERROR_APOLOGY_TEXT = "I apologize, I'm having trouble. Could you try again?"
+    CANNED_PHRASES = [GREETING_TEXT, ERROR_APOLOGY_TEXT]
+
     # ⚡ PRODUCTION-READY: Handles ALL hospital call scenarios
     SYSTEM_PROMPT = f"""You are a professional medical receptionist for {CLINIC_NAME}. Help callers with any request naturally and efficiently.
 
@@ -18,11 +18,15 @@ import base64
 from app.services.voice_agent_service import VoiceAgentService
 from app.services.deepgram_service import DeepgramManager
 from app.services.elevenlabs_service import elevenlabs_service  
+from app.services.phrase_cache_service import phrase_cache
 from app.services.redis_service import redis_service
+from app.routes.ai_tools import tool_executor
+from app.services.doctor_roster import listen_for_invalidations
 from app.config.voice_config import voice_config
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 import inspect
+import asyncio
 import logging
 import sys
 
@@ -196,6 +200,41 @@ async def general_exception_handler(request: Request, exc: Exception):
         }
     )
 
+@app.on_event("startup")
+async def warm_phrase_cache():
+    """⚡ Pre-render greeting and fallback phrases so calls never wait on TTS for them"""
+    # Keep a reference so the warm-up task is not garbage-collected mid-run
+    app.state.phrase_warmup = asyncio.create_task(phrase_cache.warm(voice_config.CANNED_PHRASES))
+
+
+@app.on_event("startup")
+async def watch_doctor_roster():
+    """⚡ Drop the in-memory doctor roster when another worker changes a doctor"""
+    app.state.roster_listener = asyncio.create_task(listen_for_invalidations())
+
+
+@app.on_event("shutdown")
+async def stop_roster_listener():
+    app.state.roster_listener.cancel()
+
+
+@app.on_event("shutdown")
+async def stop_phrase_warmup():
+    app.state.phrase_warmup.cancel()
+
+
+@app.on_event("shutdown")
+async def close_redis():
+    """Release the asyncio Redis pool used by the voice pipeline"""
+    await redis_config.close_async()
+
+
+@app.on_event("shutdown")
+async def stop_tool_pool():
+    """Stop the AI tool thread pool without waiting on stragglers"""
+    tool_executor.shutdown(wait=False, cancel_futures=True)
+
+
 @app.websocket("/test-ws")
 async def test_websocket(websocket: WebSocket):
     print("Test WebSocket endpoint hit!")
@@ -4,19 +4,23 @@ from datetime import date, datetime, timedelta
 from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 from app.services.doctor_service import DoctorService
+from app.services.doctor_roster import doctor_roster
+from app.services.specialization_classifier import specialization_classifier
+from app.services.embedding_provider import embedding_provider
 from app.services.appointment_service import AppointmentService
-from app.models.leave import DoctorLeave
 from app.schemas.appointment import AppointmentCreate
-from qdrant_client import QdrantClient, models
+from qdrant_client import QdrantClient, AsyncQdrantClient, models
 from app.config.voice_config import voice_config
 import re
 from fastapi import HTTPException
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import traceback
 import json
 import openai
+from openai import AsyncOpenAI
 import os
-from difflib import SequenceMatcher
 
 try:
     qdrant_client = QdrantClient(host=voice_config.QDRANT_HOST, port=voice_config.QDRANT_PORT, api_key=voice_config.QDRANT_API_KEY, https=False)
@@ -25,9 +29,38 @@ except Exception as e:
     print(f"Failed to connect to Qdrant: {e}")
     qdrant_client = None
 
+try:
+    async_qdrant_client = AsyncQdrantClient(host=voice_config.QDRANT_HOST, port=voice_config.QDRANT_PORT, api_key=voice_config.QDRANT_API_KEY, https=False)
+except Exception as e:
+    print(f"Failed to create async Qdrant client: {e}")
+    async_qdrant_client = None
+
 OPENAI_API_KEY = getattr(voice_config, "OPENAI_API_KEY", os.getenv("OPENAI_API_KEY"))
 OPENAI_EMBEDDING_MODEL_NAME = getattr(voice_config, "EMBEDDING_MODEL_NAME", os.getenv("EMBEDDING_MODEL_NAME"))
 openai.api_key = OPENAI_API_KEY
+async_openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+# ⚡ Blocking tool code (SQLAlchemy, sync SDKs) runs here - never on the event loop
+tool_executor = ThreadPoolExecutor(
+    max_workers=voice_config.TOOL_EXECUTOR_THREADS,
+    thread_name_prefix="ai-tool"
+)
+_tool_limiters: Dict[str, asyncio.Semaphore] = {}
+
+
+async def run_blocking(func, *args):
+    """Run a blocking callable on the dedicated tool pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(tool_executor, func, *args)
+
+
+def _tool_limiter(function_name: str) -> asyncio.Semaphore:
+    """Per-tool concurrency limit shared by every call on this worker"""
+    limiter = _tool_limiters.get(function_name)
+    if limiter is None:
+        limit = voice_config.TOOL_CONCURRENCY_LIMITS.get(function_name, voice_config.TOOL_MAX_CONCURRENCY)
+        limiter = _tool_limiters[function_name] = asyncio.Semaphore(max(1, limit))
+    return limiter
 
 try:
     VECTOR_SIZE = 1536
@@ -38,43 +71,59 @@ except Exception as e:
 
 
 def get_openai_embedding(query: str, model=OPENAI_EMBEDDING_MODEL_NAME) -> list:
-    try:
-        response = openai.embeddings.create(input=[query], model=model)
-        return response.data[0].embedding
-    except Exception as e:
-        print(f"Error getting OpenAI embedding: {e}")
-        return None
+    """⚡ Cached via the shared embedding provider (LRU + Redis)"""
+    vector = embedding_provider.embed(query, model)
+    return vector.tolist() if vector is not None else None
+
+
+async def get_openai_embedding_async(query: str, model=OPENAI_EMBEDDING_MODEL_NAME) -> list:
+    vector = await embedding_provider.embed_async(query, model)
+    return vector.tolist() if vector is not None else None
 
 
 def get_ai_specialization_recommendations(symptom: str) -> List[str]:
     """
-    ⚡ AI REASONING: GPT-4 determines which specializations treat the symptom
+    ⚡ AI REASONING: Which specializations treat the symptom - local classifier
+    (memo, keywords, centroid embeddings) first, GPT only when it is unsure
     """
+    specializations = specialization_classifier.classify(symptom)
+    if specializations:
+        return specializations
+
     try:
         print(f"\n🧠 AI Reasoning: Which specialists treat '{symptom}'?")
+
+        response = openai.chat.completions.create(**_specialization_request(symptom))
+        
+        result = response.choices[0].message.content.strip()
+        specializations = _parse_specializations(result)
         
-        prompt = f"""Given symptom/condition: "{symptom}"
+        print(f"✅ AI recommended: {specializations}")
+        specialization_classifier.remember(symptom, specializations)
+        return specializations
+        
+    except Exception as e:
+        print(f"❌ AI reasoning error: {e}")
+        print(f"Raw response: {result if 'result' in locals() else 'N/A'}")
+        return ["General Medicine"]
 
-List medical specializations that can treat this, in priority order.
 
-Return ONLY a JSON array of specialization names, nothing else.
-Example: ["Neurology", "General Medicine", "Psychiatry"]
+async def get_ai_specialization_recommendations_async(symptom: str) -> List[str]:
+    """⚡ Same as get_ai_specialization_recommendations, on the async clients"""
+    specializations = await specialization_classifier.classify_async(symptom)
+    if specializations:
+        return specializations
 
-Include General Medicine as fallback if applicable.
-Max 4 specializations."""
+    try:
+        print(f"\n🧠 AI Reasoning: Which specialists treat '{symptom}'?")
 
-        response = openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=100
-        )
+        response = await async_openai_client.chat.completions.create(**_specialization_request(symptom))
         
         result = response.choices[0].message.content.strip()
-        result = result.replace('```json', '').replace('```', '').strip()
-        specializations = json.loads(result)
+        specializations = _parse_specializations(result)
         
         print(f"✅ AI recommended: {specializations}")
+        await specialization_classifier.remember_async(symptom, specializations)
         return specializations
         
     except Exception as e:
@@ -83,37 +132,42 @@ Max 4 specializations."""
         return ["General Medicine"]
 
 
+def _specialization_request(symptom: str) -> Dict[str, Any]:
+    prompt = f"""Given symptom/condition: "{symptom}"
+
+List medical specializations that can treat this, in priority order.
+
+Return ONLY a JSON array of specialization names, nothing else.
+Example: ["Neurology", "General Medicine", "Psychiatry"]
+
+Include General Medicine as fallback if applicable.
+Max 4 specializations."""
+
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.3,
+        "max_tokens": 100
+    }
+
+
+def _parse_specializations(result: str) -> List[str]:
+    result = result.replace('```json', '').replace('```', '').strip()
+    return json.loads(result)
+
+
 def fuzzy_match_doctor_name(query: str, available_doctors: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    """⚡ Fuzzy match doctor names (handles STT errors)"""
+    """⚡ Fuzzy match doctor names (handles STT errors) via the roster's phonetic + trigram index"""
     if not query or not available_doctors:
         return None
     
-    query_clean = query.lower().strip().replace('dr.', '').replace('dr', '').replace('doctor', '').strip()
-    best_match = None
-    best_score = 0.0
-    
-    for doctor in available_doctors:
-        doctor_name = doctor["name"].lower().replace('dr.', '').replace('dr', '').strip()
-        similarity = SequenceMatcher(None, query_clean, doctor_name).ratio()
-        
-        query_words = query_clean.split()
-        doctor_words = doctor_name.split()
-        
-        for qword in query_words:
-            if len(qword) < 3:
-                continue
-            for dword in doctor_words:
-                word_sim = SequenceMatcher(None, qword, dword).ratio()
-                if word_sim > similarity:
-                    similarity = word_sim
-        
-        if similarity > best_score:
-            best_score = similarity
-            best_match = doctor
+    by_id = {doctor["doctor_id"]: doctor for doctor in available_doctors}
+    matches = doctor_roster.match_names(query, limit=1, active_only=False, doctor_ids=set(by_id))
     
-    if best_score > 0.6:
-        print(f"✓ Fuzzy match: {best_match['name']} (score: {best_score:.2f})")
-        return best_match
+    if matches:
+        best_match, best_score = matches[0]
+        print(f"✓ Fuzzy match: {best_match.name} (score: {best_score:.2f})")
+        return by_id[best_match.doctor_id]
     
     return None
 
@@ -124,20 +178,7 @@ def search_doctor_information(query: str, top_k: int = 3) -> Dict[str, Any]:
     
     # STEP 1: Try fuzzy name matching
     try:
-        from app.config.database import SessionLocal
-        db = SessionLocal()
-        all_doctors = DoctorService.get_all_active_doctors(db)
-        db.close()
-        
-        available_doctors = [
-            {
-                "doctor_id": doc.doctor_id,
-                "name": doc.name,
-                "degree": doc.degree,
-                "specialization": doc.specialization or "General Medicine"
-            }
-            for doc in all_doctors
-        ]
+        available_doctors = _load_doctor_directory()
         
         fuzzy_match = fuzzy_match_doctor_name(query, available_doctors)
         if fuzzy_match:
@@ -171,37 +212,120 @@ def search_doctor_information(query: str, top_k: int = 3) -> Dict[str, Any]:
         return {"success": False, "error": str(e)}
 
 
+async def search_doctor_information_async(query: str, top_k: int = 3) -> Dict[str, Any]:
+    """⚡ HYBRID search on async clients - only the DB read goes to the tool pool"""
+    print(f"\n--- RAG Search: '{query}' ---")
+    
+    # STEP 1: Try fuzzy name matching
+    try:
+        if not doctor_roster.is_loaded:
+            await run_blocking(doctor_roster.warm)
+        available_doctors = _load_doctor_directory()
+        
+        fuzzy_match = fuzzy_match_doctor_name(query, available_doctors)
+        if fuzzy_match:
+            return {"success": True, "results": [fuzzy_match], "matched_via": "fuzzy_name"}
+    except Exception as e:
+        print(f"Fuzzy match error: {e}")
+    
+    # STEP 2: RAG semantic search
+    if not async_qdrant_client:
+        return {"success": False, "error": "Qdrant not available"}
+    
+    try:
+        query_vector = await get_openai_embedding_async(query)
+        if not query_vector:
+            return {"success": False, "error": "Embedding failed"}
+
+        search_result = await async_qdrant_client.search(
+            collection_name=voice_config.QDRANT_COLLECTION_NAME,
+            query_vector=query_vector,
+            limit=top_k,
+            with_payload=True
+        )
+
+        results = [hit.payload for hit in search_result]
+        print(f"✓ RAG: {len(results)} results")
+        return {"success": True, "results": results}
+        
+    except Exception as e:
+        print(f"RAG error: {e}")
+        traceback.print_exc()
+        return {"success": False, "error": str(e)}
+
+
+def _load_doctor_directory() -> List[Dict[str, Any]]:
+    """Active doctors as plain dicts, from the in-memory roster"""
+    return [doctor.to_dict() for doctor in doctor_roster.active_doctors()]
+
+
 def enrich_doctors_with_rag(doctors: List[Dict[str, Any]], user_context: str) -> List[Dict[str, Any]]:
-    """⚡ RAG ENRICHMENT: Add experience context"""
+    """⚡ RAG ENRICHMENT: one embedding + one Qdrant query filtered to the candidate doctors"""
     if not doctors or not user_context or not qdrant_client:
         return doctors
     
     print(f"\n⚡ RAG Enrichment for {len(doctors)} doctors")
-    enriched = []
     
+    try:
+        query_vector = get_openai_embedding(user_context)
+        if not query_vector:
+            return doctors
+        hits = qdrant_client.search(**_enrichment_search(doctors, query_vector))
+    except Exception as e:
+        print(f"  ✗ Enrichment error: {e}")
+        return doctors
+    
+    return _apply_enrichment(doctors, hits)
+
+
+async def enrich_doctors_with_rag_async(doctors: List[Dict[str, Any]], user_context: str) -> List[Dict[str, Any]]:
+    """⚡ RAG ENRICHMENT on async clients - one round-trip however many doctors"""
+    if not doctors or not user_context or not async_qdrant_client:
+        return doctors
+    
+    print(f"\n⚡ RAG Enrichment for {len(doctors)} doctors")
+    
+    try:
+        query_vector = await get_openai_embedding_async(user_context)
+        if not query_vector:
+            return doctors
+        hits = await async_qdrant_client.search(**_enrichment_search(doctors, query_vector))
+    except Exception as e:
+        print(f"  ✗ Enrichment error: {e}")
+        return doctors
+    
+    return _apply_enrichment(doctors, hits)
+
+
+def _enrichment_search(doctors: List[Dict[str, Any]], query_vector: List[float]) -> Dict[str, Any]:
+    """Qdrant search scoring `query_vector` against the given doctors' points only"""
+    doctor_ids = list({doctor["doctor_id"] for doctor in doctors if doctor.get("doctor_id")})
+    return {
+        "collection_name": voice_config.QDRANT_COLLECTION_NAME,
+        "query_vector": query_vector,
+        "query_filter": models.Filter(must=[
+            models.FieldCondition(key="doctor_id", match=models.MatchAny(any=doctor_ids))
+        ]),
+        "limit": len(doctor_ids),
+        "with_payload": ["doctor_id"],
+    }
+
+
+def _apply_enrichment(doctors: List[Dict[str, Any]], hits: List[Any]) -> List[Dict[str, Any]]:
+    """Mark doctors whose profile scores above RAG_EXPERIENCE_MIN_SCORE for the context"""
+    scores: Dict[str, float] = {}
+    for hit in hits:
+        doctor_id = (hit.payload or {}).get("doctor_id")
+        if doctor_id is not None:
+            scores[doctor_id] = max(scores.get(doctor_id, 0.0), hit.score)
+    
+    enriched = []
     for doctor in doctors:
         doctor_copy = doctor.copy()
-        doctor_id = doctor.get("doctor_id")
-        name = doctor.get("name", "")
-        
-        try:
-            search_query = f"{name} {user_context}"
-            rag_result = search_doctor_information(search_query, top_k=1)
-            
-            if rag_result.get("success") and rag_result.get("results"):
-                result = rag_result["results"][0]
-                
-                if result.get("doctor_id") == doctor_id:
-                    bio = result.get("bio", "")
-                    expertise = result.get("expertise", "")
-                    combined = f"{bio} {expertise}".lower()
-                    
-                    if any(word in combined for word in user_context.lower().split()):
-                        doctor_copy["has_experience"] = True
-                        print(f"  ✓ {name}: Has relevant experience")
-        except Exception as e:
-            print(f"  ✗ Enrichment error: {e}")
-        
+        score = scores.get(doctor.get("doctor_id"))
+        if score is not None and score >= voice_config.RAG_EXPERIENCE_MIN_SCORE:
+            doctor_copy["has_experience"] = True
+            print(f"  ✓ {doctor.get('name', '')}: Has relevant experience ({score:.2f})")
         enriched.append(doctor_copy)
     
     return enriched
@@ -311,6 +435,16 @@ AI_FUNCTIONS = [
 ]
 
 
+# ⚡ Tools that only read - safe to run concurrently, each on its own DB session
+READ_ONLY_FUNCTIONS = {
+    "get_available_doctors",
+    "get_available_slots",
+    "get_doctor_schedule",
+    "get_appointment_details",
+    "search_doctor_information"
+}
+
+
 class AIToolsExecutor:
     """Executor for AI function calls"""
     
@@ -324,6 +458,12 @@ class AIToolsExecutor:
             "get_appointment_details": self.get_appointment_details,
             "search_doctor_information": search_doctor_information
         }
+        # ⚡ Native async implementations (async OpenAI / Qdrant clients)
+        self.async_functions = {
+            "get_available_doctors": self.get_available_doctors_async,
+            "search_doctor_information": search_doctor_information_async
+        }
+        self._session_lock: Optional[asyncio.Lock] = None
     
     def execute_function(self, function_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -340,14 +480,7 @@ class AIToolsExecutor:
                     result = func_to_call(**arguments)
 
                 print(f"--- {function_name} complete ---")
-                
-                if isinstance(result, dict) and 'success' in result:
-                    return result
-                elif isinstance(result, dict):
-                    result['success'] = True
-                    return result
-                else:
-                    return {"success": True, "result": result}
+                return self._normalize_result(result)
             else:
                 return {"success": False, "error": f"Unknown function: {function_name}"}
                 
@@ -356,6 +489,96 @@ class AIToolsExecutor:
             traceback.print_exc()
             return {"success": False, "error": str(e)}
 
+    @staticmethod
+    def _normalize_result(result: Any) -> Dict[str, Any]:
+        if isinstance(result, dict) and 'success' in result:
+            return result
+        elif isinstance(result, dict):
+            result['success'] = True
+            return result
+        else:
+            return {"success": True, "result": result}
+
+    @classmethod
+    def execute_isolated(cls, function_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a read-only tool on a private DB session so several can run in parallel threads"""
+        from app.config.database import SessionLocal
+        db = SessionLocal()
+        try:
+            return cls(db).execute_function(function_name, arguments)
+        finally:
+            db.close()
+
+    async def execute_function_async(
+        self,
+        function_name: str,
+        arguments: Dict[str, Any],
+        isolated: bool = False
+    ) -> Dict[str, Any]:
+        """
+        ⚡ NON-BLOCKING tool execution
+        Tools with an async implementation run on the event loop; the rest run on
+        the dedicated tool pool - on a private DB session when `isolated`, else on
+        this executor's session (one at a time). Each tool has its own timeout and
+        concurrency limit, so a slow tool only delays the call that asked for it.
+        Writer tools are never timed out: their thread would keep running and could
+        still commit (e.g. a booking) after the turn had reported a failure.
+        """
+        timeout = voice_config.TOOL_TIMEOUTS.get(function_name, voice_config.TOOL_TIMEOUT)
+        
+        async with _tool_limiter(function_name):
+            if function_name not in READ_ONLY_FUNCTIONS:
+                return await self._dispatch_async(function_name, arguments, isolated)
+            
+            try:
+                return await asyncio.wait_for(
+                    self._dispatch_async(function_name, arguments, isolated),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                print(f"⏱️ {function_name} timed out after {timeout:.1f}s")
+                return {"success": False, "error": f"{function_name} timed out", "timed_out": True}
+
+    async def _dispatch_async(self, function_name: str, arguments: Dict[str, Any], isolated: bool) -> Dict[str, Any]:
+        async_func = self.async_functions.get(function_name)
+        
+        if async_func is None:
+            if isolated:
+                return await run_blocking(self.execute_isolated, function_name, arguments)
+            return await self._execute_on_session(function_name, arguments)
+        
+        try:
+            print(f"\n--- Executing (async): {function_name} ---")
+            print(f"Arguments: {arguments}")
+            result = await async_func(**arguments)
+            print(f"--- {function_name} complete ---")
+            return self._normalize_result(result)
+        except Exception as e:
+            print(f"Error in {function_name}: {e}")
+            traceback.print_exc()
+            return {"success": False, "error": str(e)}
+
+    async def _execute_on_session(self, function_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a tool on the shared session in the tool pool. The lock is held until
+        the thread finishes - even after a timeout - so the session is never used
+        by two threads at once.
+        """
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        
+        await self._session_lock.acquire()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                tool_executor, self.execute_function, function_name, arguments
+            )
+        except BaseException:
+            self._session_lock.release()
+            raise
+        
+        future.add_done_callback(lambda _: self._session_lock.release())
+        return await asyncio.shield(future)
+
     def get_available_doctors(self, user_context: str = "") -> Dict[str, Any]:
         """⚡ AI-POWERED: Intelligent doctor recommendations"""
         try:            
@@ -364,24 +587,7 @@ class AIToolsExecutor:
             print(f"User context: '{user_context}'")
             print(f"{'='*80}\n")
             
-            doctors = DoctorService.get_all_active_doctors(self.db)
-            today = date.today()
-            doctors_on_leave = self.db.query(DoctorLeave.doctor_id).filter(
-                DoctorLeave.start_date <= today,
-                DoctorLeave.end_date >= today
-            ).all()
-            
-            on_leave_ids = [leave.doctor_id for leave in doctors_on_leave]
-
-            active_doctors = []
-            for doc in doctors:
-                if doc.doctor_id not in on_leave_ids:
-                    active_doctors.append({
-                        "doctor_id": doc.doctor_id,
-                        "name": doc.name,
-                        "degree": doc.degree,
-                        "specialization": doc.specialization or "General Medicine"
-                    })
+            active_doctors = self._list_doctors_not_on_leave()
             
             print(f"📋 {len(active_doctors)} doctors available")
 
@@ -398,34 +604,74 @@ class AIToolsExecutor:
             if user_context:
                 recommended_doctors = enrich_doctors_with_rag(recommended_doctors, user_context)
             
-            for doc in recommended_doctors:
-                spec = doc.get("matched_specialization", "available")
-                has_exp = doc.get("has_experience", False)
-                
-                if has_exp:
-                    doc["recommendation_reason"] = f"{spec}, experienced with similar cases"
-                elif spec != "available":
-                    doc["recommendation_reason"] = f"{spec} specialist"
-                else:
-                    doc["recommendation_reason"] = f"available {doc.get('specialization', 'doctor')}"
+            return self._doctor_recommendations(recommended_doctors, specializations)
             
-            print(f"\n✅ Top {len(recommended_doctors)} doctors:")
-            for doc in recommended_doctors:
-                print(f"  - {doc['name']}: {doc.get('recommendation_reason', 'available')}")
-            print(f"\n{'='*80}\n")
+        except Exception as e:
+            print(f"Error: {e}")
+            traceback.print_exc()
+            return {"success": False, "error": str(e), "doctors": []}
 
-            return {
-                "success": True,
-                "count": len(recommended_doctors),
-                "doctors": recommended_doctors,
-                "ai_recommended_specializations": specializations
-            }
+    async def get_available_doctors_async(self, user_context: str = "") -> Dict[str, Any]:
+        """⚡ get_available_doctors on async clients - only the DB read uses the tool pool"""
+        try:
+            print(f"\n🧠 AI-POWERED DOCTOR RECOMMENDATION (async) - context: '{user_context}'")
+            
+            if not doctor_roster.is_loaded:
+                await run_blocking(doctor_roster.warm)
+            active_doctors = self._list_doctors_not_on_leave()
+            
+            print(f"📋 {len(active_doctors)} doctors available")
+
+            if not active_doctors:
+                return {"success": False, "message": "No doctors available", "doctors": []}
+            
+            if user_context:
+                specializations = await get_ai_specialization_recommendations_async(user_context)
+            else:
+                specializations = ["General Medicine"]
+            
+            recommended_doctors = find_doctors_by_specializations(active_doctors, specializations, max_results=3)
+            
+            if user_context:
+                recommended_doctors = await enrich_doctors_with_rag_async(recommended_doctors, user_context)
+            
+            return self._doctor_recommendations(recommended_doctors, specializations)
             
         except Exception as e:
             print(f"Error: {e}")
             traceback.print_exc()
             return {"success": False, "error": str(e), "doctors": []}
 
+    @staticmethod
+    def _list_doctors_not_on_leave() -> List[Dict[str, Any]]:
+        """Active doctors not on leave today, from the in-memory roster"""
+        return [doctor.to_dict() for doctor in doctor_roster.available_doctors()]
+
+    @staticmethod
+    def _doctor_recommendations(recommended_doctors: List[Dict[str, Any]], specializations: List[str]) -> Dict[str, Any]:
+        for doc in recommended_doctors:
+            spec = doc.get("matched_specialization", "available")
+            has_exp = doc.get("has_experience", False)
+            
+            if has_exp:
+                doc["recommendation_reason"] = f"{spec}, experienced with similar cases"
+            elif spec != "available":
+                doc["recommendation_reason"] = f"{spec} specialist"
+            else:
+                doc["recommendation_reason"] = f"available {doc.get('specialization', 'doctor')}"
+        
+        print(f"\n✅ Top {len(recommended_doctors)} doctors:")
+        for doc in recommended_doctors:
+            print(f"  - {doc['name']}: {doc.get('recommendation_reason', 'available')}")
+        print(f"\n{'='*80}\n")
+
+        return {
+            "success": True,
+            "count": len(recommended_doctors),
+            "doctors": recommended_doctors,
+            "ai_recommended_specializations": specializations
+        }
+
     def get_appointment_details(self, patient_name: str, patient_phone: str) -> Dict[str, Any]:
         """Fetch appointment details"""
         try:
@@ -498,18 +744,8 @@ class AIToolsExecutor:
     def _find_doctor_id_by_name(self, doctor_name: str) -> str:
         """Find doctor by name"""
         try:
-            doctors = DoctorService.get_all_doctors(self.db)
-            doctor_name_clean = doctor_name.lower().replace('dr.', '').replace('dr', '').replace('doctor', '').strip()
-            
-            for doc in doctors:
-                if doc.name.lower().strip() == doctor_name_clean:
-                    return doc.doctor_id
-
-            for doc in doctors:
-                if doctor_name_clean in doc.name.lower() or doc.name.lower() in doctor_name_clean:
-                    return doc.doctor_id
-            
-            return None
+            doctor = doctor_roster.find_by_name(doctor_name)
+            return doctor.doctor_id if doctor else None
         except Exception as e:
             print(f"Error: {e}")
             return None
@@ -677,7 +913,7 @@ class AIToolsExecutor:
                     
                     appointment = AppointmentService.create_appointment(self.db, appointment_data)
                     if appointment:
-                        doctor = DoctorService.get_doctor_by_id(self.db, doctor_id)
+                        doctor = doctor_roster.get(doctor_id) or DoctorService.get_doctor_by_id(self.db, doctor_id)
                         
                         # Convert to 12-hour format for confirmation
                         slot_hour = int(slot.split(':')[0])
@@ -1,11 +1,10 @@
-# app/routes/voice_agent.py - FIXED: Wait for complete response
+# app/routes/voice_agent.py - Sentence streaming + interruption support
 
 from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect, Form, Query, Depends
 from fastapi.responses import Response, JSONResponse
 from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncGenerator, Tuple
 import json
-import base64
 import traceback
 import asyncio
 import logging
@@ -14,14 +13,18 @@ from twilio.twiml.voice_response import VoiceResponse, Connect
 from app.config.database import SessionLocal, get_db
 from app.config.voice_config import voice_config
 from app.services.voice_agent_service import VoiceAgentService
-from app.services.redis_service import redis_service
+from app.services.redis_service import async_redis_service
 from app.models.call_session import CallSession
 from app.services.stream_service import StreamService
 from app.services.elevenlabs_service import elevenlabs_service
+from app.services.elevenlabs_ws_service import ElevenLabsStreamingClient
+from app.services.phrase_cache_service import phrase_cache
 from app.services.deepgram_service import DeepgramManager
 import time
 from starlette.websockets import WebSocketState
 from app.utils.latency_tracker import latency_tracker
+from app.utils.text_segmenter import SentenceSegmenter
+from app.utils.call_scope import CallTaskScope
 
 logger = logging.getLogger("voice")
 
@@ -29,8 +32,13 @@ router = APIRouter(prefix="/voice", tags=["Voice Agent"])
 
 call_context: Dict[str, Dict[str, Any]] = {}
 
-# ⚡ Track active TTS tasks for interruption
-active_tts_tasks = {}
+
+def _spawn(call_sid: str, coro, kind: str) -> asyncio.Task:
+    """Start a task in the call's cancellation scope (plain task if the call is gone)"""
+    scope: Optional[CallTaskScope] = call_context.get(call_sid, {}).get("scope")
+    if scope:
+        return scope.spawn(coro, kind)
+    return asyncio.create_task(coro)
 
 
 async def _generate_and_stream_audio(
@@ -42,7 +50,8 @@ async def _generate_and_stream_audio(
     call_sid: str = None
 ) -> None:
     """
-    Helper function to generate and stream audio with interruption support
+    Helper function to generate and stream audio.
+    Barge-in cancels the owning task, which closes the TTS stream mid-chunk.
     """
     if not text or not text.strip():
         return
@@ -55,35 +64,18 @@ async def _generate_and_stream_audio(
         
         chunk_count = 0
         
-        # Track this TTS task
-        task_id = str(uuid.uuid4())[:8]
-        if call_sid:
-            if call_sid not in active_tts_tasks:
-                active_tts_tasks[call_sid] = set()
-            active_tts_tasks[call_sid].add(task_id)
-        
-        try:
-            async for audio_b64 in tts_service.generate(text):
-                # Check for interruption
-                if call_sid and task_id not in active_tts_tasks.get(call_sid, set()):
-                    logger.warning(f"🚨 TTS task {task_id} cancelled due to interruption")
-                    break
+        async for audio in tts_service.generate(text):
+            if audio:
+                if chunk_count == 0 and metrics and not is_partial:
+                    metrics.tts_first_chunk = time.time()
+                    ttfa = (metrics.tts_first_chunk - metrics.transcript_received_at) * 1000
+                    logger.info(f"⚡ First audio in {ttfa:.0f}ms")
                 
-                if audio_b64:
-                    if chunk_count == 0 and metrics and not is_partial:
-                        metrics.tts_first_chunk = time.time()
-                        ttfa = (metrics.tts_first_chunk - metrics.transcript_received_at) * 1000
-                        logger.info(f"⚡ First audio in {ttfa:.0f}ms")
-                    
-                    chunk_count += 1
-                    if metrics:
-                        metrics.tts_chunks_count += chunk_count
-                    
-                    await stream_service.send_audio_chunk(audio_b64, metrics)
-        finally:
-            # Clean up task tracking
-            if call_sid and call_sid in active_tts_tasks:
-                active_tts_tasks[call_sid].discard(task_id)
+                chunk_count += 1
+                if metrics:
+                    metrics.tts_chunks_count += chunk_count
+                
+                await stream_service.send_audio_chunk(audio, metrics)
         
         if not is_partial and metrics:
             metrics.tts_complete = time.time()
@@ -96,35 +88,231 @@ async def _generate_and_stream_audio(
         traceback.print_exc()
 
 
+async def _synthesize_segment(
+    text: str,
+    tts_service: any,
+    audio_queue: asyncio.Queue
+) -> None:
+    """
+    Synthesize one sentence segment into its own audio queue (None marks the end)
+    """
+    try:
+        async for audio in tts_service.generate(text):
+            if audio:
+                await audio_queue.put(audio)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Segment TTS error: {e}")
+    finally:
+        audio_queue.put_nowait(None)
+
+
+async def _synthesize_stream(
+    text_queue: asyncio.Queue,
+    tts_service: ElevenLabsStreamingClient,
+    audio_queue: asyncio.Queue
+) -> None:
+    """
+    Synthesize a whole reply on one WS context, fed segment by segment (None marks the end)
+    """
+    try:
+        async for audio in tts_service.stream_segments(text_queue):
+            if audio:
+                await audio_queue.put(audio)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Stream TTS error: {e}")
+    finally:
+        audio_queue.put_nowait(None)
+
+
+async def _play_segments(
+    segment_queue: asyncio.Queue,
+    stream_service: StreamService,
+    metrics: 'LatencyMetrics',
+    call_sid: str = None
+) -> None:
+    """
+    ⚡ Play synthesized segments strictly in order while later ones are still rendering
+    """
+    chunk_count = 0
+    
+    while True:
+        item = await segment_queue.get()
+        if item is None:
+            break
+        
+        audio_queue: asyncio.Queue = item
+        
+        while True:
+            audio = await audio_queue.get()
+            if audio is None:
+                break
+            
+            if chunk_count == 0:
+                await stream_service.clear()
+                if metrics:
+                    metrics.tts_first_chunk = time.time()
+                    ttfa = (metrics.tts_first_chunk - metrics.transcript_received_at) * 1000
+                    logger.info(f"⚡ First audio in {ttfa:.0f}ms (sentence streaming)")
+            
+            chunk_count += 1
+            if metrics:
+                metrics.tts_chunks_count += 1
+            
+            await stream_service.send_audio_chunk(audio, metrics)
+    
+    if metrics:
+        metrics.tts_complete = time.time()
+    
+    if chunk_count == 0:
+        logger.error("❌ No audio generated")
+
+
+async def _stream_response_by_sentence(
+    call_sid: str,
+    chunks: AsyncGenerator[Dict[str, Any], None],
+    stream_service: StreamService,
+    tts_service: any,
+    metrics: 'LatencyMetrics'
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    ⚡ Send each completed sentence to TTS as soon as the LLM finishes it.
+    Segments render concurrently but are played back in order; on the ElevenLabs
+    WS client they are pushed into a single context instead (incremental input).
+    Returns the full response text and the final result payload.
+    """
+    segmenter = SentenceSegmenter(
+        min_chars=voice_config.TTS_MIN_SEGMENT_CHARS,
+        clause_min_chars=voice_config.TTS_CLAUSE_MIN_CHARS
+    )
+    segment_queue: asyncio.Queue = asyncio.Queue()
+    synth_tasks = []
+    text_buffer = ""
+    ai_result = None
+    
+    if metrics:
+        metrics.tts_streaming = True
+    
+    player = _spawn(call_sid, _play_segments(segment_queue, stream_service, metrics, call_sid), "tts")
+    
+    text_queue: Optional[asyncio.Queue] = None
+    if isinstance(tts_service, ElevenLabsStreamingClient):
+        text_queue = asyncio.Queue()
+        audio_queue: asyncio.Queue = asyncio.Queue()
+        synth_tasks.append(_spawn(call_sid, _synthesize_stream(text_queue, tts_service, audio_queue), "tts"))
+        segment_queue.put_nowait(audio_queue)
+    
+    def start_segment(segment: str) -> None:
+        if player.done():
+            return
+        if metrics:
+            if metrics.tts_request_start is None:
+                metrics.tts_request_start = time.time()
+            metrics.tts_segments_count += 1
+        if text_queue is not None:
+            logger.info(f"🗣️ Segment: '{segment[:60]}'")
+            text_queue.put_nowait(segment)
+            return
+        logger.info(f"🗣️ Segment {len(synth_tasks) + 1}: '{segment[:60]}'")
+        audio_queue: asyncio.Queue = asyncio.Queue()
+        synth_tasks.append(_spawn(call_sid, _synthesize_segment(segment, tts_service, audio_queue), "tts"))
+        segment_queue.put_nowait(audio_queue)
+    
+    try:
+        async for chunk_data in chunks:
+            chunk_type = chunk_data["type"]
+            
+            if chunk_type == "text":
+                text_buffer += chunk_data["data"]
+                for segment in segmenter.feed(chunk_data["data"]):
+                    start_segment(segment)
+            
+            elif chunk_type == "complete":
+                ai_result = chunk_data["data"]
+                break
+            
+            elif chunk_type == "error":
+                logger.error(f"❌ Streaming error: {chunk_data['data']}")
+                break
+        
+        for segment in segmenter.flush():
+            start_segment(segment)
+        
+        if metrics:
+            metrics.response_text_complete = time.time()
+        
+        if text_queue is not None:
+            text_queue.put_nowait(None)
+        segment_queue.put_nowait(None)
+        await player
+    
+    finally:
+        if not player.done():
+            player.cancel()
+        for task in synth_tasks:
+            if not task.done():
+                task.cancel()
+    
+    return text_buffer, ai_result
+
+
 async def handle_interruption(call_sid: str):
     """
-    Handle user interruption while AI is speaking
+    Handle user interruption while AI is speaking.
+    ⚡ TRUE BARGE-IN: cancels the in-flight turn (LLM stream, tools, TTS) so the
+    HTTP streams close immediately, then clears Twilio's buffer.
     """
     try:
+        interrupted_at = time.time()
         logger.warning("🚨 INTERRUPTION: User started speaking while AI was talking")
         
-        # Cancel all active TTS tasks
-        if call_sid in active_tts_tasks:
-            tasks_to_cancel = active_tts_tasks[call_sid].copy()
-            logger.info(f"🚨 Cancelling {len(tasks_to_cancel)} TTS tasks")
-            active_tts_tasks[call_sid].clear()
+        context = call_context.get(call_sid)
+        if not context:
+            return
+        
+        metrics = None
+        interaction_id = context.get("active_interaction")
+        if interaction_id:
+            metrics = latency_tracker.get_metrics(interaction_id)
+        
+        if metrics:
+            metrics.interrupted_at = interrupted_at
+        
+        # Cancel the turn and every TTS task it started
+        scope: Optional[CallTaskScope] = context.get("scope")
+        cancelled = scope.cancel_all("interruption") if scope else 0
         
         # Clear audio buffer
-        context = call_context.get(call_sid)
-        if context:
-            stream_service = context.get("stream_service")
-            if stream_service:
-                await stream_service.clear()
-                logger.info("🧹 Audio buffer cleared")
+        stream_service = context.get("stream_service")
+        if stream_service:
+            await stream_service.clear()
+            logger.info("🧹 Audio buffer cleared")
+        
+        if metrics:
+            metrics.silence_at = time.time()
+            metrics.cancelled_tasks = cancelled
         
         # Update Deepgram state
-        context = call_context.get(call_sid)
-        if context:
-            deepgram_service = context.get("deepgram")
-            if deepgram_service:
-                deepgram_service.set_speaking_state(False)
+        deepgram_service = context.get("deepgram")
+        if deepgram_service:
+            deepgram_service.set_speaking_state(False)
         
-        logger.info("✅ Interruption handled successfully")
+        # Let the cancelled streams unwind so their connections are released
+        if scope and cancelled:
+            unwound = await scope.wait_idle(timeout=2.0)
+            if metrics:
+                metrics.cancel_unwound_at = time.time()
+            if not unwound:
+                logger.warning("⏱️ Cancelled tasks still unwinding after 2s")
+        
+        # The cancelled turn leaves its summary to us so barge-in timings are included
+        if metrics:
+            latency_tracker.complete_interaction(interaction_id)
+        
+        logger.info(f"✅ Interruption handled ({cancelled} task(s) cancelled)")
         
     except Exception as e:
         logger.error(f"❌ Error handling interruption: {e}")
@@ -139,7 +327,8 @@ async def handle_full_transcript(
     speech_end_time: float = None
 ):
     """
-    ⚡ FIXED: Wait for complete response - no early streaming (smooth audio)
+    ⚡ Speak the AI response - either sentence by sentence while the LLM is still
+    generating (TTS_SENTENCE_STREAMING) or as one smooth utterance once complete
     """
     interaction_id = str(uuid.uuid4())[:8]
     metrics = latency_tracker.start_interaction(call_sid, interaction_id)
@@ -163,30 +352,39 @@ async def handle_full_transcript(
     if deepgram_service:
         deepgram_service.set_speaking_state(True)
     
+    context["active_interaction"] = interaction_id
+    
     try:
         text_buffer = ""
-        response_complete = False
         ai_result = None
         
-        # ⚡ SIMPLIFIED: Collect ALL text first (no early streaming)
-        async for chunk_data in agent.process_user_speech_streaming(call_sid, transcript, metrics):
-            chunk_type = chunk_data["type"]
-            
-            if chunk_type == "text":
-                text_chunk = chunk_data["data"]
-                text_buffer += text_chunk
+        if voice_config.TTS_SENTENCE_STREAMING:
+            text_buffer, ai_result = await _stream_response_by_sentence(
+                call_sid,
+                agent.process_user_speech_streaming(call_sid, transcript, metrics),
+                stream_service,
+                tts_service,
+                metrics
+            )
+        else:
+            # Collect ALL text first (single smooth audio)
+            async for chunk_data in agent.process_user_speech_streaming(call_sid, transcript, metrics):
+                chunk_type = chunk_data["type"]
                 
-            elif chunk_type == "complete":
-                ai_result = chunk_data["data"]
-                response_complete = True
-                break
-            
-            elif chunk_type == "error":
-                logger.error(f"❌ Streaming error: {chunk_data['data']}")
-                break
+                if chunk_type == "text":
+                    text_chunk = chunk_data["data"]
+                    text_buffer += text_chunk
+                    
+                elif chunk_type == "complete":
+                    ai_result = chunk_data["data"]
+                    break
+                
+                elif chunk_type == "error":
+                    logger.error(f"❌ Streaming error: {chunk_data['data']}")
+                    break
         
-        # ⚡ NOW generate TTS for COMPLETE response (single smooth audio)
-        if text_buffer.strip():
+        # ⚡ Buffered mode: generate TTS for COMPLETE response
+        if not voice_config.TTS_SENTENCE_STREAMING and text_buffer.strip():
             word_count = len(text_buffer.split())
             logger.info(f"⚡ Generating TTS for complete response ({word_count} words)")
             await _generate_and_stream_audio(
@@ -204,11 +402,24 @@ async def handle_full_transcript(
                 preview = response_text[:80] + ('...' if len(response_text) > 80 else '')
                 logger.info(f"💬 AI: '{preview}'")
         
-        if deepgram_service:
+        # ⚡ Stay in "speaking" state until Twilio has actually played the reply
+        if stream_service.paced and metrics.total_audio_bytes:
+            mark = await stream_service.send_mark(f"resp-{interaction_id}", metrics)
+            await stream_service.wait_for_mark(mark)
+        
+        # A newer reply may have taken over while we waited for playback
+        if deepgram_service and context.get("active_interaction") == interaction_id:
             deepgram_service.set_speaking_state(False)
         
         latency_tracker.complete_interaction(interaction_id)
         
+    except asyncio.CancelledError:
+        # ⚡ Barge-in: the LLM / TTS streams were closed by their generators' finally blocks
+        logger.info(f"🛑 Interaction {interaction_id} cancelled")
+        if not metrics.interrupted_at:
+            latency_tracker.complete_interaction(interaction_id)
+        raise
+        
     except Exception as e:
         logger.error(f"❌ Error: {e}")
         traceback.print_exc()
@@ -222,12 +433,11 @@ async def handle_full_transcript(
             pass
 
         try:
-            error_msg = "I apologize, I'm having trouble. Could you try again?"
             logger.info("🔧 Sending error message...")
 
-            async for audio_b64 in tts_service.generate(error_msg):
-                if audio_b64:
-                    await stream_service.send_audio_chunk(audio_b64, None)
+            async for audio in phrase_cache.generate(voice_config.ERROR_APOLOGY_TEXT, tts_service):
+                if audio:
+                    await stream_service.send_audio_chunk(audio, None)
 
             logger.info("✓ Error message sent")
 
@@ -367,6 +577,8 @@ async def websocket_stream(websocket: WebSocket):
     deepgram_manager = None
     agent = None
     deepgram_service = None
+    # ⚡ Owns every LLM / tool / TTS task of this call so barge-in can cancel them
+    scope = CallTaskScope(call_sid)
     
     try:
         logger.info("Initializing StreamService...")
@@ -374,7 +586,14 @@ async def websocket_stream(websocket: WebSocket):
         logger.info("StreamService initialized")
         
         logger.info("Initializing Elevenlabs TTSService...")
-        tts_service = elevenlabs_service
+        if voice_config.ELEVENLABS_WS_ENABLED:
+            # ⚡ One TTS socket per call - handshake overlaps with call setup
+            tts_service = ElevenLabsStreamingClient()
+            if not await tts_service.connect():
+                logger.warning("ElevenLabs WS unavailable, using HTTP streaming")
+                tts_service = elevenlabs_service
+        else:
+            tts_service = elevenlabs_service
         logger.info("Elevenlabs initialized")
         
         logger.info("Initializing DeepgramManager...")
@@ -386,14 +605,21 @@ async def websocket_stream(websocket: WebSocket):
         await agent.initiate_call(call_sid, "WebSocket", "WebSocket")
         logger.info("VoiceAgentService initialized (AI Tools ready!)")
         
+        async def on_stable_transcript(transcript: str, _: float) -> None:
+            # ⚡ Don't hold up Deepgram's transcript handler - speculate in the background
+            _spawn(call_sid, agent.speculate(call_sid, transcript), "speculation")
+        
         logger.info("Initializing Deepgram STT...")
         try:
             deepgram_service = deepgram_manager.create_connection(
                 call_sid=call_sid,
-                on_speech_end_callback=lambda transcript, speech_end_time: asyncio.create_task(
-                    handle_full_transcript(call_sid, transcript, stream_service, tts_service, speech_end_time)
+                on_speech_end_callback=lambda transcript, speech_end_time: _spawn(
+                    call_sid,
+                    handle_full_transcript(call_sid, transcript, stream_service, tts_service, speech_end_time),
+                    "turn"
                 ),
-                on_interruption_callback=lambda: asyncio.create_task(handle_interruption(call_sid))
+                on_interruption_callback=lambda: asyncio.create_task(handle_interruption(call_sid)),
+                on_stable_transcript_callback=on_stable_transcript if voice_config.SPECULATIVE_LLM_ENABLED else None
             )
 
             
@@ -415,7 +641,8 @@ async def websocket_stream(websocket: WebSocket):
             "agent": agent,
             "deepgram": deepgram_service,
             "stream_service": stream_service,
-            "tts_service": tts_service
+            "tts_service": tts_service,
+            "scope": scope
         }
         logger.info("Context stored")
         
@@ -433,25 +660,23 @@ async def websocket_stream(websocket: WebSocket):
             logger.info(f"Stream started: {stream_sid}")
             
             try:
-                redis_service.update_session(call_sid, {"stream_sid": stream_sid})
+                await async_redis_service.update_session(call_sid, {"stream_sid": stream_sid})
             except Exception as e:
                 logger.error(f"Redis error: {e}")
             
             await stream_service.clear()
-            greeting_text = f"Thank you for calling {voice_config.CLINIC_NAME}! How can I help you today?"
             logger.info(f"Sending greeting...")
             
             try:
                 greeting_chunks = []
-                async for audio_b64 in tts_service.generate(greeting_text):
-                    if audio_b64:
-                        greeting_chunks.append(audio_b64)
+                # ⚡ Pre-rendered at startup - no TTS latency or API cost
+                async for audio in phrase_cache.generate(voice_config.GREETING_TEXT, tts_service):
+                    if audio:
+                        greeting_chunks.append(audio)
 
                 if greeting_chunks:
-                    combined_greeting = b''.join([base64.b64decode(c) for c in greeting_chunks])
-                    final_greeting_b64 = base64.b64encode(combined_greeting).decode('ascii')
-                                
-                    await stream_service._send_audio(final_greeting_b64)
+                    # Raw bytes - joined once, framed once, never re-encoded
+                    await stream_service.send_audio_chunk(b''.join(greeting_chunks))
 
                     logger.info("Greeting sent")
                     has_sent_greeting = True
@@ -487,24 +712,20 @@ async def websocket_stream(websocket: WebSocket):
                         logger.info(f"Stream started: {stream_sid}")
                         
                         try:
-                            redis_service.update_session(call_sid, {"stream_sid": stream_sid})
+                            await async_redis_service.update_session(call_sid, {"stream_sid": stream_sid})
                         except:
                             pass
                         
-                        greeting_text = f"Thank you for calling {voice_config.CLINIC_NAME}! How can I help you today?"
                         logger.info("Sending greeting...")
                         
                         try:
                             greeting_chunks = []
-                            async for audio_b64 in tts_service.generate(greeting_text):
-                                if audio_b64:
-                                    greeting_chunks.append(audio_b64)
+                            async for audio in phrase_cache.generate(voice_config.GREETING_TEXT, tts_service):
+                                if audio:
+                                    greeting_chunks.append(audio)
 
                             if greeting_chunks:
-                                combined_greeting = b''.join([base64.b64decode(c) for c in greeting_chunks])
-                                final_greeting_b64 = base64.b64encode(combined_greeting).decode('ascii')
-                                
-                                await stream_service._send_audio(final_greeting_b64)
+                                await stream_service.send_audio_chunk(b''.join(greeting_chunks))
 
                             logger.info("✓ Greeting sent")
                             has_sent_greeting = True
@@ -520,8 +741,8 @@ async def websocket_stream(websocket: WebSocket):
                 
                 elif event == "mark":
                     mark_name = data.get("mark", {}).get("name")
-                    if message_count % 50 == 0:
-                        logger.debug(f"✓ Mark: {mark_name}")
+                    stream_service.on_mark(mark_name)
+                    logger.debug(f"✓ Mark played: {mark_name}")
                 
                 elif event == "stop":
                     logger.info("\nStop event received")
@@ -546,9 +767,23 @@ async def websocket_stream(websocket: WebSocket):
         logger.info(f"\n{'=' * 80}")
         logger.info("Cleaning up...")
         
-        if call_sid in active_tts_tasks:
-            active_tts_tasks[call_sid].clear()
-            del active_tts_tasks[call_sid]
+        try:
+            await scope.close()
+        except Exception as e:
+            logger.error(f"Task cleanup error: {e}")
+        
+        if stream_service:
+            try:
+                await stream_service.close()
+            except Exception as e:
+                logger.error(f"Playout cleanup error: {e}")
+        
+        if isinstance(tts_service, ElevenLabsStreamingClient):
+            try:
+                await tts_service.close()
+                logger.info("ElevenLabs WS closed")
+            except Exception as e:
+                logger.error(f"ElevenLabs WS cleanup error: {e}")
         
         if deepgram_service and deepgram_manager:
             try:
@@ -4,7 +4,7 @@ import asyncio
 import base64
 import logging
 import os
-from typing import Callable, Awaitable, Dict
+from typing import Callable, Awaitable, Dict, Optional
 from app.config.voice_config import voice_config
 from deepgram import DeepgramClient, DeepgramClientOptions, LiveTranscriptionEvents, LiveOptions
 import traceback
@@ -20,13 +20,18 @@ class DeepgramService:
     def __init__(
         self, 
         on_speech_end_callback: TranscriptCallback,
-        on_interruption_callback: InterruptionCallback = None
+        on_interruption_callback: InterruptionCallback = None,
+        on_stable_transcript_callback: Optional[TranscriptCallback] = None
     ):
         self.dg_connection = None
         self.final_result = ""
         self.speech_final = False
         self._on_speech_end = on_speech_end_callback
         self._on_interruption = on_interruption_callback
+        self._on_stable_transcript = on_stable_transcript_callback
+        self._last_interim = ""
+        self._interim_repeats = 0
+        self._stable_reported = ""
         self.audio_sent_count = 0
         self._connection_established = False
         self._is_speaking = False  # ⚡ NEW: Track if AI is speaking
@@ -173,6 +178,22 @@ class DeepgramService:
     async def _on_metadata(self, *args, **kwargs):
         logger.debug("Received metadata from Deepgram")
     
+    async def _report_stable(self, text: str) -> None:
+        """⚡ Hand a transcript that is unlikely to change to the speculative LLM"""
+        if not self._on_stable_transcript or self._is_speaking:
+            return
+        if not text or text == self._stable_reported:
+            return
+        self._stable_reported = text
+        logger.debug(f"Stable: '{text}'")
+        await self._on_stable_transcript(text, time.time())
+    
+    def _reset_utterance(self) -> None:
+        self.final_result = ""
+        self._last_interim = ""
+        self._interim_repeats = 0
+        self._stable_reported = ""
+    
     async def _on_utterance_end(self, *args, **kwargs):
         """⚡ OPTIMIZED: Better utterance end detection"""
         if self.final_result.strip():
@@ -185,7 +206,7 @@ class DeepgramService:
             logger.info("=" * 80)
             
             await self._on_speech_end(final_text, speech_end_time)
-            self.final_result = ""
+            self._reset_utterance()
     
     async def _on_transcript(self, *args, **kwargs):
         """⚡ OPTIMIZED: Better transcript handling + interruption detection"""
@@ -240,11 +261,24 @@ class DeepgramService:
 
                     await self._on_speech_end(final_text, speech_end_time)
                     
-                    self.final_result = ""
+                    self._reset_utterance()
+                else:
+                    # Segment finalized, endpointing still pending
+                    await self._report_stable(self.final_result.strip())
             else:
                 # Log interim results less frequently
                 if len(text.split()) >= 3:  # Only log substantial interim results
                     logger.debug(f"Interim: '{text}'")
+                
+                # Unchanged across consecutive interims -> treat as stable
+                candidate = f"{self.final_result} {text}".strip()
+                if candidate == self._last_interim:
+                    self._interim_repeats += 1
+                else:
+                    self._last_interim = candidate
+                    self._interim_repeats = 1
+                if self._interim_repeats >= voice_config.SPECULATIVE_STABLE_INTERIMS:
+                    await self._report_stable(candidate)
                     
         except Exception as e:
             logger.error(f"Transcript error: {e}")
@@ -308,11 +342,12 @@ class DeepgramManager:
         self,
         call_sid: str,
         on_speech_end_callback: TranscriptCallback,
-        on_interruption_callback: InterruptionCallback = None
+        on_interruption_callback: InterruptionCallback = None,
+        on_stable_transcript_callback: Optional[TranscriptCallback] = None
     ) -> DeepgramService:
-        """⚡ UPDATED: Support interruption callback"""
+        """⚡ UPDATED: Support interruption and stable-interim (speculation) callbacks"""
         logger.info(f"Creating connection: {call_sid}")
-        service = DeepgramService(on_speech_end_callback, on_interruption_callback)
+        service = DeepgramService(on_speech_end_callback, on_interruption_callback, on_stable_transcript_callback)
         self._connections[call_sid] = service
         return service
     
@@ -0,0 +1,311 @@
+# app/services/doctor_roster.py - Process-wide doctor roster with change-driven invalidation
+
+import os
+import re
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+from sqlalchemy.orm import load_only
+from app.config.database import SessionLocal
+from app.config.voice_config import voice_config
+from app.models.doctor import Doctor, DoctorStatus
+from app.models.leave import DoctorLeave
+from app.services.redis_service import redis_service, async_redis_service
+from app.utils.name_index import NameIndex
+
+logger = logging.getLogger("doctor_roster")
+
+# Redis pub/sub channel: any worker that changes a doctor tells the others to reload
+ROSTER_CHANNEL = "doctor_roster:invalidate"
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+NAME_NOISE = {"dr", "doctor"}
+
+
+def name_tokens(name: str) -> Tuple[str, ...]:
+    """Normalised name tokens: lowercase words without "Dr." / "Doctor" """
+    return tuple(token for token in re.findall(r"[a-z0-9]+", (name or "").lower()) if token not in NAME_NOISE)
+
+
+@dataclass(frozen=True, slots=True)
+class RosterDoctor:
+    """Compact doctor record - no shift_timings / availability_dates JSON"""
+    doctor_id: str
+    name: str
+    degree: str
+    specialization: str
+    active: bool
+    tokens: Tuple[str, ...]
+    leaves: Tuple[Tuple[date, date], ...] = ()
+
+    def on_leave(self, day: date) -> bool:
+        return any(start <= day <= end for start, end in self.leaves)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "doctor_id": self.doctor_id,
+            "name": self.name,
+            "degree": self.degree,
+            "specialization": self.specialization,
+        }
+
+
+class _RosterIndex:
+    """One immutable snapshot of the roster, swapped in whole on reload"""
+
+    def __init__(self, doctors: List[RosterDoctor]):
+        self.by_id: Dict[str, RosterDoctor] = {doctor.doctor_id: doctor for doctor in doctors}
+        self.by_token: Dict[str, Set[str]] = {}
+        self.by_specialization: Dict[str, List[str]] = {}
+        for doctor in doctors:
+            for token in doctor.tokens:
+                self.by_token.setdefault(token, set()).add(doctor.doctor_id)
+            self.by_specialization.setdefault(doctor.specialization.lower(), []).append(doctor.doctor_id)
+
+
+class DoctorRoster:
+    """
+    ⚡ DOCTOR ROSTER CACHE
+    Active and inactive doctors (plus current and upcoming leaves) loaded once
+    per process into slotted records, indexed by doctor_id, by name token and
+    by specialization, so tool calls resolve doctors without touching the DB.
+
+    DoctorService writes invalidate it and publish on ROSTER_CHANNEL so every
+    other worker drops its copy too. DOCTOR_ROSTER_MAX_AGE bounds staleness for
+    changes made outside DoctorService.
+
+    Lookups never load on the event loop: an expired or invalidated snapshot
+    keeps being served, marked stale, while a background thread reloads it and
+    swaps the new one in. Only a missing snapshot (first use) is loaded inline,
+    and only off the loop - async code warms it through the tool pool first
+    (see is_loaded / warm).
+    """
+
+    def __init__(self):
+        self.max_age = voice_config.DOCTOR_ROSTER_MAX_AGE
+        self._index: Optional[_RosterIndex] = None
+        self._loaded_at = 0.0
+        self._generation = 0  # bumped by invalidate(); a load started before it is not kept
+        self._loaded_generation = 0  # generation of the current snapshot; behind = stale
+        self._load_lock = threading.Lock()
+        self._reloader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="roster")
+        self._reloading = False
+        # Fuzzy name index, synced (not rebuilt) on every reload
+        self.names = NameIndex()
+        self.stats = {"loads": 0, "invalidations": 0, "remote_invalidations": 0}
+
+    @property
+    def is_warm(self) -> bool:
+        return (
+            self._index is not None
+            and self._loaded_generation == self._generation
+            and time.time() - self._loaded_at < self.max_age
+        )
+
+    @property
+    def is_loaded(self) -> bool:
+        """A snapshot (possibly stale) is available - lookups won't touch the DB"""
+        return self._index is not None
+
+    def warm(self) -> None:
+        """Load the roster if it is missing or stale (blocking DB read - tool pool only)"""
+        if not self.is_warm:
+            self._reload()
+
+    def _snapshot(self) -> _RosterIndex:
+        index = self._index
+        if index is not None:
+            if not self.is_warm:
+                self._reload_in_background()
+            return index
+
+        if self._on_event_loop():
+            # Callers on the loop warm through the tool pool first; never block it here
+            logger.warning("⚠️ Doctor roster read on the event loop before it was loaded")
+            self._reload_in_background()
+            return _RosterIndex([])
+        return self._reload()
+
+    @staticmethod
+    def _on_event_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    def _reload_in_background(self) -> None:
+        """One reload at a time; lookups keep the current snapshot meanwhile"""
+        if self._reloading:
+            return
+        self._reloading = True
+        self._reloader.submit(self._background_reload)
+
+    def _background_reload(self) -> None:
+        try:
+            # An invalidate() during the load discards it; load again
+            while not self.is_warm:
+                self._reload()
+        except Exception as e:
+            logger.error(f"❌ Doctor roster reload failed: {e}")
+        finally:
+            self._reloading = False
+
+    def _reload(self) -> _RosterIndex:
+        with self._load_lock:
+            # Another thread may have reloaded while we waited
+            if self.is_warm:
+                return self._index
+            generation = self._generation
+            index = self._load()
+            if generation == self._generation:
+                changed = self.names.sync({doctor_id: doctor.name for doctor_id, doctor in index.by_id.items()})
+                if changed:
+                    logger.info(f"⚡ Name index updated: {changed} doctor(s)")
+                self._index = index
+                self._loaded_at = time.time()
+                self._loaded_generation = generation
+            return index
+
+    def _load(self) -> _RosterIndex:
+        started = time.time()
+        db = SessionLocal()
+        try:
+            rows = db.query(Doctor).options(
+                load_only(Doctor.doctor_id, Doctor.name, Doctor.degree, Doctor.specialization, Doctor.status)
+            ).filter(Doctor.status.in_([DoctorStatus.ACTIVE, DoctorStatus.INACTIVE])).all()
+
+            leaves: Dict[str, List[Tuple[date, date]]] = {}
+            for leave in db.query(DoctorLeave.doctor_id, DoctorLeave.start_date, DoctorLeave.end_date).filter(
+                DoctorLeave.end_date >= date.today()
+            ).all():
+                leaves.setdefault(leave.doctor_id, []).append((leave.start_date, leave.end_date))
+        finally:
+            db.close()
+
+        doctors = [
+            RosterDoctor(
+                doctor_id=row.doctor_id,
+                name=row.name,
+                degree=row.degree,
+                specialization=row.specialization or "General Medicine",
+                active=row.status == DoctorStatus.ACTIVE,
+                tokens=name_tokens(row.name),
+                leaves=tuple(leaves.get(row.doctor_id, ())),
+            )
+            for row in rows
+        ]
+
+        self.stats["loads"] += 1
+        logger.info(f"⚡ Doctor roster loaded: {len(doctors)} doctors in {(time.time() - started) * 1000:.0f}ms")
+        return _RosterIndex(doctors)
+
+    def invalidate(self, publish: bool = False) -> None:
+        """Mark the cached roster stale and reload it; with `publish`, tell the other workers as well"""
+        self._generation += 1
+        self.stats["invalidations"] += 1
+        self._reload_in_background()
+        if publish:
+            try:
+                redis_service.redis_client.publish(ROSTER_CHANNEL, WORKER_ID)
+            except Exception as e:
+                logger.error(f"❌ Roster invalidation publish failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, doctor_id: str) -> Optional[RosterDoctor]:
+        return self._snapshot().by_id.get(doctor_id)
+
+    def active_doctors(self) -> List[RosterDoctor]:
+        return [doctor for doctor in self._snapshot().by_id.values() if doctor.active]
+
+    def available_doctors(self, day: Optional[date] = None) -> List[RosterDoctor]:
+        """Active doctors not on leave on `day` (default today)"""
+        day = day or date.today()
+        return [doctor for doctor in self.active_doctors() if not doctor.on_leave(day)]
+
+    def by_specialization(self, specialization: str) -> List[RosterDoctor]:
+        index = self._snapshot()
+        return [index.by_id[doctor_id] for doctor_id in index.by_specialization.get(specialization.lower(), [])]
+
+    def find_by_name(self, name: str) -> Optional[RosterDoctor]:
+        """Exact name match first, then the doctor sharing the most name tokens"""
+        query = name_tokens(name)
+        if not query:
+            return None
+
+        index = self._snapshot()
+        candidates: Dict[str, int] = {}
+        for token in query:
+            for doctor_id in index.by_token.get(token, ()):
+                candidates[doctor_id] = candidates.get(doctor_id, 0) + 1
+
+        for doctor_id in candidates:
+            if index.by_id[doctor_id].tokens == query:
+                return index.by_id[doctor_id]
+
+        if candidates:
+            best = max(candidates, key=candidates.get)
+            return index.by_id[best]
+
+        # Misheard or clipped names ("Sarma", "Shrivastav")
+        matches = self.match_names(name, limit=1, active_only=False)
+        return matches[0][0] if matches else None
+
+    def match_names(
+        self,
+        query: str,
+        limit: int = 3,
+        active_only: bool = True,
+        doctor_ids: Optional[Set[str]] = None
+    ) -> List[Tuple[RosterDoctor, float]]:
+        """⚡ Ranked fuzzy name matches (phonetic + trigram index), sub-millisecond"""
+        index = self._snapshot()
+        allowed = doctor_ids
+        if active_only:
+            active = {doctor_id for doctor_id, doctor in index.by_id.items() if doctor.active}
+            allowed = active if allowed is None else allowed & active
+        return [
+            (index.by_id[doctor_id], score)
+            for doctor_id, score in self.names.search(query, limit=limit, allowed=allowed)
+            if doctor_id in index.by_id
+        ]
+
+
+async def listen_for_invalidations() -> None:
+    """⚡ Background task: drop this worker's roster when another worker changes a doctor"""
+    while True:
+        pubsub = async_redis_service.redis_client.pubsub()
+        try:
+            await pubsub.subscribe(ROSTER_CHANNEL)
+            logger.info(f"Listening for roster invalidations on {ROSTER_CHANNEL}")
+            async for message in pubsub.listen():
+                if message.get("type") != "message" or message.get("data") == WORKER_ID:
+                    continue
+                doctor_roster.invalidate()
+                doctor_roster.stats["remote_invalidations"] += 1
+                logger.info("⚡ Doctor roster invalidated by another worker")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Missing an invalidation only costs staleness up to DOCTOR_ROSTER_MAX_AGE
+            logger.error(f"❌ Roster invalidation listener error: {e}")
+            doctor_roster.invalidate()
+            await asyncio.sleep(1.0)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
+# Global instance
+doctor_roster = DoctorRoster()
@@ -8,6 +8,7 @@ from app.models.leave import DoctorLeave, LeaveType
 from fastapi import HTTPException, status
 from datetime import datetime, date
 from datetime import timedelta
+from app.services.doctor_roster import doctor_roster
 import json
 
 class DoctorService:
@@ -24,6 +25,7 @@ class DoctorService:
         db.add(db_doctor)
         db.commit()
         db.refresh(db_doctor)
+        doctor_roster.invalidate(publish=True)
         return db_doctor
     
     @staticmethod
@@ -54,6 +56,7 @@ class DoctorService:
         
         db.commit()
         db.refresh(doctor)
+        doctor_roster.invalidate(publish=True)
         return doctor
     
     @staticmethod
@@ -70,6 +73,7 @@ class DoctorService:
             synchronize_session=False
         )
         db.commit()
+        doctor_roster.invalidate(publish=True)
         return {"message": f"Doctor {doctor_id} marked as deleted, appointments cancelled"}
 
     @staticmethod
@@ -108,6 +112,7 @@ class DoctorService:
         
         db.commit()
         db.refresh(doctor)
+        doctor_roster.invalidate(publish=True)
         
         return {
             "message": f"Doctor {doctor_id} marked as on leave",
@@ -153,6 +158,7 @@ class DoctorService:
         
         db.commit()
         db.refresh(doctor)
+        doctor_roster.invalidate(publish=True)
         
         return {
             "message": f"Doctor {doctor_id} marked as active",
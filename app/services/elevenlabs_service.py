@@ -2,7 +2,6 @@
 
 import os
 import asyncio
-import base64
 import logging
 from elevenlabs import ElevenLabs, Voice, VoiceSettings
 from typing import Optional, AsyncGenerator
@@ -15,8 +14,33 @@ logger = logging.getLogger(__name__)
 
 client = ElevenLabs(api_key=voice_config.ELEVENLABS_API_KEY)
 VOICE_ID = voice_config.ELEVENLABS_VOICE_ID
+MODEL_ID = "eleven_turbo_v2_5"
+OUTPUT_FORMAT = "ulaw_8000"
+VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75,
+    "style": 0.0,
+    "use_speaker_boost": True
+}
 AUDIO_DIR = "static/audio"
 
+def _close_stream(loop, audio_generator, pending) -> None:
+    """Close a sync TTS stream (and its HTTP response) once no thread is inside it"""
+    def close_generator():
+        try:
+            audio_generator.close()
+        except Exception as e:
+            logger.debug(f"ElevenLabs stream close error: {e}")
+
+    def schedule_close(_=None):
+        loop.run_in_executor(None, close_generator)
+
+    if pending is not None and not pending.done():
+        pending.add_done_callback(schedule_close)
+    else:
+        schedule_close()
+
+
 class ElevenLabsService:
     def __init__(self):
         os.makedirs(AUDIO_DIR, exist_ok=True)
@@ -25,10 +49,12 @@ class ElevenLabsService:
     async def generate(
         self, 
         text: str, 
-        partial_response_index: Optional[int] = None
-    ) -> AsyncGenerator[str, None]:
+        partial_response_index: Optional[int] = None,
+        fallback: bool = True
+    ) -> AsyncGenerator[bytes, None]:
         """
-        ⚡ OPTIMIZED: Async generator that yields chunks immediately
+        ⚡ OPTIMIZED: Async generator that yields raw μ-law chunks immediately
+        Set fallback=False to get no audio (instead of Deepgram audio) on failure.
         """
         if not text or not text.strip():
             logger.warning("Empty text provided to ElevenLabs TTS")
@@ -45,14 +71,9 @@ class ElevenLabsService:
             audio_generator = client.text_to_speech.stream(
                 text=text,
                 voice_id=VOICE_ID,
-                model_id="eleven_turbo_v2_5",
-                output_format="ulaw_8000",
-                voice_settings=VoiceSettings(
-                    stability=0.5,
-                    similarity_boost=0.75,
-                    style=0.0,
-                    use_speaker_boost=True
-                )
+                model_id=MODEL_ID,
+                output_format=OUTPUT_FORMAT,
+                voice_settings=VoiceSettings(**VOICE_SETTINGS)
             )
             
             total_bytes = 0
@@ -66,25 +87,35 @@ class ElevenLabsService:
                 except StopIteration:
                     return None
             
-            while True:
-                # Run blocking operation in executor
-                chunk = await loop.run_in_executor(None, get_next_chunk)
-                
-                if chunk is None:
-                    break
-                
-                if chunk:
-                    # Track first chunk latency
-                    if chunk_count == 0:
-                        first_chunk_time = time.time() - start_time
-                        logger.info(f"⚡ First TTS chunk: {first_chunk_time*1000:.0f}ms")
+            pending = None
+            finished = False
+
+            try:
+                while True:
+                    # Run blocking operation in executor
+                    pending = loop.run_in_executor(None, get_next_chunk)
+                    # Shielded: if we are cancelled, `pending` still resolves when the thread leaves the stream
+                    chunk = await asyncio.shield(pending)
                     
-                    audio_b64 = base64.b64encode(chunk).decode('ascii')
-                    total_bytes += len(chunk)
-                    chunk_count += 1
+                    if chunk is None:
+                        finished = True
+                        break
                     
-                    # Yield immediately - DON'T BUFFER
-                    yield audio_b64
+                    if chunk:
+                        # Track first chunk latency
+                        if chunk_count == 0:
+                            first_chunk_time = time.time() - start_time
+                            logger.info(f"⚡ First TTS chunk: {first_chunk_time*1000:.0f}ms")
+                        
+                        total_bytes += len(chunk)
+                        chunk_count += 1
+                        
+                        # Yield raw bytes immediately - DON'T BUFFER, DON'T RE-ENCODE
+                        yield chunk
+            finally:
+                if not finished:
+                    # ⚡ Barge-in: close the HTTP stream instead of letting it run on
+                    _close_stream(loop, audio_generator, pending)
             
             total_time = time.time() - start_time
             logger.info(f"✓ ElevenLabs complete: {chunk_count} chunks, {total_bytes} bytes in {total_time:.2f}s")
@@ -93,14 +124,17 @@ class ElevenLabsService:
             logger.error(f"❌ ElevenLabs error: {e}")
             traceback.print_exc()
 
+            if not fallback:
+                return
+
             logger.warning("🔄 Falling back to Deepgram TTS")
             
             try:
                 tts_fallback = TTSService()
                 
-                async for audio_b64 in tts_fallback.generate(text):
-                    if audio_b64:
-                        yield audio_b64
+                async for audio in tts_fallback.generate(text):
+                    if audio:
+                        yield audio
                         
                 logger.info("✓ Fallback TTS completed")
                 
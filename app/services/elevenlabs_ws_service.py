@@ -0,0 +1,330 @@
+# app/services/elevenlabs_ws_service.py - Persistent per-call ElevenLabs WebSocket TTS
+
+import asyncio
+import base64
+import json
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional, AsyncGenerator
+import websockets
+from app.config.voice_config import voice_config
+from app.services.elevenlabs_service import (
+    elevenlabs_service,
+    VOICE_ID,
+    MODEL_ID,
+    OUTPUT_FORMAT,
+    VOICE_SETTINGS
+)
+
+logger = logging.getLogger(__name__)
+
+WS_URL = "wss://api.elevenlabs.io/v1/text-to-speech/{voice_id}/multi-stream-input"
+
+
+class TTSContext:
+    """
+    One utterance on the shared call socket.
+    Text can be pushed incrementally; audio arrives on its own queue.
+    """
+
+    def __init__(self, client: "ElevenLabsStreamingClient", context_id: str):
+        self.client = client
+        self.context_id = context_id
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._initialized = False
+        self._closed = False
+        self._last_text_at = 0.0
+        self._last_audio_at = 0.0
+
+    async def send_text(self, text: str, flush: bool = False) -> None:
+        """Push a piece of text into this context"""
+        if self._closed or not text:
+            return
+
+        message = {"text": text if text.endswith(" ") else f"{text} ", "context_id": self.context_id}
+        if not self._initialized:
+            message["voice_settings"] = VOICE_SETTINGS
+            self._initialized = True
+        if flush:
+            message["flush"] = True
+
+        await self.client._send(message)
+        self._last_text_at = time.time()
+
+    async def flush(self) -> None:
+        """Force generation of any buffered text without closing the context"""
+        if not self._closed:
+            await self.client._send({"context_id": self.context_id, "flush": True})
+
+    async def close(self) -> None:
+        """Flush remaining text and close the context (socket stays open)"""
+        if self._closed:
+            return
+        self._closed = True
+        await self.client._send({"context_id": self.context_id, "flush": True})
+        await self.client._send({"context_id": self.context_id, "close_context": True})
+
+    async def abort(self) -> None:
+        """Stop generation server-side and drop any audio still in flight"""
+        self.client._contexts.pop(self.context_id, None)
+        self.queue.put_nowait(None)
+        # Nothing sent yet, or close_context already on its way
+        already_closed = self._closed or not self._initialized
+        self._closed = True
+        if already_closed:
+            return
+        try:
+            await self.client._send({"context_id": self.context_id, "close_context": True})
+        except Exception as e:
+            logger.debug(f"ElevenLabs WS abort error: {e}")
+
+    def _stalled(self) -> bool:
+        """Text (or the close) is waiting for audio - as opposed to waiting for more text"""
+        return self._closed or self._last_text_at > self._last_audio_at
+
+    async def audio(self) -> AsyncGenerator[bytes, None]:
+        """
+        Yield raw μ-law audio for this context until it is final. The idle timeout
+        only counts while sent text is waiting for audio, so a reply that pauses
+        for a tool call is not cut off.
+        """
+        idle_timeout = voice_config.ELEVENLABS_WS_IDLE_TIMEOUT
+        try:
+            while True:
+                try:
+                    audio = await asyncio.wait_for(self.queue.get(), timeout=idle_timeout)
+                except asyncio.TimeoutError:
+                    if not self._stalled():
+                        continue
+                    logger.warning(f"⏱️ ElevenLabs WS context {self.context_id} idle for {idle_timeout}s")
+                    break
+
+                if audio is None:
+                    break
+                self._last_audio_at = time.time()
+                yield audio
+        finally:
+            self.client._contexts.pop(self.context_id, None)
+
+
+class ElevenLabsStreamingClient:
+    """
+    ⚡ Keeps one ElevenLabs multi-context input-streaming WebSocket open for the
+    whole call. Audio is received on the event loop (no executor hops) and the
+    TLS handshake is paid once per call instead of once per utterance.
+    """
+
+    def __init__(self, voice_id: str = VOICE_ID, model_id: str = MODEL_ID):
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self._ws = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._contexts: Dict[str, TTSContext] = {}
+        self._connect_lock = asyncio.Lock()
+
+    def _url(self) -> str:
+        return (
+            f"{WS_URL.format(voice_id=self.voice_id)}"
+            f"?model_id={self.model_id}"
+            f"&output_format={OUTPUT_FORMAT}"
+            f"&inactivity_timeout={voice_config.ELEVENLABS_WS_INACTIVITY_TIMEOUT}"
+        )
+
+    def is_connected(self) -> bool:
+        return self._ws is not None and self._ws.open
+
+    async def connect(self) -> bool:
+        """Open (or re-open) the call socket"""
+        async with self._connect_lock:
+            if self.is_connected():
+                return True
+
+            start_time = time.time()
+            try:
+                self._ws = await websockets.connect(
+                    self._url(),
+                    extra_headers={"xi-api-key": voice_config.ELEVENLABS_API_KEY},
+                    ping_interval=20,
+                    max_size=None
+                )
+                self._reader_task = asyncio.create_task(self._reader())
+                logger.info(f"✓ ElevenLabs WS connected in {(time.time() - start_time) * 1000:.0f}ms")
+                return True
+            except Exception as e:
+                logger.error(f"❌ ElevenLabs WS connect failed: {e}")
+                self._ws = None
+                return False
+
+    async def _send(self, message: Dict) -> None:
+        if not self.is_connected() and not await self.connect():
+            raise ConnectionError("ElevenLabs WebSocket not connected")
+        await self._ws.send(json.dumps(message))
+
+    async def _reader(self) -> None:
+        """Route incoming audio frames to their context queues"""
+        ws = self._ws
+        try:
+            async for raw in ws:
+                data = json.loads(raw)
+                context_id = data.get("contextId") or data.get("context_id")
+                context = self._contexts.get(context_id)
+                if not context:
+                    continue
+
+                audio_b64 = data.get("audio")
+                if audio_b64:
+                    # The only decode on this path - everything downstream is bytes
+                    context.queue.put_nowait(base64.b64decode(audio_b64))
+
+                if data.get("isFinal") or data.get("is_final"):
+                    context.queue.put_nowait(None)
+
+        except websockets.ConnectionClosed as e:
+            logger.info(f"ElevenLabs WS closed: {e.code}")
+        except Exception as e:
+            logger.error(f"❌ ElevenLabs WS reader error: {e}")
+        finally:
+            # Release every waiting utterance
+            for context in list(self._contexts.values()):
+                context.queue.put_nowait(None)
+            if self._ws is ws:
+                self._ws = None
+
+    def open_context(self) -> TTSContext:
+        """Start a new utterance on the shared socket"""
+        context = TTSContext(self, uuid.uuid4().hex[:12])
+        self._contexts[context.context_id] = context
+        return context
+
+    async def generate(
+        self,
+        text: str,
+        partial_response_index: Optional[int] = None
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Same interface as ElevenLabsService.generate, served over the call socket.
+        Falls back to the HTTP service if the socket is unavailable.
+        """
+        if not text or not text.strip():
+            return
+
+        start_time = time.time()
+        context = None
+        chunk_count = 0
+
+        try:
+            context = self.open_context()
+            await context.send_text(text.strip())
+            await context.close()
+        except Exception as e:
+            logger.error(f"❌ ElevenLabs WS send failed: {e}")
+            if context:
+                self._contexts.pop(context.context_id, None)
+            async for audio in elevenlabs_service.generate(text, partial_response_index):
+                yield audio
+            return
+
+        async for audio in context.audio():
+            if chunk_count == 0:
+                logger.info(f"⚡ First TTS chunk (WS): {(time.time() - start_time) * 1000:.0f}ms")
+            chunk_count += 1
+            yield audio
+
+        if chunk_count == 0:
+            logger.warning("🔄 No audio over ElevenLabs WS, falling back to HTTP")
+            # Abort first so late WS audio is not generated (and billed) twice
+            await context.abort()
+            async for audio in elevenlabs_service.generate(text, partial_response_index):
+                yield audio
+            return
+
+        logger.info(f"✓ ElevenLabs WS complete: {chunk_count} chunks in {time.time() - start_time:.2f}s")
+
+    async def stream_segments(self, segments: asyncio.Queue) -> AsyncGenerator[bytes, None]:
+        """
+        ⚡ Incremental text streaming: one context for the whole reply. Each segment
+        on `segments` is pushed (and flushed) as soon as the LLM finishes it, and
+        audio comes back on the same context; None on the queue ends the reply.
+        Segments the socket could not take are synthesized over HTTP instead.
+        """
+        start_time = time.time()
+        context = self.open_context()
+        sent: List[str] = []
+        unsent: List[str] = []
+        finished = False
+
+        async def feed() -> None:
+            nonlocal finished
+            try:
+                while True:
+                    segment = await segments.get()
+                    if segment is None:
+                        finished = True
+                        if sent:
+                            await context.close()
+                        else:
+                            # Empty reply: the context was never initialised, end it here
+                            await context.abort()
+                        return
+                    unsent.append(segment)
+                    await context.send_text(segment, flush=True)
+                    sent.append(unsent.pop())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ ElevenLabs WS send failed: {e}")
+                context.queue.put_nowait(None)
+
+        feeder = asyncio.create_task(feed())
+        chunk_count = 0
+        try:
+            async for audio in context.audio():
+                if chunk_count == 0:
+                    logger.info(f"⚡ First TTS chunk (WS stream): {(time.time() - start_time) * 1000:.0f}ms")
+                chunk_count += 1
+                yield audio
+
+            if feeder.done() and finished and not sent:
+                return
+            if feeder.done() and finished and chunk_count:
+                logger.info(f"✓ ElevenLabs WS stream complete: {len(sent)} segments, {chunk_count} chunks")
+                return
+
+            # Socket failed or stalled: whatever it did not voice goes over HTTP
+            feeder.cancel()
+            await context.abort()
+            fallback = unsent if chunk_count else sent + unsent
+            logger.warning(f"🔄 ElevenLabs WS stream fell back to HTTP ({len(fallback)} segment(s) pending)")
+            while True:
+                if fallback:
+                    segment = fallback.pop(0)
+                elif finished:
+                    break
+                else:
+                    segment = await segments.get()
+                    if segment is None:
+                        break
+                async for audio in elevenlabs_service.generate(segment):
+                    yield audio
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+            if self._contexts.get(context.context_id) is context:
+                await context.abort()
+
+    async def close(self) -> None:
+        """Close the call socket"""
+        ws = self._ws
+        if ws is None:
+            return
+        try:
+            if ws.open:
+                await ws.send(json.dumps({"close_socket": True}))
+            await ws.close()
+        except Exception as e:
+            logger.debug(f"ElevenLabs WS close error: {e}")
+        finally:
+            self._ws = None
+            if self._reader_task and not self._reader_task.done():
+                self._reader_task.cancel()
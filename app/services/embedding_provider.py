@@ -0,0 +1,228 @@
+# app/services/embedding_provider.py - Shared, cached query embeddings
+
+import re
+import base64
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+import numpy as np
+from openai import OpenAI, AsyncOpenAI
+from app.config.voice_config import voice_config
+from app.services.redis_service import redis_service, async_redis_service
+
+logger = logging.getLogger("embeddings")
+
+EMBEDDING_KEY_PREFIX = "embedding:"
+
+CacheKey = Tuple[str, str]  # (model, normalised text)
+
+
+def normalize_query(text: str) -> str:
+    """Cache key text: lowercase, single-spaced, no surrounding punctuation"""
+    return re.sub(r"\s+", " ", (text or "").lower()).strip(" \t.,!?;:")
+
+
+class EmbeddingProvider:
+    """
+    ⚡ QUERY EMBEDDING PROVIDER
+    Every query embedding (doctor search, RAG enrichment, knowledge base, semantic
+    cache, specialization classifier) goes through here:
+      1. in-process LRU of float32 vectors
+      2. Redis, float16 (half the bytes of float32, base64 for the text client),
+         keyed by model + normalised text and shared by all workers
+      3. OpenAI - concurrent requests for the same text share one call
+    Failures are never cached.
+    """
+
+    def __init__(self):
+        self.model = voice_config.EMBEDDING_MODEL_NAME
+        self.max_entries = voice_config.EMBEDDING_CACHE_SIZE
+        self.ttl = voice_config.EMBEDDING_CACHE_TTL
+        self.client = OpenAI(api_key=voice_config.OPENAI_API_KEY)
+        self.async_client = AsyncOpenAI(api_key=voice_config.OPENAI_API_KEY)
+
+        self._vectors: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()  # LRU order
+        self._lock = threading.Lock()
+        self._inflight: Dict[CacheKey, Future] = {}                # tool-pool threads
+        self._inflight_async: Dict[CacheKey, asyncio.Future] = {}  # event loop
+        self.stats = {"memory_hits": 0, "redis_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    def _key(self, text: str, model: Optional[str]) -> Optional[CacheKey]:
+        normalized = normalize_query(text)
+        return (model or self.model, normalized) if normalized else None
+
+    @staticmethod
+    def _redis_key(key: CacheKey) -> str:
+        model, text = key
+        return f"{EMBEDDING_KEY_PREFIX}{model}:{hashlib.md5(text.encode()).hexdigest()}"
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def embed(self, text: str, model: Optional[str] = None) -> Optional[np.ndarray]:
+        """Embedding of `text` (blocking - call from the tool pool, not the event loop)"""
+        key = self._key(text, model)
+        if key is None:
+            return None
+
+        vector = self._remember(key)
+        if vector is not None:
+            return vector
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            self.stats["coalesced"] += 1
+            return future.result()
+
+        try:
+            vector = self._decode(self._redis_get(key), key)
+            if vector is None:
+                vector = self._fetch(key)
+                self._redis_set(key, vector)
+            self._store(key, vector)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_result(vector)
+        return vector
+
+    async def embed_async(self, text: str, model: Optional[str] = None) -> Optional[np.ndarray]:
+        """Embedding of `text` on the async clients"""
+        key = self._key(text, model)
+        if key is None:
+            return None
+
+        vector = self._remember(key)
+        if vector is not None:
+            return vector
+
+        pending = self._inflight_async.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        pending = self._inflight_async[key] = asyncio.get_running_loop().create_future()
+        vector = None
+        try:
+            vector = self._decode(await self._redis_get_async(key), key)
+            if vector is None:
+                vector = await self._fetch_async(key)
+                await self._redis_set_async(key, vector)
+            self._store(key, vector)
+        finally:
+            self._inflight_async.pop(key, None)
+            pending.set_result(vector)
+        return vector
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats, entries=len(self._vectors))
+
+    # ------------------------------------------------------------------
+    # In-process LRU
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: CacheKey) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is not None:
+                self._vectors.move_to_end(key)
+                self.stats["memory_hits"] += 1
+            return vector
+
+    def _store(self, key: CacheKey, vector: Optional[np.ndarray]) -> None:
+        if vector is None:
+            return
+        vector.setflags(write=False)  # shared by every caller
+        with self._lock:
+            self._vectors[key] = vector
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self.max_entries:
+                self._vectors.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # OpenAI
+    # ------------------------------------------------------------------
+
+    def _fetch(self, key: CacheKey) -> Optional[np.ndarray]:
+        model, text = key
+        self.stats["misses"] += 1
+        try:
+            response = self.client.embeddings.create(input=[text], model=model)
+            return np.asarray(response.data[0].embedding, dtype=np.float32)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Error getting OpenAI embedding: {e}")
+            return None
+
+    async def _fetch_async(self, key: CacheKey) -> Optional[np.ndarray]:
+        model, text = key
+        self.stats["misses"] += 1
+        try:
+            response = await self.async_client.embeddings.create(input=[text], model=model)
+            return np.asarray(response.data[0].embedding, dtype=np.float32)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Error getting OpenAI embedding: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Redis tier (float16, base64 - the shared clients decode responses as text)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode(vector: np.ndarray) -> str:
+        return base64.b64encode(vector.astype(np.float16).tobytes()).decode("ascii")
+
+    def _decode(self, data: Optional[str], key: CacheKey) -> Optional[np.ndarray]:
+        if not data:
+            return None
+        try:
+            vector = np.frombuffer(base64.b64decode(data), dtype=np.float16).astype(np.float32)
+        except Exception as e:
+            logger.error(f"❌ Bad cached embedding for '{key[1][:30]}': {e}")
+            return None
+        self.stats["redis_hits"] += 1
+        return vector
+
+    def _redis_get(self, key: CacheKey) -> Optional[str]:
+        try:
+            return redis_service.redis_client.get(self._redis_key(key))
+        except Exception as e:
+            logger.error(f"❌ Embedding cache read error: {e}")
+            return None
+
+    async def _redis_get_async(self, key: CacheKey) -> Optional[str]:
+        try:
+            return await async_redis_service.redis_client.get(self._redis_key(key))
+        except Exception as e:
+            logger.error(f"❌ Embedding cache read error: {e}")
+            return None
+
+    def _redis_set(self, key: CacheKey, vector: Optional[np.ndarray]) -> None:
+        if vector is None:
+            return
+        try:
+            redis_service.redis_client.setex(self._redis_key(key), self.ttl, self._encode(vector))
+        except Exception as e:
+            logger.error(f"❌ Embedding cache write error: {e}")
+
+    async def _redis_set_async(self, key: CacheKey, vector: Optional[np.ndarray]) -> None:
+        if vector is None:
+            return
+        try:
+            await async_redis_service.redis_client.setex(self._redis_key(key), self.ttl, self._encode(vector))
+        except Exception as e:
+            logger.error(f"❌ Embedding cache write error: {e}")
+
+
+# Global instance
+embedding_provider = EmbeddingProvider()
@@ -137,6 +137,12 @@ class EmbeddingService:
                     distance=models.Distance.COSINE
                 )
             )
+            # Keyword index so doctor_id filters (batched RAG enrichment) stay cheap
+            self.qdrant_client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="doctor_id",
+                field_schema=models.PayloadSchemaType.KEYWORD
+            )
             logger.info("Collection recreated successfully")
             
         except Exception as e:
@@ -0,0 +1,452 @@
+# app/services/fast_path_router.py - Deterministic slot-filling turns without the LLM
+
+import re
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from app.utils.validators import validate_phone_with_feedback, parse_patient_name
+from app.utils.symptom_mapper import SYMPTOM_SPECIALIZATION_MAP
+
+logger = logging.getLogger("agent")
+
+YES_PATTERN = re.compile(
+    r"^(yes|yeah|yep|yup|sure|correct|right|ok|okay|confirm|please do|go ahead|do it|sounds good|that'?s right|that'?s correct)\b"
+)
+NO_PATTERN = re.compile(r"^(no|nope|nah|not really|wait|wrong|change)\b")
+# A booking is confirmed only when the whole utterance is agreement ("yes please", "ok, go ahead")
+CONFIRM_PHRASE = (r"(?:yes|yeah|yep|yup|sure|correct|right|ok|okay|confirm|please|please do|go ahead|do it|"
+                  r"book it|sounds good|perfect|great|thanks|thank you|that'?s right|that'?s correct)")
+CONFIRM_PATTERN = re.compile(rf"^{CONFIRM_PHRASE}(?:[,\s]+{CONFIRM_PHRASE})*$")
+# Objections and corrections anywhere in the utterance ("sure, but make it 4 PM instead")
+NEGATION_PATTERN = re.compile(r"\b(no|not|nope|never|don'?t|can'?t|cannot|won'?t|isn'?t|but|instead)\b")
+AMENDMENT_PATTERN = re.compile(r"\b(change|another|actually|other)\b")
+QUESTION_PATTERN = re.compile(r"\?|\b(what|which|when|where|why|how|who|can you|could you|do you|is there|are there)\b")
+FILLER_PATTERN = re.compile(r"^(um+|uh+|hmm+|so|well|okay|ok)[,\s]+")
+NAME_PREFIX_PATTERN = re.compile(r"^(my name is|my name's|name is|this is|i am|i'm|it is|it's|its)\s+")
+TIME_PATTERN = re.compile(r"\b(\d{1,2})(?::(\d{2}))?\s*(a\.?\s?m\.?|p\.?\s?m\.?)?(?=\W|$)")
+# A bare number is not a day ("at 3", "5 pm works"): it needs "the" or an ordinal suffix
+NOT_A_CLOCK_TIME = r"(?!\s*(?:a\.?\s?m\b|p\.?\s?m\b|o'?clock))"
+DAY_OF_MONTH_PATTERN = re.compile(
+    rf"\b(?:the\s+(\d{{1,2}})(?:st|nd|rd|th)?|(\d{{1,2}})(?:st|nd|rd|th))\b{NOT_A_CLOCK_TIME}"
+)
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12
+}
+SPOKEN_DIGITS = {
+    "zero": "0", "oh": "0", "one": "1", "two": "2", "three": "3", "four": "4",
+    "five": "5", "six": "6", "seven": "7", "eight": "8", "nine": "9", "plus": "+"
+}
+ORDINALS = {
+    "first": 0, "1st": 0, "second": 1, "2nd": 1, "third": 2, "3rd": 2,
+    "fourth": 3, "4th": 3, "last": -1
+}
+# The whole utterance must be the pick: "the first one", "second", "last one please"
+ORDINAL_PICK_PATTERN = re.compile(
+    rf"^(?:the\s+)?({'|'.join(ORDINALS)})(?:\s+(?:one|option|slot|time))?(?:\s+please)?$"
+)
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3,
+    "april": 4, "apr": 4, "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7,
+    "august": 8, "aug": 8, "september": 9, "sept": 9, "sep": 9,
+    "october": 10, "oct": 10, "november": 11, "nov": 11, "december": 12, "dec": 12
+}
+# The day must sit next to the month name ("may I come at 5" is not May 5)
+MONTH_NAMES = "|".join(MONTHS)
+MONTH_DAY_PATTERN = re.compile(
+    rf"\b({MONTH_NAMES})\s+(?:the\s+)?(\d{{1,2}})(?:st|nd|rd|th)?\b{NOT_A_CLOCK_TIME}"
+)
+DAY_MONTH_PATTERN = re.compile(
+    rf"\b(?:the\s+)?(\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?({MONTH_NAMES})\b"
+)
+
+# Slot-filling answers are short; anything longer goes to the LLM
+MAX_FAST_PATH_WORDS = 8
+
+# Words that make an utterance "not a name" in the collecting_name step:
+# requests, fillers and function words ("I don't know", "it's for my mother")
+NOT_A_NAME = {
+    "hold", "wait", "sorry", "moment", "second", "minute", "hello", "hi", "hey",
+    "again", "repeat", "please", "thanks", "thank", "you", "doctor", "appointment",
+    "sec", "just", "one", "not", "sure", "know", "dont", "idea", "think", "maybe",
+    "book", "booking", "schedule", "call", "need", "want", "like", "can",
+    "i", "me", "my", "mine", "we", "us", "our", "he", "she", "him", "her", "his",
+    "they", "them", "their", "it", "is", "are", "was", "be", "do", "does", "have", "has",
+    "a", "an", "the", "for", "to", "of", "on", "in", "at", "with", "and", "or", "but",
+    "that", "this", "there", "here", "what", "yes", "no", "ok", "okay", "um", "uh"
+}
+# Scheduling answers and symptoms given at the name prompt ("tomorrow", "three pm", "cardiology")
+SCHEDULING_WORDS = (
+    set(NUMBER_WORDS) | set(ORDINALS) | set(WEEKDAYS) | set(MONTHS)
+    | {"today", "tomorrow", "tonight", "morning", "afternoon", "evening", "noon", "midnight",
+       "am", "pm", "oclock", "next", "week", "weekend", "month", "day", "time", "date", "slot"}
+)
+SYMPTOM_WORDS = {
+    word
+    for specialization, keywords in SYMPTOM_SPECIALIZATION_MAP.items()
+    for phrase in [specialization, *keywords]
+    for word in phrase.lower().replace("'", "").split()
+} | {
+    "pain", "ache", "sore", "kidney", "stone", "stomach", "tooth", "teeth", "dental", "eye", "ear",
+    "throat", "infection", "injury", "surgery", "cancer", "thyroid", "sugar", "urine", "liver", "lung"
+}
+
+
+@dataclass
+class FastPathAction:
+    """What the router decided for a turn: a templated reply, or one tool call + a template"""
+    route: str
+    reply: Optional[str] = None
+    updates: Dict[str, Any] = field(default_factory=dict)
+    tool_name: Optional[str] = None
+    arguments: Dict[str, Any] = field(default_factory=dict)
+    render: Optional[Callable[[Dict[str, Any], Dict[str, Any]], str]] = None  # (result, session) -> reply
+
+
+def format_hour(hour: int) -> str:
+    """24h hour -> spoken form ("3 PM")"""
+    if hour == 0:
+        return "12 AM"
+    if hour < 12:
+        return f"{hour} AM"
+    if hour == 12:
+        return "12 PM"
+    return f"{hour - 12} PM"
+
+
+def format_date(iso_date: str) -> str:
+    """YYYY-MM-DD -> spoken form ("Friday, October 17")"""
+    try:
+        parsed = datetime.strptime(iso_date, "%Y-%m-%d")
+        return f"{parsed.strftime('%A, %B')} {parsed.day}"
+    except (TypeError, ValueError):
+        return iso_date or "that day"
+
+
+def ordinal_pick(text: str, count: int) -> Optional[int]:
+    """Index picked by an utterance that is only an ordinal ("the second one"), else None"""
+    match = ORDINAL_PICK_PATTERN.match(text)
+    if not match:
+        return None
+    index = ORDINALS[match.group(1)]
+    index = count + index if index < 0 else index
+    return index if 0 <= index < count else None
+
+
+def _join_spoken(items: List[str]) -> str:
+    if len(items) <= 1:
+        return "".join(items)
+    return f"{', '.join(items[:-1])} and {items[-1]}"
+
+
+class FastPathRouter:
+    """
+    ⚡ RULE-BASED PRE-ROUTER
+    Keyed on the session's current_step, it answers slot-filling turns - doctor
+    picks, dates, hours, name, phone, yes/no - locally or with a single direct
+    tool call, so they skip both LLM round-trips. route() returns None whenever
+    it cannot decide, and the turn goes to the LLM as before.
+    """
+
+    def __init__(self, match_doctor: Callable[[str, List[Dict[str, Any]]], Optional[str]]):
+        self.match_doctor = match_doctor
+        self.handlers = {
+            "selecting_doctor": self._choose_doctor,
+            "selecting_date": self._choose_date,
+            "selecting_time": self._choose_time,
+            "collecting_name": self._capture_name,
+            "collecting_phone": self._capture_phone,
+            "confirming_booking": self._confirm_booking,
+        }
+
+    def route(self, user_text: str, session: Dict[str, Any]) -> Optional[FastPathAction]:
+        handler = self.handlers.get(session.get("current_step"))
+        if not handler:
+            return None
+
+        text = self._normalize(user_text)
+        if not text or QUESTION_PATTERN.search(text):
+            return None
+
+        try:
+            action = handler(text, session)
+        except Exception as e:
+            logger.warning(f"Fast path error ({session.get('current_step')}): {e}")
+            return None
+
+        if action:
+            logger.info(f"⚡ Fast path: {action.route}")
+        return action
+
+    @staticmethod
+    def _normalize(user_text: str) -> str:
+        text = user_text.lower().strip().rstrip(".!")
+        return FILLER_PATTERN.sub("", text).strip()
+
+    @staticmethod
+    def _short(text: str) -> bool:
+        return len(text.split()) <= MAX_FAST_PATH_WORDS
+
+    # ------------------------------------------------------------------
+    # Next question once a slot is filled
+    # ------------------------------------------------------------------
+
+    def _next_step(self, session: Dict[str, Any], updates: Dict[str, Any], ack: str, route: str) -> FastPathAction:
+        merged = {**session, **updates}
+
+        if not merged.get("patient_name"):
+            updates["current_step"] = "collecting_name"
+            reply = f"{ack} May I have your full name?"
+        elif not merged.get("patient_phone"):
+            updates["current_step"] = "collecting_phone"
+            first_name = merged["patient_name"].split()[0]
+            reply = f"{ack} Thanks, {first_name}. What's your phone number, with country code?"
+        else:
+            updates["current_step"] = "confirming_booking"
+            reply = f"{ack} {self._booking_summary(merged)} Shall I book it?"
+
+        return FastPathAction(route=route, reply=reply.strip(), updates=updates)
+
+    @staticmethod
+    def _doctor_name(session: Dict[str, Any]) -> str:
+        for doctor in session.get("offered_doctors") or []:
+            if doctor.get("doctor_id") == session.get("selected_doctor_id"):
+                return doctor.get("name")
+        return "the doctor"
+
+    @staticmethod
+    def _selected_hour(session: Dict[str, Any]) -> Optional[int]:
+        try:
+            return int(str(session.get("selected_time")).split(":")[0])
+        except ValueError:
+            return None
+
+    def _booking_summary(self, session: Dict[str, Any]) -> str:
+        hour = self._selected_hour(session)
+        when = f" at {format_hour(hour)}" if hour is not None else ""
+        return (f"That's {self._doctor_name(session)} on {format_date(session.get('selected_date'))}"
+                f"{when} for {session.get('patient_name')}.")
+
+    # ------------------------------------------------------------------
+    # Step handlers
+    # ------------------------------------------------------------------
+
+    def _choose_doctor(self, text: str, session: Dict[str, Any]) -> Optional[FastPathAction]:
+        doctors = session.get("offered_doctors") or []
+        if not doctors or not self._short(text):
+            return None
+        # "not the first, the second" - corrections go to the LLM
+        if NEGATION_PATTERN.search(text):
+            return None
+
+        doctor_id = self.match_doctor(text, doctors)
+        if not doctor_id:
+            return None
+
+        name = next((d["name"] for d in doctors if d["doctor_id"] == doctor_id), "that doctor")
+        return FastPathAction(
+            route="doctor_choice",
+            reply=f"Great, {name}. What day works for you?",
+            updates={"selected_doctor_id": doctor_id, "current_step": "selecting_date"}
+        )
+
+    def _choose_date(self, text: str, session: Dict[str, Any]) -> Optional[FastPathAction]:
+        doctor_id = session.get("selected_doctor_id")
+        if not doctor_id or not self._short(text):
+            return None
+        # "not monday, friday" - leave the correction to the LLM
+        if NEGATION_PATTERN.search(text) or AMENDMENT_PATTERN.search(text):
+            return None
+
+        iso_date = self._parse_date(text)
+        if not iso_date:
+            return None
+
+        return FastPathAction(
+            route="date_choice",
+            tool_name="get_available_slots",
+            arguments={"doctor_id": doctor_id, "date": iso_date},
+            render=self._render_slots
+        )
+
+    def _render_slots(self, result: Dict[str, Any], session: Dict[str, Any]) -> str:
+        if not result.get("success"):
+            return f"{result.get('error', 'I could not find openings that day.')} Would another day work?"
+
+        hours = sorted({int(slot.split(":")[0]) for slot in result.get("slots", [])})
+        spoken = _join_spoken([format_hour(hour) for hour in hours[:4]])
+        return (f"{self._doctor_name(session)} has openings on {format_date(result.get('date'))} "
+                f"at {spoken}. Which time works for you?")
+
+    def _choose_time(self, text: str, session: Dict[str, Any]) -> Optional[FastPathAction]:
+        offered = session.get("offered_hours") or []
+        if not offered or not session.get("selected_date") or not self._short(text):
+            return None
+        # "not 3, 11" / "no 3 is bad" - leave the correction to the LLM
+        if NEGATION_PATTERN.search(text):
+            return None
+
+        index = ordinal_pick(text, len(offered))
+        hour = offered[index] if index is not None else self._parse_hour(text, offered)
+        if hour not in offered:
+            return None
+
+        return self._next_step(
+            session,
+            {"selected_time": f"{hour:02d}:00"},
+            ack=f"{format_hour(hour)}, got it.",
+            route="hour_choice"
+        )
+
+    def _capture_name(self, text: str, session: Dict[str, Any]) -> Optional[FastPathAction]:
+        if YES_PATTERN.match(text) or NO_PATTERN.match(text):
+            return None
+
+        candidate = NAME_PREFIX_PATTERN.sub("", text).strip()
+        words = candidate.replace("'", "").split()
+        if not words or len(words) > 4 or NOT_A_NAME.intersection(words):
+            return None
+        if SCHEDULING_WORDS.intersection(words) or SYMPTOM_WORDS.intersection(words):
+            return None
+        if not all(word.isalpha() for word in words):
+            return None
+
+        name = parse_patient_name(candidate)
+        if not name:
+            return None
+
+        return self._next_step(session, {"patient_name": name}, ack="", route="name_capture")
+
+    def _capture_phone(self, text: str, session: Dict[str, Any]) -> Optional[FastPathAction]:
+        spoken = " ".join(SPOKEN_DIGITS.get(word, word) for word in re.split(r"[\s,]+", text))
+        phone = "".join(ch for ch in spoken if ch.isdigit() or ch == "+")
+        if sum(ch.isdigit() for ch in phone) < 7:
+            return None
+
+        is_valid, formatted, error = validate_phone_with_feedback(phone)
+        if not is_valid:
+            return FastPathAction(route="phone_invalid", reply=f"{error} Could you say the number again?")
+
+        return self._next_step(session, {"patient_phone": formatted}, ack="", route="phone_capture")
+
+    def _confirm_booking(self, text: str, session: Dict[str, Any]) -> Optional[FastPathAction]:
+        if NO_PATTERN.match(text):
+            return FastPathAction(
+                route="booking_declined",
+                reply="No problem. What would you like to change?",
+                updates={"current_step": "reviewing_booking"}
+            )
+        if NEGATION_PATTERN.search(text) or AMENDMENT_PATTERN.search(text):
+            return None
+        if not CONFIRM_PATTERN.match(text):
+            return None
+
+        hour = self._selected_hour(session)
+        required = ("patient_name", "patient_phone", "selected_doctor_id", "selected_date")
+        if hour is None or not all(session.get(key) for key in required):
+            return None
+
+        return FastPathAction(
+            route="booking_confirmed",
+            tool_name="book_appointment_in_hour_range",
+            arguments={
+                "patient_name": session["patient_name"],
+                "patient_phone": session["patient_phone"],
+                "doctor_id": session["selected_doctor_id"],
+                "appointment_date": session["selected_date"],
+                "time_range": format_hour(hour),
+                "reason": session.get("reason") or ""
+            },
+            render=self._render_booking
+        )
+
+    @staticmethod
+    def _render_booking(result: Dict[str, Any], session: Dict[str, Any]) -> str:
+        if not result.get("success"):
+            return result.get("error") or "I couldn't book that slot. Would another time work?"
+
+        appointment = result.get("appointment", {})
+        return (f"You're booked with {appointment.get('doctor_name', 'the doctor')} on "
+                f"{format_date(appointment.get('appointment_date'))} at "
+                f"{appointment.get('appointment_time_display', appointment.get('appointment_time'))}. "
+                f"Your confirmation number is {appointment.get('confirmation_number')}.")
+
+    # ------------------------------------------------------------------
+    # Parsers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_hour(text: str, offered: List[int]) -> Optional[int]:
+        for word, number in NUMBER_WORDS.items():
+            text = re.sub(rf"\b{word}\b", str(number), text)
+
+        # "11 or 3" - more than one candidate is not a pick
+        matches = list(TIME_PATTERN.finditer(text))
+        if len(matches) != 1:
+            return None
+        match = matches[0]
+
+        hour = int(match.group(1))
+        meridiem = (match.group(3) or "").replace(".", "").replace(" ", "")
+        if meridiem == "pm" and hour < 12:
+            return hour + 12
+        if meridiem == "am":
+            return 0 if hour == 12 else hour
+        if hour > 12:
+            return hour
+
+        # No AM/PM: take whichever reading is actually on offer
+        candidates = [h for h in (hour, hour + 12) if h in offered]
+        return candidates[0] if len(candidates) == 1 else None
+
+    @staticmethod
+    def _parse_date(text: str, today: Optional[date] = None) -> Optional[str]:
+        today = today or date.today()
+
+        # "friday or monday", "tomorrow or friday" - more than one day is not a pick
+        relative = re.findall(r"\b(today|tomorrow)\b", text)
+        weekdays = [index for index, weekday in enumerate(WEEKDAYS) if re.search(rf"\b{weekday}\b", text)]
+        if len(relative) + len(weekdays) > 1:
+            return None
+
+        if relative == ["today"]:
+            return today.isoformat()
+        if relative == ["tomorrow"]:
+            return (today + timedelta(days=1)).isoformat()
+
+        if weekdays:
+            days_ahead = (weekdays[0] - today.weekday()) % 7 or 7
+            if re.search(r"\bnext\b", text) and days_ahead < 7:
+                days_ahead += 7
+            return (today + timedelta(days=days_ahead)).isoformat()
+
+        month = None
+        month_match = MONTH_DAY_PATTERN.search(text)
+        day_match = DAY_MONTH_PATTERN.search(text)
+        if month_match:
+            month, day = MONTHS[month_match.group(1)], int(month_match.group(2))
+        elif day_match:
+            day, month = int(day_match.group(1)), MONTHS[day_match.group(2)]
+        else:
+            day_matches = list(DAY_OF_MONTH_PATTERN.finditer(text))
+            if len(day_matches) != 1:
+                return None
+            day_match = day_matches[0]
+            day = int(day_match.group(1) or day_match.group(2))
+
+        year = today.year
+        if month is None:
+            # "the 17th" - this month, or next month if already past
+            month = today.month
+            if day < today.day:
+                month, year = (1, year + 1) if month == 12 else (month + 1, year)
+        elif (month, day) < (today.month, today.day):
+            year += 1
+
+        try:
+            return date(year, month, day).isoformat()
+        except ValueError:
+            return None
@@ -1,7 +1,7 @@
 from typing import List, Dict, Optional, Tuple
 from qdrant_client import QdrantClient
 from app.config.voice_config import voice_config
-import openai
+from app.services.embedding_provider import embedding_provider
 import logging
 
 logger = logging.getLogger("knowledge_base")
@@ -20,23 +20,15 @@ class KnowledgeBaseService:
             api_key=voice_config.QDRANT_API_KEY,
             https=False
         )
-        openai.api_key = voice_config.OPENAI_API_KEY
         self.kb_collection = "healthcare_knowledge_base"
         self.doctors_collection = voice_config.QDRANT_COLLECTION_NAME
         self.embedding_model = voice_config.EMBEDDING_MODEL_NAME
         logger.info(f"Knowledge Base Service initialized")
     
     def _get_embedding(self, text: str) -> List[float]:
-        """Generate embedding for query using OpenAI"""
-        try:
-            response = openai.embeddings.create(
-                input=text,
-                model=self.embedding_model
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            logger.error(f"Error generating embedding: {e}")
-            return None
+        """Query embedding from the shared (cached) embedding provider"""
+        vector = embedding_provider.embed(text, self.embedding_model)
+        return vector.tolist() if vector is not None else None
     
     def search_knowledge(
         self,
@@ -0,0 +1,100 @@
+# app/services/model_tier_policy.py - Fast / smart model routing with escalation rules
+
+import re
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.voice_config import voice_config
+
+logger = logging.getLogger("openai")
+
+FAST = "fast"
+SMART = "smart"
+
+SENTENCE_END = re.compile(r"[.!?]\s*$")
+
+JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "object": dict,
+    "array": list,
+}
+
+
+class ModelTierPolicy:
+    """
+    ⚡ MODEL TIERING
+    Routine turns (short utterances, verbalising a tool result) run on the fast
+    model; long contexts go straight to the smart model. A fast-tier stream is
+    escalated to the smart model when its first tokens are low-confidence, it
+    produces a tool call whose arguments don't validate, or it comes back
+    truncated / empty.
+    """
+
+    def __init__(self):
+        self.enabled = voice_config.MODEL_TIERING_ENABLED
+        self.fast_model = voice_config.OPENAI_FAST_MODEL
+        self.smart_model = voice_config.OPENAI_MODEL
+        self.max_fast_words = voice_config.FAST_TIER_MAX_WORDS
+        self.long_context_tokens = voice_config.MODEL_LONG_CONTEXT_TOKENS
+        self.min_avg_logprob = voice_config.FAST_TIER_MIN_AVG_LOGPROB
+        self.confidence_tokens = voice_config.FAST_TIER_CONFIDENCE_TOKENS
+
+    def model_for(self, tier: str) -> str:
+        return self.fast_model if tier == FAST else self.smart_model
+
+    def first_call_tier(self, user_text: str, context_tokens: int = 0) -> Tuple[str, str]:
+        """Tier for the tool-calling completion, with the reason"""
+        if not self.enabled:
+            return SMART, "tiering_disabled"
+        if context_tokens > self.long_context_tokens:
+            return SMART, "long_context"
+        if len(user_text.split()) > self.max_fast_words:
+            return SMART, "long_utterance"
+        return FAST, "routine"
+
+    def verbalise_tier(self, context_tokens: int = 0) -> Tuple[str, str]:
+        """Tier for turning tool results into a spoken reply (LLM2)"""
+        if not self.enabled:
+            return SMART, "tiering_disabled"
+        if context_tokens > self.long_context_tokens:
+            return SMART, "long_context"
+        return FAST, "verbalise_tool_result"
+
+    def confidence_decided(self, text: str, logprobs: List[float]) -> bool:
+        """Enough of the reply to judge: a full first sentence, or N tokens"""
+        return bool(SENTENCE_END.search(text)) or len(logprobs) >= self.confidence_tokens
+
+    def is_low_confidence(self, logprobs: List[float]) -> bool:
+        if not logprobs:
+            return False
+        return sum(logprobs) / len(logprobs) < self.min_avg_logprob
+
+    @staticmethod
+    def validate_tool_call(call: Dict[str, Any], schemas: Dict[str, Dict[str, Any]]) -> Optional[str]:
+        """Why a tool call's arguments don't fit its schema, or None if they do"""
+        schema = schemas.get(call.get("name"))
+        if schema is None:
+            return f"unknown tool {call.get('name')}"
+
+        arguments = call.get("arguments")
+        if not isinstance(arguments, dict):
+            return "arguments are not an object"
+
+        parameters = schema.get("parameters", {})
+        for name in parameters.get("required", []):
+            if arguments.get(name) in (None, ""):
+                return f"missing {name}"
+
+        properties = parameters.get("properties", {})
+        for name, value in arguments.items():
+            expected = JSON_TYPES.get(properties.get(name, {}).get("type"))
+            if expected and value is not None and not isinstance(value, expected):
+                return f"{name} should be {properties[name]['type']}"
+
+        return None
+
+
+# Global instance
+model_tier_policy = ModelTierPolicy()
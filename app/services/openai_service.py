@@ -2,10 +2,12 @@
 
 import openai
 import json
-from typing import Optional, List, Dict, Any, AsyncGenerator
+from typing import Optional, List, Dict, Any, AsyncGenerator, Set, Union
 from app.config.voice_config import voice_config
 from datetime import datetime
 from openai import AsyncOpenAI
+from app.utils.conversation_window import ConversationWindow
+from app.services.model_tier_policy import model_tier_policy, FAST, SMART
 import logging
 
 logger = logging.getLogger("openai")
@@ -16,8 +18,8 @@ class OpenAIService:
     def __init__(self):
         self.client = AsyncOpenAI(api_key=voice_config.OPENAI_API_KEY)
         
-        self.fast_model = "gpt-4o-mini"
-        self.smart_model = "gpt-4o"
+        self.fast_model = voice_config.OPENAI_FAST_MODEL
+        self.smart_model = voice_config.OPENAI_MODEL
         
         self.voice = voice_config.OPENAI_VOICE
         self.system_prompt = voice_config.SYSTEM_PROMPT
@@ -93,7 +95,7 @@ class OpenAIService:
     
     def build_conversation_messages(
         self,
-        conversation_history: List[Dict[str, str]],
+        conversation_history: Union[List[Dict[str, str]], ConversationWindow],
         include_system: bool = True,
         compress: bool = True
     ) -> List[Dict[str, str]]:
@@ -119,6 +121,65 @@ class OpenAIService:
                 "content": enhanced_system_prompt
             })
 
+        messages.extend(self._prepare_history(conversation_history, compress))
+        
+        return messages
+
+    def build_cached_messages(
+        self,
+        conversation_history: Union[List[Dict[str, str]], ConversationWindow],
+        context: Optional[List[str]] = None,
+        session_facts: Optional[Dict[str, Any]] = None,
+        compress: bool = True
+    ) -> List[Dict[str, str]]:
+        """
+        ⚡ PROMPT-CACHE LAYOUT
+        [static system prompt] + history + [volatile context]
+        The system prompt (and the tool schemas sent with it) is byte-identical on
+        every call and the history only grows, so OpenAI can serve the prefix from
+        its prompt cache. Date, KB snippets and session facts go in a trailing
+        system message that is never stored in the history.
+        """
+        messages = [{"role": "system", "content": self.system_prompt}]
+        messages.extend(self._prepare_history(conversation_history, compress))
+        messages.append({
+            "role": "system",
+            "content": self._volatile_context(context, session_facts)
+        })
+        return messages
+
+    @staticmethod
+    def _volatile_context(
+        context: Optional[List[str]] = None,
+        session_facts: Optional[Dict[str, Any]] = None
+    ) -> str:
+        current_date = datetime.now()
+        lines = [
+            f"Today: {current_date.strftime('%A')}, {current_date.strftime('%B %d, %Y')}",
+            f"Year: {current_date.year}",
+            "Date format: YYYY-MM-DD"
+        ]
+        
+        if session_facts:
+            facts = {key: value for key, value in session_facts.items() if key != "call_summary"}
+            if facts:
+                lines.append("Known so far: " + ", ".join(f"{key}={value}" for key, value in facts.items()))
+            if session_facts.get("call_summary"):
+                lines.append(f"Earlier in the call: {session_facts['call_summary']}")
+        
+        lines.extend(context or [])
+        return "\n\n".join(lines)
+
+    def _prepare_history(
+        self,
+        conversation_history: Union[List[Dict[str, str]], ConversationWindow],
+        compress: bool = True
+    ) -> List[Dict[str, str]]:
+        """Drop orphaned tool messages and keep the last 20 messages"""
+        if isinstance(conversation_history, ConversationWindow):
+            # ⚡ Already validated and budgeted incrementally - O(window)
+            return conversation_history.messages()
+        
         # ⚡ STEP 1: Clean conversation history (remove orphaned tool messages)
         cleaned_history = []
         i = 0
@@ -171,9 +232,7 @@ class OpenAIService:
             print(f"⚠️ Removing orphaned tool message at start of final history")
             final_history.pop(0)
         
-        messages.extend(final_history)
-        
-        return messages
+        return final_history
     
     async def chat_completion_streaming(
         self,
@@ -185,6 +244,7 @@ class OpenAIService:
         """
         ⚡ ULTRA FAST: Streaming with optimized settings
         """
+        stream = None
         try:
             model = self.fast_model if use_fast_model else self.smart_model
             
@@ -238,6 +298,9 @@ class OpenAIService:
         except Exception as e:
             logger.error(f"Streaming error: {e}")
             yield "I apologize, but I encountered an error."
+
+        finally:
+            await self._close_stream(stream)
     
     async def process_user_input(
         self,
@@ -255,7 +318,8 @@ class OpenAIService:
             )
             messages.append({"role": "user", "content": user_message})
 
-            use_fast = (available_functions is None or len(available_functions) == 0)
+            tier, _ = model_tier_policy.first_call_tier(user_message)
+            use_fast = (not available_functions) or tier == FAST
             
             response = await self.chat_completion(
                 messages=messages,
@@ -281,12 +345,16 @@ class OpenAIService:
             }
 
             if choice.finish_reason == "tool_calls" and message.tool_calls:
-                tool_call = message.tool_calls[0]
-                result["function_call"] = {
-                    "name": tool_call.function.name,
-                    "arguments": json.loads(tool_call.function.arguments),
-                    "id": tool_call.id
-                }
+                # ⚡ Keep every tool call - independent ones can run in parallel
+                result["function_calls"] = [
+                    {
+                        "name": tool_call.function.name,
+                        "arguments": json.loads(tool_call.function.arguments),
+                        "id": tool_call.id
+                    }
+                    for tool_call in message.tool_calls
+                ]
+                result["function_call"] = result["function_calls"][0]
             else:
                 result["response"] = message.content
             
@@ -300,34 +368,408 @@ class OpenAIService:
                 "finish_reason": "error"
             }
 
+    async def stream_with_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        functions: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.6,
+        use_fast_model: bool = False,
+        max_tokens: int = 150,
+        tool_choice: str = "auto",
+        logprobs: bool = False
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        ⚡ STREAMING TOOL-AWARE COMPLETION
+        Yields {"type": "text"} deltas as they arrive and {"type": "tool_call"}
+        the moment a call's JSON arguments are complete - before the stream ends.
+        Finishes with {"type": "done"} (or {"type": "error"}); "done" carries the
+        token usage, including prompt tokens served from OpenAI's prompt cache.
+        With `logprobs`, text events also carry their tokens' log-probabilities.
+        """
+        stream = None
+        calls: Dict[int, Dict[str, Any]] = {}
+        emitted = set()
+        finish_reason = None
+        usage = None
+        
+        try:
+            params = {
+                "model": self.fast_model if use_fast_model else self.smart_model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True,
+                "stream_options": {"include_usage": True},
+            }
+            
+            if logprobs:
+                params["logprobs"] = True
+            
+            if functions:
+                params["tools"] = [
+                    {"type": "function", "function": func}
+                    for func in functions
+                ]
+                params["tool_choice"] = tool_choice
+            
+            stream = await self.client.chat.completions.create(**params)
+            
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = self._usage_dict(chunk.usage)
+                
+                if not chunk.choices:
+                    continue
+                
+                choice = chunk.choices[0]
+                delta = choice.delta
+                
+                if delta.content:
+                    event = {"type": "text", "data": delta.content}
+                    if logprobs and choice.logprobs and choice.logprobs.content:
+                        event["logprobs"] = [token.logprob for token in choice.logprobs.content]
+                    yield event
+                
+                # Tool-call arguments arrive as JSON fragments, keyed by index
+                for fragment in delta.tool_calls or []:
+                    call = calls.setdefault(fragment.index, {"id": None, "name": "", "arguments": ""})
+                    if fragment.id:
+                        call["id"] = fragment.id
+                    if fragment.function:
+                        if fragment.function.name:
+                            call["name"] += fragment.function.name
+                        if fragment.function.arguments:
+                            call["arguments"] += fragment.function.arguments
+                    
+                    ready = self._completed_tool_call(fragment.index, call, emitted)
+                    if ready:
+                        yield ready
+                
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+            
+            # Calls whose arguments never parsed on their own (e.g. no arguments)
+            for index in sorted(calls):
+                ready = self._completed_tool_call(index, calls[index], emitted, final=True)
+                if ready:
+                    yield ready
+            
+            yield {"type": "done", "data": {
+                "finish_reason": finish_reason,
+                "tool_calls": len(emitted),
+                "usage": usage
+            }}
+        
+        except Exception as e:
+            logger.error(f"Streaming error: {e}")
+            yield {"type": "error", "data": str(e)}
+        
+        finally:
+            await self._close_stream(stream)
+
+    @staticmethod
+    def _usage_dict(usage) -> Dict[str, int]:
+        details = getattr(usage, "prompt_tokens_details", None)
+        return {
+            "prompt_tokens": usage.prompt_tokens or 0,
+            "cached_tokens": (getattr(details, "cached_tokens", None) or 0) if details else 0,
+            "completion_tokens": usage.completion_tokens or 0
+        }
+
+    @staticmethod
+    def _completed_tool_call(
+        index: int,
+        call: Dict[str, Any],
+        emitted: set,
+        final: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Tool-call event once the accumulated arguments form a complete JSON object"""
+        if index in emitted or not call["id"] or not call["name"]:
+            return None
+        
+        try:
+            arguments = json.loads(call["arguments"]) if call["arguments"] else None
+        except json.JSONDecodeError:
+            arguments = None
+        
+        if not isinstance(arguments, dict):
+            if not final:
+                return None
+            if call["arguments"]:
+                logger.warning(f"Unparseable arguments for {call['name']}: {call['arguments'][:100]}")
+            arguments = {}
+        
+        emitted.add(index)
+        return {"type": "tool_call", "data": {
+            "name": call["name"],
+            "arguments": arguments,
+            "id": call["id"],
+            "index": index
+        }}
+
+    def build_turn_messages(
+        self,
+        user_message: str,
+        history: List[Dict[str, Any]],
+        context: Optional[List[str]] = None,
+        session_facts: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The first LLM call's prompt: [system] + history + [user] + [context].
+        `history` is already prepared and does not hold `user_message`. Real and
+        speculative turns both build their prompt here, so a claimed speculation
+        was sent exactly what the turn would have sent.
+        With PROMPT_CACHE_LAYOUT `context` / `session_facts` go in the trailing
+        volatile block; otherwise `context` follows as system messages.
+        """
+        turn = [*history, {"role": "user", "content": user_message}]
+        if voice_config.PROMPT_CACHE_LAYOUT:
+            return self.build_cached_messages(turn, context=context, session_facts=session_facts, compress=False)
+        
+        messages = self.build_conversation_messages(turn, compress=False)
+        messages.extend({"role": "system", "content": item} for item in context or [])
+        return messages
+
+    async def stream_turn(
+        self,
+        messages: List[Dict[str, Any]],
+        available_functions: Optional[List[Dict[str, Any]]],
+        tier: str,
+        early_tools: Optional[Set[str]] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        ⚡ The first LLM call of a turn on `tier`, with escalation (see
+        stream_with_escalation); calls to `early_tools` are released as soon as
+        they validate.
+        """
+        async for event in self.stream_with_escalation(
+            messages,
+            functions=available_functions,
+            tier=tier,
+            temperature=0.6,
+            max_tokens=150 if available_functions else 70,
+            early_tools=early_tools
+        ):
+            yield event
+
+    async def stream_with_escalation(
+        self,
+        messages: List[Dict[str, Any]],
+        functions: Optional[List[Dict[str, Any]]] = None,
+        tier: str = SMART,
+        temperature: float = 0.6,
+        max_tokens: int = 150,
+        early_tools: Optional[Set[str]] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        ⚡ stream_with_tools on a model tier, escalating fast -> smart
+        On the fast tier, text is held until its first sentence (or first few
+        tokens) proves confident; each tool call is validated against its schema
+        and, if it is one of `early_tools` (side-effect free), released at once
+        so it can start early - any other call is held until the stream completes. On escalation yields
+        {"type": "escalated", "data": {"reason": ..., "revoked": [call ids]}} -
+        the caller must cancel the released calls listed in "revoked" - and
+        continues with the smart model's events.
+        """
+        if tier != FAST:
+            async for event in self.stream_with_tools(
+                messages, functions=functions, temperature=temperature,
+                use_fast_model=False, max_tokens=max_tokens
+            ):
+                yield event
+            return
+        
+        schemas = {func["name"]: func for func in functions or []}
+        held_text = ""
+        token_logprobs: List[float] = []
+        confident = False
+        held_calls: List[Dict[str, Any]] = []
+        released_ids: List[str] = []
+        reason = None
+        
+        stream = self.stream_with_tools(
+            messages, functions=functions, temperature=temperature,
+            use_fast_model=True, max_tokens=max_tokens, logprobs=True
+        )
+        try:
+            async for event in stream:
+                event_type = event["type"]
+                
+                if event_type == "text":
+                    if confident:
+                        yield event
+                        continue
+                    held_text += event["data"]
+                    token_logprobs.extend(event.get("logprobs") or [])
+                    if model_tier_policy.confidence_decided(held_text, token_logprobs):
+                        if model_tier_policy.is_low_confidence(token_logprobs):
+                            reason = "low_confidence"
+                            break
+                        confident = True
+                        yield {"type": "text", "data": held_text}
+                
+                elif event_type == "tool_call":
+                    error = model_tier_policy.validate_tool_call(event["data"], schemas)
+                    if error and not confident:
+                        reason = f"invalid_tool_args: {error}"
+                        break
+                    if error:
+                        logger.warning(f"⚠️ Dropping invalid tool call after reply started: {error}")
+                        continue
+                    if event["data"]["name"] in (early_tools or ()):
+                        released_ids.append(event["data"]["id"])
+                        yield event
+                    else:
+                        held_calls.append(event)
+                
+                elif event_type == "done":
+                    # Once text has reached the caller the fast reply stands
+                    if not confident:
+                        has_calls = bool(held_calls or released_ids)
+                        if event["data"].get("finish_reason") == "length" and not has_calls:
+                            reason = "truncated"
+                        elif not held_text and not has_calls:
+                            reason = "empty"
+                        elif model_tier_policy.is_low_confidence(token_logprobs):
+                            reason = "low_confidence"
+                        if reason:
+                            break
+                        if held_text:
+                            yield {"type": "text", "data": held_text}
+                    
+                    for call in held_calls:
+                        yield call
+                    yield event
+                    return
+                
+                elif event_type == "error":
+                    if confident:
+                        yield event
+                        return
+                    reason = "error"
+                    break
+        finally:
+            await stream.aclose()
+        
+        if reason is None:
+            return
+        
+        logger.info(f"⬆️ Escalating to {self.smart_model}: {reason}")
+        yield {"type": "escalated", "data": {
+            "reason": reason, "from": self.fast_model, "to": self.smart_model, "revoked": released_ids
+        }}
+        
+        async for event in self.stream_with_tools(
+            messages, functions=functions, temperature=temperature,
+            use_fast_model=False, max_tokens=max_tokens
+        ):
+            yield event
+
     async def generate_response_streaming(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.6,  # ⚡ FASTER
-        use_fast_model: bool = False
+        use_fast_model: bool = False,
+        functions: Optional[List[Dict[str, Any]]] = None,
+        usage: Optional[Dict[str, int]] = None
     ) -> AsyncGenerator[str, None]:
         """
         ⚡ ULTRA FAST: Generate streaming response
+        `functions` are sent with tool_choice="none" only to keep the prompt prefix
+        identical to the tool-calling request (prompt cache); `usage`, if given,
+        is filled with the token counts.
         """
+        stream = None
         try:
             model = self.fast_model if use_fast_model else self.smart_model
             
-            stream = await self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=70,  # ⚡ Brief responses
-                stream=True
-            )
+            params = {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": 70,  # ⚡ Brief responses
+                "stream": True,
+                "stream_options": {"include_usage": True},
+            }
+            
+            if functions:
+                params["tools"] = [
+                    {"type": "function", "function": func}
+                    for func in functions
+                ]
+                params["tool_choice"] = "none"
+            
+            stream = await self.client.chat.completions.create(**params)
             
             async for chunk in stream:
-                if chunk.choices[0].delta.content:
+                if chunk.usage and usage is not None:
+                    usage.update(self._usage_dict(chunk.usage))
+                if chunk.choices and chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
                     
         except Exception as e:
             logger.error(f"Streaming error: {e}")
             yield "I apologize, but I encountered an error."
 
+        finally:
+            # ⚡ Barge-in / early exit: drop the HTTP stream so generation stops
+            await self._close_stream(stream)
+
+    async def summarize_call_facts(
+        self,
+        facts: Dict[str, Any],
+        messages: List[Dict[str, Any]],
+        fields: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        ⚡ CALL FACTS: fold older turns into the structured facts block
+        Runs in the background on the fast model; returns the updated `fields`
+        plus a short cumulative "call_summary", or None on failure.
+        """
+        lines = []
+        for message in messages:
+            if message.get("content") and message.get("role") in ("user", "assistant"):
+                lines.append(f"{message['role']}: {message['content']}")
+            for call in message.get("tool_calls") or []:
+                function = call.get("function", {})
+                lines.append(f"tool {function.get('name')}: {function.get('arguments')}")
+        
+        if not lines:
+            return None
+        
+        prompt = f"""Known call facts (JSON): {json.dumps(facts)}
+
+Older part of the phone call:
+{chr(10).join(lines)}
+
+Update the call facts. Return ONLY a JSON object with the keys {json.dumps(fields + ["call_summary"])}.
+Keep known values unless the call clearly changed them; use null when unknown.
+"call_summary": what the patient wants and what was settled so far, max 40 words."""
+        
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.fast_model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+                max_tokens=200,
+                response_format={"type": "json_object"}
+            )
+            result = json.loads(response.choices[0].message.content)
+            return result if isinstance(result, dict) else None
+        
+        except Exception as e:
+            logger.error(f"Call facts summary error: {e}")
+            return None
+
+    @staticmethod
+    async def _close_stream(stream) -> None:
+        if stream is None:
+            return
+        try:
+            await stream.close()
+        except Exception as e:
+            logger.debug(f"Stream close error: {e}")
+
 
 # Global instance
 openai_service = OpenAIService()
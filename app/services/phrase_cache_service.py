@@ -0,0 +1,141 @@
+# app/services/phrase_cache_service.py - Pre-rendered audio for fixed phrases
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, AsyncGenerator
+import aiofiles
+from app.services.elevenlabs_service import (
+    elevenlabs_service,
+    AUDIO_DIR,
+    VOICE_ID,
+    MODEL_ID,
+    OUTPUT_FORMAT,
+    VOICE_SETTINGS
+)
+
+logger = logging.getLogger(__name__)
+
+PHRASE_DIR = os.path.join(AUDIO_DIR, "phrases")
+
+
+class PhraseAudioCache:
+    """
+    ⚡ μ-law audio for fixed phrases (greeting, apologies) kept on disk and in memory.
+    Keys cover text + voice + model + settings, so changing any of them re-renders.
+    """
+
+    def __init__(self, audio_dir: str = PHRASE_DIR):
+        self.audio_dir = audio_dir
+        self._memory: Dict[str, bytes] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        os.makedirs(self.audio_dir, exist_ok=True)
+
+    @staticmethod
+    def phrase_key(text: str) -> str:
+        """Stable key for a phrase under the current voice configuration"""
+        identity = json.dumps({
+            "text": text.strip(),
+            "voice_id": VOICE_ID,
+            "model_id": MODEL_ID,
+            "output_format": OUTPUT_FORMAT,
+            "voice_settings": VOICE_SETTINGS
+        }, sort_keys=True)
+        return hashlib.sha256(identity.encode()).hexdigest()[:32]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.audio_dir, f"{key}.ulaw")
+
+    async def get(self, text: str) -> Optional[bytes]:
+        """Return cached audio (memory first, then disk) or None"""
+        key = self.phrase_key(text)
+
+        audio = self._memory.get(key)
+        if audio is not None:
+            return audio
+
+        # Read off the loop - this runs while a caller waits for the greeting
+        try:
+            async with aiofiles.open(self._path(key), "rb") as f:
+                audio = await f.read()
+        except FileNotFoundError:
+            return None
+
+        if audio:
+            self._memory[key] = audio
+            return audio
+        return None
+
+    async def render(self, text: str) -> Optional[bytes]:
+        """Return cached audio, synthesizing and storing it on a miss"""
+        audio = await self.get(text)
+        if audio is not None:
+            return audio
+
+        key = self.phrase_key(text)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                return audio
+
+            start_time = time.time()
+            chunks = []
+            # No Deepgram fallback - a fallback voice must never be cached
+            async for audio in elevenlabs_service.generate(text, fallback=False):
+                if audio:
+                    chunks.append(audio)
+
+            if not chunks:
+                logger.error(f"❌ Could not render phrase: '{text[:50]}'")
+                return None
+
+            audio = b"".join(chunks)
+            self._memory[key] = audio
+
+            try:
+                await asyncio.to_thread(self._write, key, audio)
+            except Exception as e:
+                logger.error(f"❌ Phrase cache write error: {e}")
+
+            logger.info(f"✓ Phrase rendered ({len(audio)} bytes) in {(time.time() - start_time) * 1000:.0f}ms: '{text[:50]}'")
+            return audio
+
+    def _write(self, key: str, audio: bytes) -> None:
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, self._path(key))
+
+    async def warm(self, phrases: List[str]) -> int:
+        """Load or render every phrase; returns how many are ready"""
+        ready = 0
+        for text in phrases:
+            try:
+                if await self.render(text):
+                    ready += 1
+            except Exception as e:
+                logger.error(f"❌ Phrase warm-up error: {e}")
+        logger.info(f"✓ Phrase cache warm: {ready}/{len(phrases)} phrases")
+        return ready
+
+    async def generate(self, text: str, tts_service: any = None) -> AsyncGenerator[bytes, None]:
+        """
+        TTS-compatible generator: cached audio in one chunk, otherwise render
+        and cache it. Falls back to live TTS if rendering fails.
+        """
+        audio = await self.render(text)
+        if audio:
+            yield audio
+            return
+
+        async for chunk in (tts_service or elevenlabs_service).generate(text):
+            yield chunk
+
+
+# Global instance
+phrase_cache = PhraseAudioCache()
@@ -2,80 +2,411 @@
 
 import json
 import redis
-from typing import Optional, Dict, Any, List
+import redis.asyncio as aioredis
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
-from app.config.redis_config import get_redis_client
+from app.config.redis_config import get_redis_client, get_async_redis_client
 from app.config.voice_config import voice_config
+from app.utils.conversation_window import ConversationWindow
 import logging
 import hashlib
+import time
 
 logger = logging.getLogger("redis")
 
-class RedisService:
-    def __init__(self):
-        self.redis_client: redis.Redis = get_redis_client()
-        self.default_ttl = voice_config.CALL_SESSION_TTL
+HISTORY_FIELD = "conversation_history"
+
+# ⚡ Active-call index: sorted set of call_sid scored by session expiry time
+# (= last activity + TTL), so listing never needs KEYS and expired entries
+# are pruned with one ZREMRANGEBYSCORE
+ACTIVE_SESSIONS_KEY = "call_sessions:active"
+
+# KEYS: session hash, conversation list, index | ARGV: ttl, expires_at, call_sid, field, value...
+UPDATE_SESSION_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[3])
+return 1
+"""
+
+# KEYS: session hash, conversation list, index | ARGV: ttl, expires_at, call_sid, updated_at, message...
+APPEND_CONVERSATION_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+local length = redis.call('RPUSH', KEYS[2], unpack(ARGV, 5))
+redis.call('HSET', KEYS[1], 'updated_at', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[3])
+return length
+"""
+
+
+@dataclass
+class TurnContext:
+    """
+    ⚡ Everything one conversational turn reads from and writes to Redis.
+    Filled by a single read pipeline (begin_turn); writes are buffered here
+    and flushed by a single pipeline (commit_turn).
+    """
+    call_sid: str
+    session: Optional[Dict[str, Any]] = None
+    pending_messages: List[Dict[str, Any]] = field(default_factory=list)
+    pending_updates: Dict[str, Any] = field(default_factory=dict)
+    pending_tool_cache: List[Tuple[str, str, Dict[str, Any], int]] = field(default_factory=list)
+    window: Optional[ConversationWindow] = None  # call's in-memory window, kept in step with add_message
+
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        """Conversation as the LLM should see it, incl. this turn's unsaved messages"""
+        if not self.session:
+            return list(self.pending_messages)
+        return self.session.get(HISTORY_FIELD, []) + self.pending_messages
+
+    def add_message(
+        self,
+        role: str,
+        content: str = None,
+        tool_calls: List[Dict] = None,
+        tool_call_id: str = None,
+        name: str = None
+    ) -> None:
+        message = RedisKeys._build_message(role, content, tool_calls, tool_call_id, name)
+        self.pending_messages.append(message)
+        if self.window is not None:
+            self.window.append(message)
+
+    def update(self, updates: Dict[str, Any]) -> None:
+        self.pending_updates.update(updates)
+        if self.session is not None:
+            self.session.update(updates)
+
+    def cache_tool_result(self, tool_name: str, args_hash: str, result: Dict[str, Any], ttl: int = 300) -> None:
+        self.pending_tool_cache.append((tool_name, args_hash, result, ttl))
+
+    def has_writes(self) -> bool:
+        return bool(self.pending_messages or self.pending_updates or self.pending_tool_cache)
+
+    def clear_writes(self) -> None:
+        self.pending_messages = []
+        self.pending_updates = {}
+        self.pending_tool_cache = []
+
+
+class RedisKeys:
+    """
+    Key layout and serialisation shared by the sync and asyncio services.
+
+    ⚡ A session is two keys: a hash of scalars (JSON-encoded values) at
+    call_session:{sid} and an append-only list of messages at
+    call_session:{sid}:conversation. Appends are one RPUSH instead of a
+    read-modify-write of the whole session blob.
+    """
 
     def _get_key(self, call_sid: str) -> str:
         return f"call_session:{call_sid}"
+
+    def _get_conversation_key(self, call_sid: str) -> str:
+        return f"call_session:{call_sid}:conversation"
+
+    def _session_keys(self, call_sid: str) -> List[str]:
+        """KEYS for the session scripts: hash, conversation list, active index"""
+        return [self._get_key(call_sid), self._get_conversation_key(call_sid), ACTIVE_SESSIONS_KEY]
+
+    def _index_args(self, call_sid: str, ttl: int = None) -> List[Any]:
+        ttl = ttl or self.default_ttl
+        return [ttl, time.time() + ttl, call_sid]
     
     def _get_cache_key(self, prefix: str, identifier: str) -> str:
         """⚡ Generate cache keys"""
         return f"cache:{prefix}:{identifier}"
 
+    def _get_temp_key(self, call_sid: str, key: str) -> str:
+        return f"temp:{call_sid}:{key}"
+
+    @staticmethod
+    def _build_message(
+        role: str,
+        content: str = None,
+        tool_calls: List[Dict] = None,
+        tool_call_id: str = None,
+        name: str = None
+    ) -> Dict[str, Any]:
+        """Conversation entry incl. tool calls and tool responses"""
+        message = {
+            "role": role,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        # Add content if provided
+        if content is not None:
+            message["content"] = content
+        
+        # Add tool_calls if provided (for assistant messages)
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        
+        # Add tool_call_id if provided (for tool response messages)
+        if tool_call_id:
+            message["tool_call_id"] = tool_call_id
+        
+        # Add name if provided (for tool response messages)
+        if name:
+            message["name"] = name
+
+        return message
+
+    @staticmethod
+    def _encode_fields(data: Dict[str, Any]) -> Dict[str, str]:
+        """Session scalars -> hash fields (JSON keeps None / numbers intact)"""
+        return {name: json.dumps(value) for name, value in data.items() if name != HISTORY_FIELD}
+
+    def _update_args(self, call_sid: str, updates: Dict[str, Any]) -> List[Any]:
+        fields = self._encode_fields(updates)
+        fields['updated_at'] = json.dumps(datetime.now().isoformat())
+        args = self._index_args(call_sid)
+        for name, value in fields.items():
+            args.extend((name, value))
+        return args
+
+    def _append_args(self, call_sid: str, messages: List[Dict[str, Any]]) -> List[Any]:
+        return (self._index_args(call_sid)
+                + [json.dumps(datetime.now().isoformat())]
+                + [json.dumps(m) for m in messages])
+
+    def _history_range(self, full_history: bool) -> tuple:
+        """LRANGE bounds: the last SESSION_HISTORY_WINDOW messages unless full_history"""
+        if full_history or voice_config.SESSION_HISTORY_WINDOW <= 0:
+            return 0, -1
+        return -voice_config.SESSION_HISTORY_WINDOW, -1
+
+    @staticmethod
+    def _session_from_redis(fields: Dict[str, str], history: List[str]) -> Optional[Dict[str, Any]]:
+        if not fields:
+            return None
+        session = {name: json.loads(value) for name, value in fields.items()}
+        session[HISTORY_FIELD] = [json.loads(message) for message in history]
+        return session
+
+    # ------------------------------------------------------------------
+    # Session pipelines
+    # ------------------------------------------------------------------
+
+    def _queue_create(self, pipe, call_sid: str, session_data: Dict[str, Any]) -> None:
+        """Replace any previous session under call_sid and index it as active"""
+        key = self._get_key(call_sid)
+        conversation_key = self._get_conversation_key(call_sid)
+        session_data['created_at'] = datetime.now().isoformat()
+        session_data['updated_at'] = datetime.now().isoformat()
+
+        pipe.delete(key, conversation_key)
+        pipe.hset(key, mapping=self._encode_fields(session_data))
+        pipe.expire(key, self.default_ttl)
+        self._queue_history(pipe, conversation_key, session_data.get(HISTORY_FIELD) or [])
+        pipe.zadd(ACTIVE_SESSIONS_KEY, {call_sid: time.time() + self.default_ttl})
+
+    def _queue_history(self, pipe, conversation_key: str, history: List[Dict[str, Any]]) -> None:
+        if history:
+            pipe.rpush(conversation_key, *[json.dumps(m) for m in history])
+            pipe.expire(conversation_key, self.default_ttl)
+
+    def _queue_replace_history(self, pipe, call_sid: str, history: List[Dict[str, Any]]) -> None:
+        conversation_key = self._get_conversation_key(call_sid)
+        pipe.delete(conversation_key)
+        self._queue_history(pipe, conversation_key, history)
+
+    def _queue_session_reads(self, pipe, call_sid: str, full_history: bool) -> None:
+        start, end = self._history_range(full_history)
+        pipe.hgetall(self._get_key(call_sid))
+        pipe.lrange(self._get_conversation_key(call_sid), start, end)
+
+    def _queue_delete(self, pipe, call_sid: str) -> None:
+        pipe.delete(self._get_key(call_sid), self._get_conversation_key(call_sid))
+        pipe.zrem(ACTIVE_SESSIONS_KEY, call_sid)
+
+    def _queue_extend(self, pipe, call_sid: str, ttl: int) -> None:
+        pipe.expire(self._get_key(call_sid), ttl)
+        pipe.expire(self._get_conversation_key(call_sid), ttl)
+        pipe.zadd(ACTIVE_SESSIONS_KEY, {call_sid: time.time() + ttl})
+
+    # ------------------------------------------------------------------
+    # Turn pipelines (commands are queued identically on sync and async pipelines)
+    # ------------------------------------------------------------------
+
+    def _queue_append(self, pipe, call_sid: str, messages: List[Dict[str, Any]]) -> None:
+        pipe.eval(APPEND_CONVERSATION_LUA, 3, *self._session_keys(call_sid), *self._append_args(call_sid, messages))
+
+    def _queue_turn_reads(self, pipe, call_sid: str, user_message: Optional[Dict[str, Any]]) -> None:
+        """[append user message] + session hash + history window"""
+        if user_message:
+            self._queue_append(pipe, call_sid, [user_message])
+        self._queue_session_reads(pipe, call_sid, False)
+
+    def _turn_from_results(self, call_sid: str, results: List[Any]) -> TurnContext:
+        fields, history = results[-2:]
+        return TurnContext(call_sid=call_sid, session=self._session_from_redis(fields, history))
+
+    def _queue_turn_writes(self, pipe, turn: TurnContext) -> None:
+        if turn.pending_messages:
+            self._queue_append(pipe, turn.call_sid, turn.pending_messages)
+        if turn.pending_updates:
+            pipe.eval(
+                UPDATE_SESSION_LUA, 3,
+                *self._session_keys(turn.call_sid),
+                *self._update_args(turn.call_sid, turn.pending_updates)
+            )
+        for tool_name, args_hash, result, ttl in turn.pending_tool_cache:
+            pipe.setex(self._tool_cache_key(tool_name, args_hash), ttl, json.dumps(result))
+
+    # ------------------------------------------------------------------
+    # Active session listing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _queue_index_page(pipe, offset: int, limit: int) -> None:
+        """Prune expired entries, count, and read one page (most recently active first)"""
+        pipe.zremrangebyscore(ACTIVE_SESSIONS_KEY, "-inf", time.time())
+        pipe.zcard(ACTIVE_SESSIONS_KEY)
+        pipe.zrevrange(ACTIVE_SESSIONS_KEY, offset, offset + limit - 1)
+
+    def _queue_session_fields(self, pipe, call_sids: List[str]) -> None:
+        for call_sid in call_sids:
+            pipe.hgetall(self._get_key(call_sid))
+
+    def _sessions_from_fields(
+        self,
+        call_sids: List[str],
+        results: List[Dict[str, str]]
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """(sessions, call_sids still indexed whose session has expired)"""
+        sessions = []
+        stale = []
+        for call_sid, fields in zip(call_sids, results):
+            session = self._session_from_redis(fields, [])
+            if session:
+                sessions.append(session)
+            else:
+                stale.append(call_sid)
+        return sessions, stale
+
+    @staticmethod
+    def _session_page(
+        offset: int,
+        limit: int,
+        total: int,
+        sessions: List[Dict[str, Any]],
+        pruned: int = 0
+    ) -> Dict[str, Any]:
+        # Entries pruned from this page shift the following ones back
+        total -= pruned
+        next_offset = offset + limit - pruned
+        return {
+            "sessions": sessions,
+            "total": total,
+            "offset": offset,
+            "next_offset": next_offset if next_offset < total else None
+        }
+
+    def _tool_cache_key(self, tool_name: str, args_hash: str) -> str:
+        return self._get_cache_key(f"tool:{tool_name}", args_hash)
+
+    def _tool_cache_keys(self, lookups: List[Tuple[str, str]]) -> List[str]:
+        return [self._tool_cache_key(tool_name, args_hash) for tool_name, args_hash in lookups]
+
+    def _tool_results_from(self, values: List[Any]) -> List[Optional[Dict[str, Any]]]:
+        return [self._json_from(v) for v in values]
+
+    def _json_from(self, data: Any) -> Optional[Any]:
+        return json.loads(self._decode(data)) if data else None
+
+    @staticmethod
+    def _decode(data: Any) -> str:
+        return data.decode('utf-8') if isinstance(data, bytes) else data
+
+    @staticmethod
+    def hash_query(text: str) -> str:
+        """⚡ Generate hash for caching"""
+        return hashlib.md5(text.lower().strip().encode()).hexdigest()
+
+
+class RedisService(RedisKeys):
+    """
+    Blocking redis-py client - for scripts and sync code paths only.
+    Code running on the event loop must use AsyncRedisService.
+    """
+
+    def __init__(self):
+        self.redis_client: redis.Redis = get_redis_client()
+        self.default_ttl = voice_config.CALL_SESSION_TTL
+        self._update_script = self.redis_client.register_script(UPDATE_SESSION_LUA)
+        self._append_script = self.redis_client.register_script(APPEND_CONVERSATION_LUA)
+
     def create_session(self, call_sid: str, session_data: Dict[str, Any]) -> bool:
         try:
             logger.debug(f"Creating session for {call_sid}")
-            key = self._get_key(call_sid)
-            session_data['created_at'] = datetime.now().isoformat()
-            session_data['updated_at'] = datetime.now().isoformat()
-
-            self.redis_client.setex(
-                key,
-                self.default_ttl,
-                json.dumps(session_data)
-            )
+            pipe = self.redis_client.pipeline(transaction=True)
+            self._queue_create(pipe, call_sid, session_data)
+            pipe.execute()
+
             logger.debug(f"✓ Created session: {call_sid}")
             return True
         except Exception as e:
             logger.error(f"❌ Error creating session: {e}")
             return False
 
-    def get_session(self, call_sid: str) -> Optional[Dict[str, Any]]:
+    def get_session(self, call_sid: str, full_history: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Session scalars plus the last SESSION_HISTORY_WINDOW messages
+        (full_history=True for the whole call, e.g. when archiving it)
+        """
         try:
-            key = self._get_key(call_sid)
-            data = self.redis_client.get(key)
-
-            if data:
-                return json.loads(data)
-            return None
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_session_reads(pipe, call_sid, full_history)
+            return self._session_from_redis(*pipe.execute())
         except Exception as e:
             logger.error(f"❌ Error getting session {call_sid}: {e}")
             return None
 
     def update_session(self, call_sid: str, updates: Dict[str, Any]) -> bool:
+        """⚡ Atomic HSET of the changed fields only (no-op if the session expired)"""
         try:
             logger.debug(f"Updating session {call_sid} with {updates}")
-            session = self.get_session(call_sid)
-            if not session:
+
+            updated = self._update_script(
+                keys=self._session_keys(call_sid),
+                args=self._update_args(call_sid, updates)
+            )
+            if not updated:
                 logger.warning(f"Session not found: {call_sid}")
                 return False
 
-            session.update(updates)
-            session['updated_at'] = datetime.now().isoformat()
+            if HISTORY_FIELD in updates:
+                pipe = self.redis_client.pipeline(transaction=True)
+                self._queue_replace_history(pipe, call_sid, updates[HISTORY_FIELD] or [])
+                pipe.execute()
 
-            key = self._get_key(call_sid)
-            self.redis_client.setex(
-                key,
-                self.default_ttl,
-                json.dumps(session)
-            )
             logger.debug(f"✓ Updated session: {call_sid}")
             return True
         except Exception as e:
             logger.error(f"❌ Error updating session: {e}")
             return False
 
+    def append_messages(self, call_sid: str, messages: List[Dict[str, Any]]) -> bool:
+        """⚡ RPUSH messages + TTL refresh in one atomic round-trip"""
+        if not messages:
+            return True
+        try:
+            length = self._append_script(
+                keys=self._session_keys(call_sid),
+                args=self._append_args(call_sid, messages)
+            )
+            return bool(length)
+        except Exception as e:
+            logger.error(f"❌ Error appending to conversation: {e}")
+            return False
+
     def append_to_conversation(
         self, 
         call_sid: str, 
@@ -88,42 +419,42 @@ class RedisService:
         """
         ⚡ FIXED: Support tool calls and tool responses
         """
+        message = self._build_message(role, content, tool_calls, tool_call_id, name)
+        return self.append_messages(call_sid, [message])
+
+    # ⚡ Batched turn API: one pipeline to read, one to write
+    def begin_turn(self, call_sid: str, user_text: str) -> TurnContext:
+        """Append the user's message and load session and history in one round-trip"""
         try:
-            session = self.get_session(call_sid)
-            if not session:
-                return False
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_turn_reads(pipe, call_sid, self._build_message("user", user_text))
+            return self._turn_from_results(call_sid, pipe.execute())
+        except Exception as e:
+            logger.error(f"❌ Error loading turn for {call_sid}: {e}")
+            return TurnContext(call_sid=call_sid)
 
-            if 'conversation_history' not in session:
-                session['conversation_history'] = []
-
-            message = {
-                "role": role,
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            # Add content if provided
-            if content is not None:
-                message["content"] = content
-            
-            # Add tool_calls if provided (for assistant messages)
-            if tool_calls:
-                message["tool_calls"] = tool_calls
-            
-            # Add tool_call_id if provided (for tool response messages)
-            if tool_call_id:
-                message["tool_call_id"] = tool_call_id
-            
-            # Add name if provided (for tool response messages)
-            if name:
-                message["name"] = name
-
-            session['conversation_history'].append(message)
-
-            return self.update_session(call_sid, {
-                'conversation_history': session['conversation_history']
-            })
+    def get_cached_tool_results(self, lookups: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """MGET several (tool_name, args_hash) results at once"""
+        if not lookups:
+            return []
+        try:
+            return self._tool_results_from(self.redis_client.mget(self._tool_cache_keys(lookups)))
         except Exception as e:
-            logger.error(f"❌ Error appending to conversation: {e}")
+            logger.error(f"❌ Tool cache retrieval error: {e}")
+            return [None] * len(lookups)
+
+    def commit_turn(self, turn: TurnContext) -> bool:
+        """Flush all of a turn's buffered writes in one round-trip"""
+        if not turn.has_writes():
+            return True
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_turn_writes(pipe, turn)
+            pipe.execute()
+            turn.clear_writes()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error committing turn for {turn.call_sid}: {e}")
             return False
 
     # ⚡ Response caching methods
@@ -154,7 +485,7 @@ class RedisService:
             data = self.redis_client.get(key)
             if data:
                 logger.debug(f"✓ Cache hit: {query_hash[:8]}")
-                return data.decode('utf-8') if isinstance(data, bytes) else data
+                return self._decode(data)
             return None
         except Exception as e:
             logger.error(f"❌ Cache retrieval error: {e}")
@@ -171,7 +502,7 @@ class RedisService:
         ⚡ Cache tool execution results
         """
         try:
-            key = self._get_cache_key(f"tool:{tool_name}", args_hash)
+            key = self._tool_cache_key(tool_name, args_hash)
             self.redis_client.setex(key, ttl, json.dumps(result))
             logger.debug(f"✓ Cached tool result: {tool_name}")
             return True
@@ -188,26 +519,21 @@ class RedisService:
         ⚡ Get cached tool result
         """
         try:
-            key = self._get_cache_key(f"tool:{tool_name}", args_hash)
+            key = self._tool_cache_key(tool_name, args_hash)
             data = self.redis_client.get(key)
             if data:
                 logger.debug(f"✓ Tool cache hit: {tool_name}")
-                data_str = data.decode('utf-8') if isinstance(data, bytes) else data
-                return json.loads(data_str)
+                return self._json_from(data)
             return None
         except Exception as e:
             logger.error(f"❌ Tool cache retrieval error: {e}")
             return None
     
-    @staticmethod
-    def hash_query(text: str) -> str:
-        """⚡ Generate hash for caching"""
-        return hashlib.md5(text.lower().strip().encode()).hexdigest()
-
     def delete_session(self, call_sid: str) -> bool:
         try:
-            key = self._get_key(call_sid)
-            self.redis_client.delete(key)
+            pipe = self.redis_client.pipeline(transaction=True)
+            self._queue_delete(pipe, call_sid)
+            pipe.execute()
             logger.debug(f"✓ Deleted session: {call_sid}")
             return True
         except Exception as e:
@@ -216,38 +542,56 @@ class RedisService:
 
     def extend_session_ttl(self, call_sid: str, extra_seconds: int = 300) -> bool:
         try:
-            key = self._get_key(call_sid)
-            current_ttl = self.redis_client.ttl(key)
+            current_ttl = self.redis_client.ttl(self._get_key(call_sid))
 
             if current_ttl > 0:
-                new_ttl = current_ttl + extra_seconds
-                self.redis_client.expire(key, new_ttl)
+                pipe = self.redis_client.pipeline(transaction=False)
+                self._queue_extend(pipe, call_sid, current_ttl + extra_seconds)
+                pipe.execute()
                 return True
             return False
         except Exception as e:
             logger.error(f"❌ Error extending TTL: {e}")
             return False
 
-    def get_all_active_sessions(self) -> list[Dict[str, Any]]:
+    def list_active_sessions(self, offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        ⚡ One page of active sessions (scalars only, most recently active first).
+        Reads the active index - never KEYS/SCAN over the keyspace.
+        """
         try:
-            pattern = "call_session:*"
-            keys = self.redis_client.keys(pattern)
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_index_page(pipe, offset, limit)
+            _, total, call_sids = pipe.execute()
 
-            sessions = []
-            for key in keys:
-                data = self.redis_client.get(key)
-                if data:
-                    sessions.append(json.loads(data))
+            if not call_sids:
+                return self._session_page(offset, limit, total, [])
 
-            return sessions
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_session_fields(pipe, call_sids)
+            sessions, stale = self._sessions_from_fields(call_sids, pipe.execute())
+
+            if stale:
+                self.redis_client.zrem(ACTIVE_SESSIONS_KEY, *stale)
+
+            return self._session_page(offset, limit, total, sessions, pruned=len(stale))
         except Exception as e:
-            logger.error(f"❌ Error getting active sessions: {e}")
-            return []
+            logger.error(f"❌ Error listing active sessions: {e}")
+            return self._session_page(offset, limit, 0, [])
+
+    def get_all_active_sessions(self, page_size: int = 100) -> list[Dict[str, Any]]:
+        """All active sessions, fetched page by page from the active index"""
+        sessions = []
+        offset = 0
+        while offset is not None:
+            page = self.list_active_sessions(offset, page_size)
+            sessions.extend(page["sessions"])
+            offset = page["next_offset"]
+        return sessions
 
     def set_temp_data(self, call_sid: str, key: str, value: Any, ttl: int = 300) -> bool:
         try:
-            redis_key = f"temp:{call_sid}:{key}"
-            self.redis_client.setex(redis_key, ttl, json.dumps(value))
+            self.redis_client.setex(self._get_temp_key(call_sid, key), ttl, json.dumps(value))
             return True
         except Exception as e:
             logger.error(f"❌ Error setting temp data: {e}")
@@ -255,13 +599,267 @@ class RedisService:
 
     def get_temp_data(self, call_sid: str, key: str) -> Optional[Any]:
         try:
-            redis_key = f"temp:{call_sid}:{key}"
-            data = self.redis_client.get(redis_key)
-            return json.loads(data) if data else None
+            return self._json_from(self.redis_client.get(self._get_temp_key(call_sid, key)))
+        except Exception as e:
+            logger.error(f"❌ Error getting temp data: {e}")
+            return None
+
+
+
+class AsyncRedisService(RedisKeys):
+    """
+    ⚡ NON-BLOCKING: same API as RedisService on redis.asyncio.
+    The voice pipeline shares one event loop with every call's 20ms audio
+    frames, so a slow Redis round-trip must yield instead of blocking it.
+    """
+
+    def __init__(self):
+        self.redis_client: aioredis.Redis = get_async_redis_client()
+        self.default_ttl = voice_config.CALL_SESSION_TTL
+        self._update_script = self.redis_client.register_script(UPDATE_SESSION_LUA)
+        self._append_script = self.redis_client.register_script(APPEND_CONVERSATION_LUA)
+
+    async def create_session(self, call_sid: str, session_data: Dict[str, Any]) -> bool:
+        try:
+            logger.debug(f"Creating session for {call_sid}")
+            pipe = self.redis_client.pipeline(transaction=True)
+            self._queue_create(pipe, call_sid, session_data)
+            await pipe.execute()
+
+            logger.debug(f"✓ Created session: {call_sid}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error creating session: {e}")
+            return False
+
+    async def get_session(self, call_sid: str, full_history: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Session scalars plus the last SESSION_HISTORY_WINDOW messages
+        (full_history=True for the whole call, e.g. when archiving it)
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_session_reads(pipe, call_sid, full_history)
+            return self._session_from_redis(*await pipe.execute())
+        except Exception as e:
+            logger.error(f"❌ Error getting session {call_sid}: {e}")
+            return None
+
+    async def update_session(self, call_sid: str, updates: Dict[str, Any]) -> bool:
+        """⚡ Atomic HSET of the changed fields only (no-op if the session expired)"""
+        try:
+            logger.debug(f"Updating session {call_sid} with {updates}")
+
+            updated = await self._update_script(
+                keys=self._session_keys(call_sid),
+                args=self._update_args(call_sid, updates)
+            )
+            if not updated:
+                logger.warning(f"Session not found: {call_sid}")
+                return False
+
+            if HISTORY_FIELD in updates:
+                pipe = self.redis_client.pipeline(transaction=True)
+                self._queue_replace_history(pipe, call_sid, updates[HISTORY_FIELD] or [])
+                await pipe.execute()
+
+            logger.debug(f"✓ Updated session: {call_sid}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error updating session: {e}")
+            return False
+
+
+    async def append_messages(self, call_sid: str, messages: List[Dict[str, Any]]) -> bool:
+        """⚡ RPUSH messages + TTL refresh in one atomic round-trip"""
+        if not messages:
+            return True
+        try:
+            length = await self._append_script(
+                keys=self._session_keys(call_sid),
+                args=self._append_args(call_sid, messages)
+            )
+            return bool(length)
+        except Exception as e:
+            logger.error(f"❌ Error appending to conversation: {e}")
+            return False
+
+    async def append_to_conversation(
+        self, 
+        call_sid: str, 
+        role: str, 
+        content: str = None,
+        tool_calls: List[Dict] = None,
+        tool_call_id: str = None,
+        name: str = None
+    ) -> bool:
+        """
+        ⚡ FIXED: Support tool calls and tool responses
+        """
+        message = self._build_message(role, content, tool_calls, tool_call_id, name)
+        return await self.append_messages(call_sid, [message])
+
+    # ⚡ Batched turn API: one pipeline to read, one to write
+    async def begin_turn(self, call_sid: str, user_text: str) -> TurnContext:
+        """Append the user's message and load session and history in one round-trip"""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_turn_reads(pipe, call_sid, self._build_message("user", user_text))
+            return self._turn_from_results(call_sid, await pipe.execute())
+        except Exception as e:
+            logger.error(f"❌ Error loading turn for {call_sid}: {e}")
+            return TurnContext(call_sid=call_sid)
+
+    async def get_cached_tool_results(self, lookups: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """MGET several (tool_name, args_hash) results at once"""
+        if not lookups:
+            return []
+        try:
+            return self._tool_results_from(await self.redis_client.mget(self._tool_cache_keys(lookups)))
+        except Exception as e:
+            logger.error(f"❌ Tool cache retrieval error: {e}")
+            return [None] * len(lookups)
+
+    async def commit_turn(self, turn: TurnContext) -> bool:
+        """Flush all of a turn's buffered writes in one round-trip"""
+        if not turn.has_writes():
+            return True
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_turn_writes(pipe, turn)
+            await pipe.execute()
+            turn.clear_writes()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error committing turn for {turn.call_sid}: {e}")
+            return False
+
+    async def cache_response(self, query_hash: str, response: str, ttl: int = 3600) -> bool:
+        try:
+            key = self._get_cache_key("response", query_hash)
+            await self.redis_client.setex(key, ttl, response)
+            logger.debug(f"✓ Cached response: {query_hash[:8]}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Cache error: {e}")
+            return False
+    
+    async def get_cached_response(self, query_hash: str) -> Optional[str]:
+        try:
+            key = self._get_cache_key("response", query_hash)
+            data = await self.redis_client.get(key)
+            if data:
+                logger.debug(f"✓ Cache hit: {query_hash[:8]}")
+                return self._decode(data)
+            return None
+        except Exception as e:
+            logger.error(f"❌ Cache retrieval error: {e}")
+            return None
+    
+    async def cache_tool_result(
+        self,
+        tool_name: str,
+        args_hash: str,
+        result: Dict[str, Any],
+        ttl: int = 300
+    ) -> bool:
+        try:
+            key = self._tool_cache_key(tool_name, args_hash)
+            await self.redis_client.setex(key, ttl, json.dumps(result))
+            logger.debug(f"✓ Cached tool result: {tool_name}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Tool cache error: {e}")
+            return False
+    
+    async def get_cached_tool_result(self, tool_name: str, args_hash: str) -> Optional[Dict[str, Any]]:
+        try:
+            key = self._tool_cache_key(tool_name, args_hash)
+            data = await self.redis_client.get(key)
+            if data:
+                logger.debug(f"✓ Tool cache hit: {tool_name}")
+                return self._json_from(data)
+            return None
+        except Exception as e:
+            logger.error(f"❌ Tool cache retrieval error: {e}")
+            return None
+
+    async def delete_session(self, call_sid: str) -> bool:
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            self._queue_delete(pipe, call_sid)
+            await pipe.execute()
+            logger.debug(f"✓ Deleted session: {call_sid}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error deleting session: {e}")
+            return False
+
+    async def extend_session_ttl(self, call_sid: str, extra_seconds: int = 300) -> bool:
+        try:
+            current_ttl = await self.redis_client.ttl(self._get_key(call_sid))
+
+            if current_ttl > 0:
+                pipe = self.redis_client.pipeline(transaction=False)
+                self._queue_extend(pipe, call_sid, current_ttl + extra_seconds)
+                await pipe.execute()
+                return True
+            return False
+        except Exception as e:
+            logger.error(f"❌ Error extending TTL: {e}")
+            return False
+
+    async def list_active_sessions(self, offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        ⚡ One page of active sessions (scalars only, most recently active first).
+        Reads the active index - never KEYS/SCAN over the keyspace.
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_index_page(pipe, offset, limit)
+            _, total, call_sids = await pipe.execute()
+
+            if not call_sids:
+                return self._session_page(offset, limit, total, [])
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_session_fields(pipe, call_sids)
+            sessions, stale = self._sessions_from_fields(call_sids, await pipe.execute())
+
+            if stale:
+                await self.redis_client.zrem(ACTIVE_SESSIONS_KEY, *stale)
+
+            return self._session_page(offset, limit, total, sessions, pruned=len(stale))
+        except Exception as e:
+            logger.error(f"❌ Error listing active sessions: {e}")
+            return self._session_page(offset, limit, 0, [])
+
+    async def get_all_active_sessions(self, page_size: int = 100) -> list[Dict[str, Any]]:
+        """All active sessions, fetched page by page from the active index"""
+        sessions = []
+        offset = 0
+        while offset is not None:
+            page = await self.list_active_sessions(offset, page_size)
+            sessions.extend(page["sessions"])
+            offset = page["next_offset"]
+        return sessions
+
+    async def set_temp_data(self, call_sid: str, key: str, value: Any, ttl: int = 300) -> bool:
+        try:
+            await self.redis_client.setex(self._get_temp_key(call_sid, key), ttl, json.dumps(value))
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error setting temp data: {e}")
+            return False
+
+    async def get_temp_data(self, call_sid: str, key: str) -> Optional[Any]:
+        try:
+            return self._json_from(await self.redis_client.get(self._get_temp_key(call_sid, key)))
         except Exception as e:
             logger.error(f"❌ Error getting temp data: {e}")
             return None
 
 
-# Global instance
+# Global instances
 redis_service = RedisService()
+async_redis_service = AsyncRedisService()
@@ -0,0 +1,155 @@
+# app/services/semantic_cache.py - Embedding-keyed answer cache for context-free informational turns
+
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.config.voice_config import voice_config
+from app.services.embedding_provider import embedding_provider
+
+logger = logging.getLogger("agent")
+
+# Intents whose direct answers don't depend on the caller (clinic hours, policies, ...)
+CACHEABLE_INTENTS = ("knowledge_base",)
+
+# Booking state the LLM sees and may refer to ("Dr. Rao's Tuesday slots are...");
+# part of the scope so an answer is only replayed to a caller in the same state
+BOOKING_STATE_FIELDS = ("selected_doctor_id", "selected_date", "offered_hours")
+
+
+class _ScopeIndex:
+    """Unit-normalised embeddings of one scope, stacked into a matrix on demand"""
+
+    def __init__(self):
+        self.keys: List[int] = []
+        self.vectors: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def add(self, key: int, vector: np.ndarray) -> None:
+        self.keys.append(key)
+        self.vectors.append(vector)
+        self._matrix = None
+
+    def remove(self, key: int) -> None:
+        index = self.keys.index(key)
+        del self.keys[index]
+        del self.vectors[index]
+        self._matrix = None
+
+    def nearest(self, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        if not self.keys:
+            return None, 0.0
+        if self._matrix is None:
+            self._matrix = np.vstack(self.vectors)
+        scores = self._matrix @ vector
+        best = int(np.argmax(scores))
+        return self.keys[best], float(scores[best])
+
+
+class SemanticResponseCache:
+    """
+    ⚡ SEMANTIC ANSWER CACHE
+    Direct LLM answers to informational questions are stored under the
+    utterance's embedding, so STT variants ("what are your timings" / "what're
+    the timings?") hit the same entry. Entries are scoped by intent + a state
+    signature (step, selected doctor / date, offered hours) and only match
+    within their scope, so an answer is never served in a different
+    conversation state. Lookups are a cosine search over the
+    scope's vectors (small, in-process index) with a similarity threshold;
+    entries expire after a TTL and the least recently used are evicted first.
+    """
+
+    def __init__(self):
+        self.enabled = voice_config.SEMANTIC_CACHE_ENABLED
+        self.threshold = voice_config.SEMANTIC_CACHE_THRESHOLD
+        self.ttl = voice_config.SEMANTIC_CACHE_TTL
+        self.max_entries = voice_config.SEMANTIC_CACHE_MAX_ENTRIES
+        self.entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()  # LRU order
+        self.scopes: Dict[str, _ScopeIndex] = {}
+        self._next_key = 0
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expirations": 0}
+
+    @staticmethod
+    def scope_for(intent: str, session: Dict[str, Any]) -> Optional[str]:
+        """Intent + state signature, or None if the turn is not cacheable"""
+        if intent not in CACHEABLE_INTENTS:
+            return None
+        booking_state = [str(session.get(field) or "") for field in BOOKING_STATE_FIELDS]
+        # The system context carries today's date, so answers don't outlive the day
+        return "|".join([intent, session.get('current_step') or 'greeting', *booking_state, time.strftime('%Y-%m-%d')])
+
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        vector = await embedding_provider.embed_async(text)
+        if vector is None:
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def lookup(self, scope: str, vector: np.ndarray) -> Optional[Tuple[str, float]]:
+        """(response, similarity) of the closest live entry above the threshold"""
+        self.stats["lookups"] += 1
+        key, score = self._nearest_live(scope, vector)
+
+        if key is None or score < self.threshold:
+            self.stats["misses"] += 1
+            return None
+
+        self.entries.move_to_end(key)
+        entry = self.entries[key]
+        entry["hits"] += 1
+        self.stats["hits"] += 1
+        logger.info(f"⚡ Semantic cache hit ({score:.3f}): '{entry['query']}'")
+        return entry["response"], score
+
+    def _nearest_live(self, scope: str, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        """Closest entry in the scope, dropping expired ones on the way"""
+        while scope in self.scopes:
+            key, score = self.scopes[scope].nearest(vector)
+            if time.time() - self.entries[key]["created_at"] <= self.ttl:
+                return key, score
+            self._remove(key)
+            self.stats["expirations"] += 1
+        return None, 0.0
+
+    def store(self, scope: str, vector: np.ndarray, query: str, response: str) -> None:
+        key, score = self._nearest_live(scope, vector)
+        if key is not None and score >= self.threshold:
+            # Near-duplicate question: refresh the existing entry instead
+            self.entries[key].update(response=response, created_at=time.time())
+            self.entries.move_to_end(key)
+            return
+
+        key = self._next_key
+        self._next_key += 1
+        self.entries[key] = {
+            "scope": scope,
+            "query": query,
+            "response": response,
+            "created_at": time.time(),
+            "hits": 0,
+        }
+        self.scopes.setdefault(scope, _ScopeIndex()).add(key, vector)
+        self.stats["stores"] += 1
+
+        while len(self.entries) > self.max_entries:
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+
+    def _remove(self, key: int) -> None:
+        entry = self.entries.pop(key)
+        index = self.scopes[entry["scope"]]
+        index.remove(key)
+        if not index.keys:
+            del self.scopes[entry["scope"]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats, entries=len(self.entries), scopes=len(self.scopes))
+        if self.stats["lookups"]:
+            stats["hit_rate_pct"] = round(self.stats["hits"] / self.stats["lookups"] * 100, 1)
+        return stats
+
+
+# Global instance
+semantic_cache = SemanticResponseCache()
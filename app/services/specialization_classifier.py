@@ -0,0 +1,316 @@
+# app/services/specialization_classifier.py - Local symptom -> specialization classifier
+
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from openai import OpenAI, AsyncOpenAI
+from app.config.voice_config import voice_config
+from app.services.redis_service import redis_service, async_redis_service
+from app.services.embedding_provider import embedding_provider
+from app.utils.symptom_mapper import SYMPTOM_SPECIALIZATION_MAP
+
+logger = logging.getLogger("agent")
+
+MEMO_PREFIX = "specialization_memo:"
+CENTROIDS_PREFIX = "specialization_centroids:"
+FALLBACK_SPECIALIZATION = "General Medicine"
+MAX_SPECIALIZATIONS = 4
+
+# Single keywords too ambiguous to decide on: generic ("a doctor", not which one)
+# or with everyday senses ("heart burn", "for the period of two days", "stressed
+# about my diabetes"). The keyword path ignores them; the centroid / LLM path
+# reads them in context.
+AMBIGUOUS_KEYWORDS = {
+    "doctor", "general", "physician", "alternative",
+    "heart", "period", "stress", "cold", "brain",
+}
+# Keywords at least this long are stems ("cardio", "neuro", "psych") and match as prefixes
+STEM_MIN_LENGTH = 5
+# Specializations within this cosine distance of the best centroid are recommended too
+CENTROID_MARGIN = 0.05
+CENTROID_RETRY_AFTER = 60.0
+
+
+def normalize_symptom(text: str) -> str:
+    """Memo key: lowercase words only"""
+    return " ".join(re.findall(r"[a-z0-9']+", (text or "").lower()))
+
+
+def _keyword_pattern(keyword: str) -> re.Pattern:
+    keyword = keyword.lower()
+    # Short keywords must be whole words (plural allowed): "kid" must not match "kidney"
+    suffix = "" if len(keyword) >= STEM_MIN_LENGTH else r"(?:e?s)?\b"
+    return re.compile(rf"\b{re.escape(keyword)}{suffix}")
+
+
+class SpecializationClassifier:
+    """
+    ⚡ LOCAL SPECIALIZATION CLASSIFIER
+    Maps a symptom to specializations without a chat completion:
+      1. Redis memo of earlier answers (shared by all workers, long TTL)
+      2. SYMPTOM_SPECIALIZATION_MAP keywords (word-boundary match, no embedding;
+         ambiguous single words such as "heart" or "period" are skipped)
+      3. cosine against per-specialization centroid embeddings (one matrix product)
+    classify() returns None when none of these is confident; the caller then asks
+    the LLM and remember()s its answer. Centroids are averaged from the keyword
+    phrase embeddings once and stored in Redis, so only the first worker pays.
+    """
+
+    def __init__(self):
+        self.enabled = voice_config.SPECIALIZATION_CLASSIFIER_ENABLED
+        self.min_similarity = voice_config.SPECIALIZATION_MIN_SIMILARITY
+        self.memo_ttl = voice_config.SPECIALIZATION_MEMO_TTL
+        self.model = voice_config.EMBEDDING_MODEL_NAME
+        self.client = OpenAI(api_key=voice_config.OPENAI_API_KEY)
+        self.async_client = AsyncOpenAI(api_key=voice_config.OPENAI_API_KEY)
+
+        self.specializations = list(SYMPTOM_SPECIALIZATION_MAP)
+        self.keywords: List[Tuple[str, str, re.Pattern]] = [
+            (specialization, keyword.lower(), _keyword_pattern(keyword))
+            for specialization, keywords in SYMPTOM_SPECIALIZATION_MAP.items()
+            for keyword in keywords
+            if keyword.lower() not in AMBIGUOUS_KEYWORDS
+        ]
+        self.centroids: Optional[np.ndarray] = None  # one unit row per specialization
+        self._centroids_failed_at = 0.0
+        self._centroid_lock = threading.Lock()
+        self.stats = {"memo": 0, "keyword": 0, "centroid": 0, "llm": 0}
+
+    # ------------------------------------------------------------------
+    # Classification
+    # ------------------------------------------------------------------
+
+    def classify(self, symptom: str) -> Optional[List[str]]:
+        """Specializations in priority order, or None if the LLM should decide"""
+        key = normalize_symptom(symptom)
+        if not self.enabled or not key:
+            return None
+
+        result = self._from_memo(self._memo_get(key), key) or self._from_keywords(key)
+        if result is None and self._ensure_centroids():
+            result = self._from_vector(embedding_provider.embed(key, self.model), key)
+            if result:
+                self._memo_set(key, result)
+        return result
+
+    async def classify_async(self, symptom: str) -> Optional[List[str]]:
+        key = normalize_symptom(symptom)
+        if not self.enabled or not key:
+            return None
+
+        result = self._from_memo(await self._memo_get_async(key), key) or self._from_keywords(key)
+        if result is None and await self._ensure_centroids_async():
+            vector = await embedding_provider.embed_async(key, self.model)
+            result = self._from_vector(vector, key)
+            if result:
+                await self._memo_set_async(key, result)
+        return result
+
+    def remember(self, symptom: str, specializations: List[str]) -> None:
+        """Memoise an LLM answer so the next caller with this symptom skips the LLM"""
+        key = normalize_symptom(symptom)
+        if self.enabled and key and isinstance(specializations, list) and specializations:
+            self.stats["llm"] += 1
+            self._memo_set(key, specializations)
+
+    async def remember_async(self, symptom: str, specializations: List[str]) -> None:
+        key = normalize_symptom(symptom)
+        if self.enabled and key and isinstance(specializations, list) and specializations:
+            self.stats["llm"] += 1
+            await self._memo_set_async(key, specializations)
+
+    def _from_memo(self, cached: Optional[List[str]], key: str) -> Optional[List[str]]:
+        if cached:
+            self.stats["memo"] += 1
+            logger.info(f"⚡ Specializations from memo: '{key}' -> {cached}")
+        return cached
+
+    def _from_keywords(self, text: str) -> Optional[List[str]]:
+        """Only unambiguous keywords count; multi-word phrases outweigh single words"""
+        scores: Dict[str, int] = {}
+        for specialization, keyword, pattern in self.keywords:
+            if pattern.search(text):
+                scores[specialization] = scores.get(specialization, 0) + len(keyword.split())
+        if not scores:
+            return None
+
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        result = self._with_fallback(ranked)
+        self.stats["keyword"] += 1
+        logger.info(f"⚡ Specializations from keywords: '{text}' -> {result}")
+        return result
+
+    def _from_vector(self, vector: Optional[np.ndarray], text: str) -> Optional[List[str]]:
+        if vector is None or self.centroids is None:
+            return None
+
+        scores = self.centroids @ vector / (np.linalg.norm(vector) or 1.0)
+        order = np.argsort(scores)[::-1]
+        best = float(scores[order[0]])
+        if best < self.min_similarity:
+            logger.info(f"Centroid match too weak ({best:.2f}) for '{text}'")
+            return None
+
+        ranked = [self.specializations[i] for i in order if scores[i] >= best - CENTROID_MARGIN]
+        result = self._with_fallback(ranked)
+        self.stats["centroid"] += 1
+        logger.info(f"⚡ Specializations from centroids ({best:.2f}): '{text}' -> {result}")
+        return result
+
+    @staticmethod
+    def _with_fallback(ranked: List[str]) -> List[str]:
+        """Best matches plus General Medicine as fallback, as the LLM prompt asks for"""
+        if FALLBACK_SPECIALIZATION in ranked[:MAX_SPECIALIZATIONS]:
+            return ranked[:MAX_SPECIALIZATIONS]
+        return ranked[:MAX_SPECIALIZATIONS - 1] + [FALLBACK_SPECIALIZATION]
+
+    # ------------------------------------------------------------------
+    # Embeddings / centroids
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalized(embeddings: List[List[float]]) -> np.ndarray:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def _embed(self, texts: List[str]) -> Optional[np.ndarray]:
+        try:
+            response = self.client.embeddings.create(input=texts, model=self.model)
+            return self._normalized([item.embedding for item in response.data])
+        except Exception as e:
+            logger.error(f"Specialization embedding error: {e}")
+            return None
+
+    async def _embed_async(self, texts: List[str]) -> Optional[np.ndarray]:
+        try:
+            response = await self.async_client.embeddings.create(input=texts, model=self.model)
+            return self._normalized([item.embedding for item in response.data])
+        except Exception as e:
+            logger.error(f"Specialization embedding error: {e}")
+            return None
+
+    @property
+    def _centroids_key(self) -> str:
+        # Changing the keyword map or the embedding model yields a new key
+        digest = hashlib.md5(json.dumps([self.model, SYMPTOM_SPECIALIZATION_MAP], sort_keys=True).encode()).hexdigest()
+        return f"{CENTROIDS_PREFIX}{digest}"
+
+    def _phrases(self) -> Tuple[List[str], List[int]]:
+        """Every specialization name and keyword, with the row each one averages into"""
+        phrases, rows = [], []
+        for row, specialization in enumerate(self.specializations):
+            for phrase in [specialization] + SYMPTOM_SPECIALIZATION_MAP[specialization]:
+                phrases.append(phrase.lower())
+                rows.append(row)
+        return phrases, rows
+
+    def _centroids_from(self, vectors: np.ndarray, rows: List[int]) -> np.ndarray:
+        rows = np.asarray(rows)
+        centroids = np.vstack([vectors[rows == row].mean(axis=0) for row in range(len(self.specializations))])
+        return self._normalized(centroids)
+
+    def _should_build(self) -> bool:
+        return self.centroids is None and time.time() - self._centroids_failed_at >= CENTROID_RETRY_AFTER
+
+    def _ensure_centroids(self) -> bool:
+        if not self._should_build():
+            return self.centroids is not None
+
+        with self._centroid_lock:
+            if self.centroids is None:
+                try:
+                    cached = redis_service.redis_client.get(self._centroids_key)
+                except Exception as e:
+                    logger.error(f"❌ Centroid cache read error: {e}")
+                    cached = None
+                if cached:
+                    self.centroids = np.asarray(json.loads(cached), dtype=np.float32)
+                else:
+                    phrases, rows = self._phrases()
+                    vectors = self._embed(phrases)
+                    if vectors is None:
+                        self._centroids_failed_at = time.time()
+                        return False
+                    self.centroids = self._centroids_from(vectors, rows)
+                    try:
+                        redis_service.redis_client.set(self._centroids_key, json.dumps(self.centroids.tolist()))
+                    except Exception as e:
+                        logger.error(f"❌ Centroid cache write error: {e}")
+                logger.info(f"⚡ Specialization centroids ready ({len(self.specializations)} specializations)")
+        return True
+
+    async def _ensure_centroids_async(self) -> bool:
+        if not self._should_build():
+            return self.centroids is not None
+
+        try:
+            cached = await async_redis_service.redis_client.get(self._centroids_key)
+        except Exception as e:
+            logger.error(f"❌ Centroid cache read error: {e}")
+            cached = None
+        if cached:
+            self.centroids = np.asarray(json.loads(cached), dtype=np.float32)
+            return True
+
+        phrases, rows = self._phrases()
+        vectors = await self._embed_async(phrases)
+        if vectors is None:
+            self._centroids_failed_at = time.time()
+            return False
+        self.centroids = self._centroids_from(vectors, rows)
+        try:
+            await async_redis_service.redis_client.set(self._centroids_key, json.dumps(self.centroids.tolist()))
+        except Exception as e:
+            logger.error(f"❌ Centroid cache write error: {e}")
+        logger.info(f"⚡ Specialization centroids ready ({len(self.specializations)} specializations)")
+        return True
+
+    # ------------------------------------------------------------------
+    # Redis memo
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _memo_key(key: str) -> str:
+        return f"{MEMO_PREFIX}{hashlib.md5(key.encode()).hexdigest()}"
+
+    def _memo_get(self, key: str) -> Optional[List[str]]:
+        try:
+            data = redis_service.redis_client.get(self._memo_key(key))
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.error(f"❌ Specialization memo read error: {e}")
+            return None
+
+    async def _memo_get_async(self, key: str) -> Optional[List[str]]:
+        try:
+            data = await async_redis_service.redis_client.get(self._memo_key(key))
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.error(f"❌ Specialization memo read error: {e}")
+            return None
+
+    def _memo_set(self, key: str, specializations: List[str]) -> None:
+        try:
+            redis_service.redis_client.setex(self._memo_key(key), self.memo_ttl, json.dumps(specializations))
+        except Exception as e:
+            logger.error(f"❌ Specialization memo write error: {e}")
+
+    async def _memo_set_async(self, key: str, specializations: List[str]) -> None:
+        try:
+            await async_redis_service.redis_client.setex(self._memo_key(key), self.memo_ttl, json.dumps(specializations))
+        except Exception as e:
+            logger.error(f"❌ Specialization memo write error: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """How each classification was answered (llm = fallback calls)"""
+        return dict(self.stats)
+
+
+# Global instance
+specialization_classifier = SpecializationClassifier()
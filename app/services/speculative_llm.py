@@ -0,0 +1,203 @@
+# app/services/speculative_llm.py - Speculative first LLM call on stable interim transcripts
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+from app.config.voice_config import voice_config
+
+logger = logging.getLogger("agent")
+
+_END = object()  # end-of-stream marker in a speculation's buffer
+
+
+def normalize_transcript(text: str) -> str:
+    """Comparison key: lowercase words only (interim vs final punctuation differs)"""
+    return " ".join(re.findall(r"[a-z0-9']+", text.lower()))
+
+
+class Speculation:
+    """One speculative completion, buffered until the turn claims or discards it"""
+
+    def __init__(self, call_sid: str, text: str, fingerprint: str):
+        self.call_sid = call_sid
+        self.text = text
+        self.key = normalize_transcript(text)
+        self.fingerprint = fingerprint
+        self.started_at = time.time()
+        self.buffer: asyncio.Queue = asyncio.Queue()
+        self.usage: Dict[str, int] = {}
+        self.task: Optional[asyncio.Task] = None
+
+    async def _drain(self, events: AsyncGenerator[Dict[str, Any], None]) -> None:
+        try:
+            async for event in events:
+                if event["type"] == "done":
+                    self.usage = event["data"].get("usage") or {}
+                self.buffer.put_nowait(event)
+        except Exception as e:
+            self.buffer.put_nowait({"type": "error", "data": str(e)})
+        finally:
+            await events.aclose()
+            self.buffer.put_nowait(_END)
+
+    async def replay(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """Buffered events, then the rest of the stream as it arrives"""
+        try:
+            while True:
+                event = await self.buffer.get()
+                if event is _END:
+                    return
+                yield event
+        finally:
+            self.cancel()
+
+    def cancel(self) -> None:
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+
+class SpeculativePrefetcher:
+    """
+    ⚡ SPECULATIVE EXECUTION
+    While Deepgram is still endpointing (400-1500ms), a stable interim transcript
+    starts the turn's first LLM call. Its events are buffered, not acted on: no
+    tool runs and nothing is spoken until the final transcript claims it. A claim
+    succeeds only if the final text and the prompt context (window, session
+    facts, KB context, model tier) match what the speculation was started with;
+    otherwise the speculation is cancelled and the turn calls the LLM as usual.
+    Both prompts come from OpenAIService.build_turn_messages, so a hit replays
+    the completion of the very prompt the turn would have sent.
+
+    Spend is bounded per turn and per call; hits, misses and the tokens of
+    discarded speculations are counted so the trade-off can be tuned.
+    """
+
+    def __init__(self):
+        self.pending: Dict[str, Speculation] = {}
+        self.turn_counts: Dict[str, int] = {}
+        self.call_counts: Dict[str, int] = {}
+        self.turn_ids: Dict[str, int] = {}  # bumped when a turn claims or finishes
+        self.stats = {
+            "started": 0,
+            "hits": 0,
+            "misses": 0,
+            "superseded": 0,
+            "lead_ms_total": 0.0,
+            "wasted_prompt_tokens": 0,
+            "wasted_completion_tokens": 0,
+        }
+
+    def should_start(self, call_sid: str, text: str) -> bool:
+        """Budget and dedupe check, before any work is done for a speculation"""
+        if not voice_config.SPECULATIVE_LLM_ENABLED:
+            return False
+
+        key = normalize_transcript(text)
+        if len(key.split()) < voice_config.SPECULATIVE_MIN_WORDS:
+            return False
+
+        current = self.pending.get(call_sid)
+        if current and current.key == key:
+            return False
+
+        if self.turn_counts.get(call_sid, 0) >= voice_config.SPECULATIVE_MAX_PER_TURN:
+            return False
+        if self.call_counts.get(call_sid, 0) >= voice_config.SPECULATIVE_MAX_PER_CALL:
+            logger.debug(f"Speculation budget spent for {call_sid[-8:]}")
+            return False
+
+        return True
+
+    def turn_id(self, call_sid: str) -> int:
+        """
+        Identity of the turn a speculation is prepared for. If it changed by the
+        time the speculation is ready, the turn it was meant for is gone - check
+        right before start(), with no await in between.
+        """
+        return self.turn_ids.get(call_sid, 0)
+
+    def _next_turn(self, call_sid: str) -> None:
+        self.turn_ids[call_sid] = self.turn_ids.get(call_sid, 0) + 1
+
+    def start(
+        self,
+        call_sid: str,
+        text: str,
+        fingerprint: str,
+        events: AsyncGenerator[Dict[str, Any], None]
+    ) -> Speculation:
+        """Begin buffering `events`; replaces (and cancels) an older speculation"""
+        previous = self.pending.pop(call_sid, None)
+        if previous:
+            self.stats["superseded"] += 1
+            self._discard(previous)
+
+        speculation = Speculation(call_sid, text, fingerprint)
+        speculation.task = asyncio.create_task(speculation._drain(events))
+        self.pending[call_sid] = speculation
+
+        self.turn_counts[call_sid] = self.turn_counts.get(call_sid, 0) + 1
+        self.call_counts[call_sid] = self.call_counts.get(call_sid, 0) + 1
+        self.stats["started"] += 1
+        logger.info(f"🔮 Speculating on '{text}'")
+        return speculation
+
+    def claim(self, call_sid: str, text: str, fingerprint: str) -> Optional[Speculation]:
+        """The speculation for this final transcript, or None (any other one is cancelled)"""
+        self._next_turn(call_sid)
+        speculation = self.pending.pop(call_sid, None)
+        if not speculation:
+            return None
+
+        if speculation.key != normalize_transcript(text) or speculation.fingerprint != fingerprint:
+            self.stats["misses"] += 1
+            logger.info(f"🔮 Speculation miss: '{speculation.text}' vs '{text}'")
+            self._discard(speculation)
+            return None
+
+        lead_ms = (time.time() - speculation.started_at) * 1000
+        self.stats["hits"] += 1
+        self.stats["lead_ms_total"] += lead_ms
+        logger.info(f"🔮 Speculation hit ({lead_ms:.0f}ms head start)")
+        return speculation
+
+    def cancel(self, call_sid: str, reason: str = "unclaimed") -> None:
+        """Drop a call's pending speculation (turn took another path, call ended)"""
+        speculation = self.pending.pop(call_sid, None)
+        if speculation:
+            self.stats["misses"] += 1
+            logger.debug(f"🔮 Speculation cancelled ({reason})")
+            self._discard(speculation)
+
+    def finish_turn(self, call_sid: str) -> None:
+        """Turn over: reset its budget and drop whatever it did not claim"""
+        self._next_turn(call_sid)
+        self.turn_counts.pop(call_sid, None)
+        self.cancel(call_sid, "unclaimed")
+
+    def end_call(self, call_sid: str) -> None:
+        self.finish_turn(call_sid)
+        self.call_counts.pop(call_sid, None)
+        self.turn_ids.pop(call_sid, None)
+
+    def _discard(self, speculation: Speculation) -> None:
+        speculation.cancel()
+        # Only completed speculations report usage; cancelled streams bill what they generated
+        self.stats["wasted_prompt_tokens"] += speculation.usage.get("prompt_tokens", 0)
+        self.stats["wasted_completion_tokens"] += speculation.usage.get("completion_tokens", 0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and waste across all calls"""
+        stats = {key: value for key, value in self.stats.items() if key != "lead_ms_total"}
+        resolved = self.stats["hits"] + self.stats["misses"] + self.stats["superseded"]
+        if resolved:
+            stats["hit_rate_pct"] = round(self.stats["hits"] / resolved * 100, 1)
+        if self.stats["hits"]:
+            stats["avg_lead_ms"] = round(self.stats["lead_ms_total"] / self.stats["hits"], 0)
+        return stats
+
+
+# Global instance
+speculative_prefetcher = SpeculativePrefetcher()
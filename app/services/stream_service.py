@@ -1,37 +1,144 @@
-# app/services/stream_service.py - OPTIMIZED VERSION
+# app/services/stream_service.py - PACED PLAYOUT VERSION
 
 import uuid
 import json
-import base64
+import asyncio
 import logging
-from typing import Dict, Optional, Callable
+from collections import deque
+from typing import Deque, Dict, Optional, Callable, Tuple, Any
 from fastapi import WebSocket
 import time
 from starlette.websockets import WebSocketState
 import traceback
+from app.config.voice_config import voice_config
+from app.utils.audio_utils import (
+    FRAME_MS,
+    AudioData,
+    TwilioMediaEncoder,
+    to_audio_view
+)
 
 logger = logging.getLogger(__name__)
 
-FRAME_MS = 20
-SAMPLE_RATE = 8000
-BYTES_PER_SAMPLE = 1
-FRAME_BYTES = int(SAMPLE_RATE * BYTES_PER_SAMPLE * FRAME_MS / 1000)
+FRAME_SECONDS = FRAME_MS / 1000
+
+# Playout queue entry kinds
+_AUDIO = 0
+_MARK = 1
+
 
 class StreamService:
+    """
+    Twilio media stream writer.
+
+    ⚡ PACED PLAYOUT: audio frames go into a per-call queue and a playout task
+    sends them on a real-time 20ms clock, keeping only a small look-ahead in
+    Twilio's buffer. Marks are queued behind the audio they follow, so Twilio's
+    mark echo tells us exactly when that audio finished playing.
+    """
+
     def __init__(self, websocket: WebSocket):
         self.ws = websocket
         self.stream_sid: str = ""
         self.last_mark: str = ""
+        self._encoder: Optional[TwilioMediaEncoder] = None
+
+        self.paced = voice_config.AUDIO_PACED_PLAYOUT
+        self.lookahead_frames = max(1, voice_config.AUDIO_PLAYOUT_LOOKAHEAD_MS // FRAME_MS)
+        self._queue: Deque[Tuple[int, str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._playout_task: Optional[asyncio.Task] = None
+        self._clock_start: Optional[float] = None
+        self._frames_clocked = 0
+        self._pending_marks: Dict[str, Tuple[asyncio.Future, Any]] = {}
 
     def set_stream_sid(self, stream_sid: str) -> None:
         self.stream_sid = stream_sid
+        self._encoder = TwilioMediaEncoder(stream_sid)
         logger.info(f"🔌 Stream SID: {stream_sid}")
 
+    # ------------------------------------------------------------------
+    # Playout clock
+    # ------------------------------------------------------------------
+
+    def _ensure_playout(self) -> None:
+        if self._playout_task is None or self._playout_task.done():
+            self._playout_task = asyncio.create_task(self._playout_loop())
+
+    def _frames_ahead(self, now: float) -> float:
+        """How many frames Twilio still has buffered according to our clock"""
+        if self._clock_start is None:
+            return 0.0
+        return self._frames_clocked - (now - self._clock_start) / FRAME_SECONDS
+
+    async def _playout_loop(self) -> None:
+        """Send queued frames on a real-time clock with a small look-ahead"""
+        send_text = self.ws.send_text
+
+        try:
+            while True:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                now = time.monotonic()
+                ahead = self._frames_ahead(now)
+
+                if ahead < 0 or self._clock_start is None:
+                    # Underrun (or first frame): Twilio's buffer is empty, restart the clock
+                    self._clock_start = now
+                    self._frames_clocked = 0
+                    ahead = 0.0
+
+                if ahead >= self.lookahead_frames:
+                    # Refill in small bursts instead of waking up every frame
+                    await asyncio.sleep((ahead - self.lookahead_frames / 2) * FRAME_SECONDS)
+                    continue
+
+                kind, message, metrics = self._queue.popleft()
+                await send_text(message)
+
+                if kind == _AUDIO:
+                    self._frames_clocked += 1
+                    if metrics:
+                        sent_at = time.time()
+                        if metrics.first_audio_sent is None:
+                            metrics.first_audio_sent = sent_at
+                            logger.debug("⚡ First audio frame sent")
+                        metrics.last_audio_sent = sent_at
+                        metrics.audio_frames_sent += 1
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Playout error: {e}")
+            self._queue.clear()
+
+    def pending_audio_seconds(self) -> float:
+        """Audio queued locally plus audio still buffered at Twilio"""
+        queued = sum(1 for kind, _, _ in self._queue if kind == _AUDIO)
+        return (queued + max(0.0, self._frames_ahead(time.monotonic()))) * FRAME_SECONDS
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
     async def clear(self) -> None:
-        """Clear Twilio's audio buffer"""
+        """Drop queued audio and clear Twilio's audio buffer"""
+        self._queue.clear()
+        self._clock_start = None
+        self._frames_clocked = 0
+
+        # Audio behind pending marks will never play
+        for future, _ in self._pending_marks.values():
+            if not future.done():
+                future.set_result(None)
+        self._pending_marks.clear()
+
         if not self.stream_sid:
             return
-        
+
         msg = {
             "event": "clear",
             "streamSid": self.stream_sid
@@ -39,68 +146,125 @@ class StreamService:
         await self.ws.send_text(json.dumps(msg))
         logger.debug("🧹 Buffer cleared")
 
-    async def send_audio_chunk(self, audio_b64: str, metrics=None) -> None:
+    async def send_audio_chunk(self, audio: AudioData, metrics=None) -> None:
         """
-        ⚡ OPTIMIZED: Send single audio chunk immediately with latency tracking
+        ⚡ ZERO-COPY: Frame raw μ-law bytes as pre-templated 20ms Twilio messages.
+        Paced mode queues them for the playout clock; otherwise they are sent at once.
         """
-        if not self.stream_sid or not audio_b64:
+        if not self.stream_sid or not audio:
             return
-        
+
         try:
-            audio_bytes = base64.b64decode(audio_b64)
-            sent = 0
-            total = len(audio_bytes)
-            
+            view = to_audio_view(audio)
+            total = len(view)
+
+            if metrics:
+                metrics.total_audio_bytes += total
+
+            if self.paced:
+                append = self._queue.append
+                for message in self._encoder.frames(view):
+                    append((_AUDIO, message, metrics))
+                self._ensure_playout()
+                self._wakeup.set()
+                return
+
             # Track first audio sent (CRITICAL METRIC)
             if metrics and metrics.first_audio_sent is None:
                 metrics.first_audio_sent = time.time()
                 logger.debug(f"⚡ First audio frame sent")
-            
+
             # Send in 20ms frames for Twilio
             frames_sent = 0
-            while sent < total:
-                frame = audio_bytes[sent: sent + FRAME_BYTES]
-                if not frame:
-                    break
-                
-                payload = base64.b64encode(frame).decode("ascii")
-                media_message = {
-                    "event": "media",
-                    "streamSid": self.stream_sid,
-                    "media": {"payload": payload}
-                }
-                
-                await self.ws.send_text(json.dumps(media_message))
-                sent += len(frame)
+            send_text = self.ws.send_text
+            for message in self._encoder.frames(view):
+                await send_text(message)
                 frames_sent += 1
-            
+
             # Update metrics
             if metrics:
                 metrics.last_audio_sent = time.time()
                 metrics.audio_frames_sent += frames_sent
-                metrics.total_audio_bytes += total
-            
+
         except Exception as e:
             logger.error(f"❌ Error sending chunk: {e}")
             raise
 
-    async def send_mark(self, mark_name: str = None) -> str:
-        """Send a mark event to track playback completion"""
+    async def send_mark(self, mark_name: str = None, metrics=None) -> str:
+        """
+        Send a mark event to track playback completion.
+        In paced mode the mark is queued behind the audio before it.
+        """
         if not self.stream_sid:
             return ""
-        
+
         mark_label = mark_name or str(uuid.uuid4())
-        mark_message = {
+        mark_message = json.dumps({
             "event": "mark",
             "streamSid": self.stream_sid,
             "mark": {"name": mark_label}
-        }
-        
-        await self.ws.send_text(json.dumps(mark_message))
+        })
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_marks[mark_label] = (future, metrics)
+
+        if self.paced:
+            self._queue.append((_MARK, mark_message, None))
+            self._ensure_playout()
+            self._wakeup.set()
+        else:
+            await self.ws.send_text(mark_message)
+
         self.last_mark = mark_label
         return mark_label
 
+    def on_mark(self, mark_name: str) -> None:
+        """Twilio echoed a mark: everything queued before it has been played"""
+        entry = self._pending_marks.pop(mark_name, None)
+        if not entry:
+            return
+
+        future, metrics = entry
+        played_at = time.time()
+        if metrics:
+            metrics.playback_complete = played_at
+        if not future.done():
+            future.set_result(played_at)
+
+    async def wait_for_mark(self, mark_name: str, timeout: float = None) -> Optional[float]:
+        """
+        Wait until Twilio has played up to the mark.
+        Returns the playback time, or None if cleared / timed out.
+        """
+        entry = self._pending_marks.get(mark_name)
+        if not entry:
+            return None
+
+        if timeout is None:
+            timeout = self.pending_audio_seconds() + 2.0
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(entry[0]), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ Mark {mark_name} not echoed within {timeout:.1f}s")
+            self._pending_marks.pop(mark_name, None)
+            return None
+
+    async def close(self) -> None:
+        """Stop the playout task"""
+        self._queue.clear()
+        if self._playout_task and not self._playout_task.done():
+            self._playout_task.cancel()
+            try:
+                await self._playout_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        for future, _ in self._pending_marks.values():
+            if not future.done():
+                future.set_result(None)
+        self._pending_marks.clear()
+
     # Keep _send_audio for backward compatibility if needed
-    async def _send_audio(self, audio_b64: str) -> None:
+    async def _send_audio(self, audio: AudioData) -> None:
         """Legacy method - redirects to send_audio_chunk"""
-        await self.send_audio_chunk(audio_b64, None)
\ No newline at end of file
+        await self.send_audio_chunk(audio, None)
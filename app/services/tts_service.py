@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import logging
 from typing import Optional, AsyncIterator
 from collections import deque
@@ -21,7 +20,7 @@ class TTSService:
         self,
         text: str,
         partial_response_index: Optional[int] = None
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[bytes]:
 
         if not text or not text.strip():
             return
@@ -58,12 +57,11 @@ class TTSService:
                 
                 if response.status_code == 200:
                     audio_bytes = response.content
-                    audio_b64 = base64.b64encode(audio_bytes).decode('utf-8')
                     
-                    logger.info(f"TTS -> Success ({len(audio_bytes)} bytes, {len(audio_b64)} b64 chars)")
+                    logger.info(f"TTS -> Success ({len(audio_bytes)} bytes)")
                     
                     self.consecutive_failures = 0
-                    yield audio_b64
+                    yield audio_bytes
                 else:
                     logger.error(f"TTS -> HTTP {response.status_code}: {response.text}")
                     self.consecutive_failures += 1
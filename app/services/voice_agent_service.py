@@ -3,11 +3,17 @@
 from typing import Dict, Any, Optional, List, AsyncGenerator
 from sqlalchemy.orm import Session
 from datetime import datetime
-from app.services.redis_service import redis_service
+from app.services.redis_service import async_redis_service, TurnContext
 from app.services.doctor_service import DoctorService
+from app.services.doctor_roster import doctor_roster
 from app.services.openai_service import openai_service
+from app.services.model_tier_policy import model_tier_policy, FAST, SMART
+from app.services.speculative_llm import speculative_prefetcher
+from app.services.semantic_cache import semantic_cache
+from app.services.specialization_classifier import specialization_classifier
+from app.services.embedding_provider import embedding_provider
 from app.services.twilio_service import twilio_service
-from app.routes.ai_tools import AIToolsExecutor, get_ai_functions
+from app.routes.ai_tools import AIToolsExecutor, get_ai_functions, run_blocking, READ_ONLY_FUNCTIONS
 from app.utils.validators import validate_phone_number, parse_patient_name
 from app.models.call_session import CallSession
 from app.config.voice_config import voice_config
@@ -18,60 +24,157 @@ import traceback
 import json
 import time
 import asyncio
+import re
+import uuid
+import hashlib
 from app.services.knowledge_base_service import knowledge_base_service
+from app.services.fast_path_router import FastPathRouter, FastPathAction, ordinal_pick
+from app.utils.conversation_window import ConversationWindow
 
 logger = logging.getLogger("agent")
 
+# Booking details the call-facts summariser may fill in from older turns
+CALL_FACT_FIELDS = (
+    "patient_name",
+    "patient_phone",
+    "selected_doctor_id",
+    "selected_date",
+    "selected_time",
+    "reason",
+)
+
+# Session fields passed to the LLM as volatile context each turn
+SESSION_FACT_FIELDS = ("current_step",) + CALL_FACT_FIELDS + ("appointment_id", "call_summary")
+
 class VoiceAgentService:
     def __init__(self, db: Session):
         self.db = db
         self.ai_tools = AIToolsExecutor(db)
+        # ⚡ In-memory LLM context per call, maintained incrementally across turns
+        self.windows: Dict[str, ConversationWindow] = {}
+        self.summary_tasks: Dict[str, asyncio.Task] = {}
+        self.fast_path = FastPathRouter(self._match_offered_doctor)
 
-    async def _enrich_with_knowledge_base(
-        self,
-        user_text: str,
-        conversation_history: List[Dict[str, str]]
-    ) -> List[Dict[str, str]]:
-
+    async def _knowledge_base_context(self, user_text: str, intent: Optional[str] = None) -> List[str]:
+        """KB snippets for this turn - volatile context, never stored in the history"""
         try:
             # Check if query needs knowledge base
-            intent = knowledge_base_service.classify_query_intent(user_text)
+            intent = intent or knowledge_base_service.classify_query_intent(user_text)
             
             if intent == "doctor_search":
                 # Pure appointment booking - no KB needed
-                return conversation_history
+                return []
             
             # Try direct answer first (for simple questions)
             direct_answer = knowledge_base_service.answer_direct_question(user_text)
             if direct_answer:
                 logger.info(f"Using direct KB answer")
-                # Return enriched history with direct answer injected
-                enriched = conversation_history.copy()
-                enriched.append({
-                    "role": "system",
-                    "content": f"DIRECT ANSWER: {direct_answer}"
-                })
-                return enriched
+                return [f"DIRECT ANSWER: {direct_answer}"]
             
-            # Get KB context for more complex questions
+            # Get KB context for more complex questions (embedding + vector search: off the loop)
             if intent in ["knowledge_base", "hybrid"]:
-                context, _ = knowledge_base_service.get_context_for_query(user_text, max_length=400)
+                context, _ = await run_blocking(knowledge_base_service.get_context_for_query, user_text, 400)
                 
                 if context:
                     logger.info(f"KB context added: {len(context)} chars")
-                    # Inject context as system message
-                    enriched = conversation_history.copy()
-                    enriched.append({
-                        "role": "system",
-                        "content": f"CLINIC INFORMATION: {context}\n\nUse this information to answer the patient's question accurately."
-                    })
-                    return enriched
+                    return [f"CLINIC INFORMATION: {context}\n\nUse this information to answer the patient's question accurately."]
             
-            return conversation_history
+            return []
             
         except Exception as e:
             logger.error(f"KB enrichment error: {e}")
-            return conversation_history
+            return []
+
+    def _conversation_window(self, turn: TurnContext) -> ConversationWindow:
+        """The call's window, brought up to date with this turn's user message"""
+        window = self.windows.get(turn.call_sid)
+        if window is None:
+            window = self.windows[turn.call_sid] = ConversationWindow(voice_config.CONVERSATION_WINDOW_TOKENS)
+        
+        if not window.seeded:
+            window.seed(turn.history)
+        elif turn.history:
+            # begin_turn appended the user's message - it is the last one read back
+            window.append(turn.history[-1])
+        
+        turn.window = window
+        return window
+
+    @staticmethod
+    def _prompt_fingerprint(
+        history: List[Dict[str, Any]],
+        session_facts: Dict[str, Any],
+        kb_context: List[str],
+        tier: str
+    ) -> str:
+        """Everything besides the user's words that shapes the first LLM call, model tier included"""
+        payload = json.dumps([history, session_facts, kb_context, tier], sort_keys=True, default=str)
+        return hashlib.md5(payload.encode()).hexdigest()
+
+    async def speculate(self, call_sid: str, interim_text: str) -> None:
+        """
+        ⚡ Start the first LLM call on a stable interim transcript (see SpeculativePrefetcher).
+        Read-only: the window and session are not touched until a turn claims it.
+        """
+        if not speculative_prefetcher.should_start(call_sid, interim_text):
+            return
+        turn_id = speculative_prefetcher.turn_id(call_sid)
+        
+        window = self.windows.get(call_sid)
+        if window is None or not window.seeded:
+            # Before the first turn the window has not been loaded yet
+            return
+        
+        try:
+            session = await async_redis_service.get_session(call_sid)
+            if not session:
+                return
+            
+            # Slot-filling answers skip the LLM anyway
+            if voice_config.FAST_PATH_ENABLED and self.fast_path.route(interim_text, session):
+                return
+            
+            history = window.messages()
+            kb_context = await self._knowledge_base_context(interim_text)
+            session_facts = self._session_facts(session)
+            tier, _ = model_tier_policy.first_call_tier(interim_text, window.tokens)
+            
+            if speculative_prefetcher.turn_id(call_sid) != turn_id or self.windows.get(call_sid) is not window:
+                # The final transcript's turn (or the call) ended while this was prepared
+                return
+            
+            speculative_prefetcher.start(
+                call_sid,
+                interim_text,
+                self._prompt_fingerprint(history, session_facts, kb_context, tier),
+                openai_service.stream_turn(
+                    openai_service.build_turn_messages(interim_text, history, kb_context, session_facts),
+                    get_ai_functions(),
+                    tier,
+                    early_tools=READ_ONLY_FUNCTIONS
+                )
+            )
+        except Exception as e:
+            logger.error(f"Speculation error: {e}")
+
+    @staticmethod
+    def _mentions_caller(response: str, session: Dict[str, Any]) -> bool:
+        """True if a reply repeats the caller's name or phone (not reusable for others)"""
+        response = response.lower()
+        for field in ("patient_name", "patient_phone"):
+            value = str(session.get(field) or "").lower()
+            if value and any(part in response for part in value.split() if len(part) > 2):
+                return True
+        return False
+
+    @staticmethod
+    def _session_facts(session: Dict[str, Any]) -> Dict[str, Any]:
+        """Booking details collected so far (volatile context for the LLM)"""
+        return {
+            field: session[field]
+            for field in SESSION_FACT_FIELDS
+            if session.get(field) not in (None, "")
+        }
 
     async def initiate_call(self, call_sid: str, from_number: str, to_number: str) -> Dict[str, Any]:
         try:
@@ -88,10 +191,11 @@ class VoiceAgentService:
                 "selected_date": None,
                 "selected_time": None,
                 "reason": None,
-                "appointment_id": None
+                "appointment_id": None,
+                "call_summary": None
             }
             
-            redis_service.create_session(call_sid, session_data)
+            await async_redis_service.create_session(call_sid, session_data)
 
             db_session = CallSession(
                 call_sid=call_sid,
@@ -116,24 +220,43 @@ class VoiceAgentService:
         metrics: 'LatencyMetrics' = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
 
+        # ⚡ One pipeline: append user message + session + history
+        turn = await async_redis_service.begin_turn(call_sid, user_text)
+        tool_tasks: Dict[str, asyncio.Task] = {}  # call id -> task, in call order
+        function_calls: List[Dict[str, Any]] = []
+        calls_recorded = results_recorded = False
+        
         try:
-            redis_service.append_to_conversation(call_sid, "user", user_text)
-            session = redis_service.get_session(call_sid)
+            session = turn.session
             
             if not session:
                 yield {"type": "error", "data": "Session not found"}
                 return
 
-            conversation_history = session.get("conversation_history", [])
-            conversation_history = await self._enrich_with_knowledge_base(user_text, conversation_history)
-            ai_functions_schema = get_ai_functions()
-
-            query_hash = redis_service.hash_query(user_text)
-            cached_response = redis_service.get_cached_response(query_hash)
+            conversation_history = self._conversation_window(turn)
+            
+            # ⚡ Slot-filling turns ("3 PM", "the second one", a phone number) skip the LLM
+            fast_action = self.fast_path.route(user_text, session) if voice_config.FAST_PATH_ENABLED else None
+            if fast_action:
+                async for chunk in self._run_fast_path(turn, fast_action, metrics):
+                    yield chunk
+                return
             
-            if cached_response and not metrics:
-                logger.info("⚡ Cache hit!")
+            intent = knowledge_base_service.classify_query_intent(user_text)
+            
+            # ⚡ Informational questions ("what are your timings?") answered before in this state
+            cache_scope = semantic_cache.scope_for(intent, session) if semantic_cache.enabled else None
+            cache_vector = await semantic_cache.embed(user_text) if cache_scope else None
+            cached = semantic_cache.lookup(cache_scope, cache_vector) if cache_vector is not None else None
+            
+            if cached:
+                cached_response, similarity = cached
+                turn.add_message("assistant", cached_response)
+                if metrics:
+                    metrics.semantic_cache_similarity = round(similarity, 3)
+                    metrics.llm_complete = time.time()
                 yield {"type": "text", "data": cached_response}
+                await async_redis_service.commit_turn(turn)
                 yield {"type": "complete", "data": {
                     "success": True,
                     "response": cached_response,
@@ -141,103 +264,188 @@ class VoiceAgentService:
                 }}
                 return
             
+            kb_context = await self._knowledge_base_context(user_text, intent)
+            session_facts = self._session_facts(session)
+            ai_functions_schema = get_ai_functions()
+            
+            # ⚡ Routine turns start on the fast model and escalate if it falters
+            tier, tier_reason = model_tier_policy.first_call_tier(user_text, conversation_history.tokens)
+            
+            # The window ends with this turn's user message; the prompt adds it back
+            # in the same place a speculation did (build_turn_messages)
+            history = conversation_history.messages()[:-1]
+            
+            # ⚡ A speculation started on the interim transcript may already be streaming
+            speculation = speculative_prefetcher.claim(
+                call_sid,
+                user_text,
+                self._prompt_fingerprint(history, session_facts, kb_context, tier)
+            )
+            
             if metrics:
                 metrics.llm_request_start = time.time()
+                metrics.llm_tier = tier
+                if speculation:
+                    metrics.speculation_lead_ms = round((metrics.llm_request_start - speculation.started_at) * 1000, 0)
             
-            # First LLM call (check for function calls)
-            first_response = await openai_service.process_user_input(
-                user_message=user_text,
-                conversation_history=conversation_history,
-                available_functions=ai_functions_schema,
-            )
+            # ⚡ First LLM call, streamed: a direct answer is spoken as it arrives,
+            # each read-only tool starts as soon as its arguments are complete.
+            # Writers wait for the stream to end and the tool_calls message to be
+            # recorded, so a booking is never made without a trace in the history.
+            response_text = ""
+            llm_error = None
+            
+            if speculation:
+                llm_events = speculation.replay()
+            else:
+                llm_events = openai_service.stream_turn(
+                    openai_service.build_turn_messages(user_text, history, kb_context, session_facts),
+                    ai_functions_schema,
+                    tier,
+                    early_tools=READ_ONLY_FUNCTIONS
+                )
+            
+            async for event in llm_events:
+                event_type = event["type"]
+                
+                if event_type == "escalated":
+                    # Only the fast model's read-only calls were released; drop them,
+                    # the smart model takes over
+                    logger.info(f"   ⬆️ Escalated ({tier_reason}): {event['data']['reason']}")
+                    revoked = set(event["data"].get("revoked") or ())
+                    for call_id in revoked:
+                        task = tool_tasks.pop(call_id, None)
+                        if task:
+                            task.cancel()
+                    function_calls[:] = [call for call in function_calls if call["id"] not in revoked]
+                    if metrics:
+                        metrics.escalation_reason = event["data"]["reason"]
+                        metrics.llm_tier = SMART
+                    continue
+                
+                if metrics and metrics.llm_first_response is None and event_type in ("text", "tool_call"):
+                    metrics.llm_first_response = time.time()
+                    llm_ms = (metrics.llm_first_response - metrics.llm_request_start) * 1000
+                    logger.info(f"   LLM: {llm_ms:.0f}ms")
+                
+                if event_type == "text":
+                    response_text += event["data"]
+                    yield {"type": "text", "data": event["data"]}
+                
+                elif event_type == "tool_call":
+                    function_call = event["data"]
+                    function_calls.append(function_call)
+                    
+                    if metrics and metrics.tool_execution_start is None:
+                        metrics.tool_execution_start = time.time()
+                    
+                    if function_call["name"] in READ_ONLY_FUNCTIONS:
+                        tool_tasks[function_call["id"]] = asyncio.create_task(self._run_tool(turn, function_call))
+                
+                elif event_type == "done":
+                    if metrics:
+                        metrics.add_usage(event["data"].get("usage"))
+                
+                elif event_type == "error":
+                    llm_error = event["data"]
             
             if metrics:
-                metrics.llm_first_response = time.time()
-                llm_ms = (metrics.llm_first_response - metrics.llm_request_start) * 1000
-                logger.info(f"   LLM: {llm_ms:.0f}ms")
+                metrics.llm_stream_end = time.time()
             
-            if not first_response:
+            if llm_error and not response_text and not function_calls:
                 error_msg = "I'm having trouble understanding."
                 yield {"type": "text", "data": error_msg}
                 yield {"type": "complete", "data": {"success": False, "response": error_msg}}
                 return
 
-            # ⚡ HANDLE FUNCTION CALL
-            if first_response.get("function_call"):
-                function_call = first_response["function_call"]
-                function_name = function_call["name"]
-                function_args = function_call["arguments"]
-                tool_call_id = function_call["id"]
+            # ⚡ HANDLE FUNCTION CALLS
+            if function_calls:
+                function_names = [call["name"] for call in function_calls]
+                function_name = function_names[-1]
 
-                logger.info(f"   🔧 Tool: {function_name}")
+                logger.info(f"   🔧 Tools: {', '.join(function_names)}")
                 
                 if metrics:
-                    metrics.tool_name = function_name
-                    metrics.tool_execution_start = time.time()
+                    metrics.tool_name = ", ".join(function_names)
                 
-                # ⚡ Check tool cache
-                args_hash = redis_service.hash_query(json.dumps(function_args, sort_keys=True))
-                cached_tool_result = redis_service.get_cached_tool_result(function_name, args_hash)
+                turn.add_message(
+                    "assistant", 
+                    content=response_text or None,
+                    tool_calls=[{
+                        "id": call["id"],
+                        "type": "function",
+                        "function": {
+                            "name": call["name"],
+                            "arguments": json.dumps(call["arguments"])
+                        }
+                    } for call in function_calls]
+                )
+                calls_recorded = True
                 
-                if cached_tool_result:
-                    logger.info(f"⚡ Tool cache hit: {function_name}")
-                    function_result = cached_tool_result
-                else:
-                    # ⚡ FIXED: Store tool call properly
-                    redis_service.append_to_conversation(
-                        call_sid, 
-                        "assistant", 
-                        content=None,
-                        tool_calls=[{
-                            "id": tool_call_id,
-                            "type": "function",
-                            "function": {
-                                "name": function_name,
-                                "arguments": json.dumps(function_args)
-                            }
-                        }]
-                    )
-                    
-                    # Execute tool
-                    function_result = self.ai_tools.execute_function(function_name, function_args)
-                    
-                    # ⚡ Cache tool result (5 min TTL)
-                    redis_service.cache_tool_result(function_name, args_hash, function_result, ttl=300)
+                # Readers started while the LLM stream was still open; writers start
+                # now, one after another in call order
+                self._start_writers(turn, function_calls, tool_tasks)
+                function_results = await asyncio.gather(*(
+                    asyncio.shield(tool_tasks[call["id"]]) if call["name"] not in READ_ONLY_FUNCTIONS
+                    else tool_tasks[call["id"]]
+                    for call in function_calls
+                ))
+                function_result = function_results[-1]
                 
                 if metrics:
                     metrics.tool_execution_end = time.time()
                     tool_ms = (metrics.tool_execution_end - metrics.tool_execution_start) * 1000
-                    logger.info(f"   Tool exec: {tool_ms:.0f}ms")
+                    logger.info(f"   Tool exec: {tool_ms:.0f}ms ({len(function_calls)} call(s))")
                 
-                # ⚡ FIXED: Store tool result properly
-                redis_service.append_to_conversation(
-                    call_sid, 
-                    "tool",
-                    content=json.dumps(function_result),
-                    tool_call_id=tool_call_id,
-                    name=function_name
-                )
+                # ⚡ FIXED: Store tool results properly - all of them before LLM2
+                for call, result in zip(function_calls, function_results):
+                    turn.add_message(
+                        "tool",
+                        content=json.dumps(result),
+                        tool_call_id=call["id"],
+                        name=call["name"]
+                    )
+                    self._update_session_from_function(turn, call["name"], call["arguments"], result)
+                results_recorded = True
+                session_facts = self._session_facts(session)
                 
-                # ⚡ STREAMING second LLM call
-                session = redis_service.get_session(call_sid)
-                updated_history = session.get("conversation_history", [])
+                # ⚡ STREAMING second LLM call (window already includes this turn - no re-read)
+                updated_history = conversation_history
+                
+                # Verbalising a tool result is routine - fast model unless the context is long
+                llm2_tier, _ = model_tier_policy.verbalise_tier(conversation_history.tokens)
                 
                 if metrics:
                     metrics.llm2_request_start = time.time()
+                    metrics.llm2_tier = llm2_tier
                 
-                messages = openai_service.build_conversation_messages(
-                    updated_history, 
-                    include_system=True,
-                    compress=True
-                )
+                if voice_config.PROMPT_CACHE_LAYOUT:
+                    # Same prefix (system prompt + tools) as the first call
+                    messages = openai_service.build_cached_messages(
+                        updated_history,
+                        context=kb_context,
+                        session_facts=session_facts
+                    )
+                    llm2_functions = ai_functions_schema
+                else:
+                    messages = openai_service.build_conversation_messages(
+                        updated_history, 
+                        include_system=True,
+                        compress=True
+                    )
+                    llm2_functions = None
                 
                 # ⚡ STREAM THE RESPONSE
                 full_response = ""
                 chunk_count = 0
+                llm2_usage: Dict[str, int] = {}
                 
                 async for chunk in openai_service.generate_response_streaming(
                     messages=messages,
-                    temperature=0.4
+                    temperature=0.4,
+                    use_fast_model=llm2_tier == FAST,
+                    functions=llm2_functions,
+                    usage=llm2_usage
                 ):
                     if chunk:
                         full_response += chunk
@@ -252,41 +460,48 @@ class VoiceAgentService:
                 
                 if metrics:
                     metrics.llm2_complete = time.time()
+                    metrics.add_usage(llm2_usage)
                     llm2_ms = (metrics.llm2_complete - metrics.llm2_request_start) * 1000
                     logger.info(f"   LLM2: {llm2_ms:.0f}ms")
                 
                 # Store complete response
                 if full_response:
-                    redis_service.append_to_conversation(call_sid, "assistant", full_response)
+                    turn.add_message("assistant", full_response)
                     success = True
                 else:
                     full_response = self._generate_fallback_response(function_name, function_result)
-                    redis_service.append_to_conversation(call_sid, "assistant", full_response)
+                    turn.add_message("assistant", full_response)
                     success = False
                 
                 if metrics:
                     metrics.llm_complete = time.time()
                 
+                # Persist before "complete" - callers stop iterating there
+                await async_redis_service.commit_turn(turn)
+                
                 # Final complete message
                 yield {"type": "complete", "data": {
                     "success": success,
                     "response": full_response,
                     "function_called": True,
                     "function_name": function_name,
-                    "function_result": function_result
+                    "function_result": function_result,
+                    "function_names": function_names
                 }}
             
             else:
-                # ⚡ DIRECT RESPONSE - no function call
-                response_text = first_response.get("response") or "I'm sorry, I didn't quite understand."
+                # ⚡ DIRECT RESPONSE - already streamed as it was generated
+                answered = bool(response_text) and not llm_error
+                if not response_text:
+                    response_text = "I'm sorry, I didn't quite understand."
+                    yield {"type": "text", "data": response_text}
                 
-                # Yield complete response
-                yield {"type": "text", "data": response_text}
+                turn.add_message("assistant", response_text)
                 
-                redis_service.append_to_conversation(call_sid, "assistant", response_text)
-                
-                # ⚡ Cache simple responses (1 hour)
-                redis_service.cache_response(query_hash, response_text, ttl=3600)
+                # ⚡ Cache context-free answers (never ones that mention the caller's details)
+                if cache_vector is not None and answered and not self._mentions_caller(response_text, session):
+                    semantic_cache.store(cache_scope, cache_vector, user_text, response_text)
+                await async_redis_service.commit_turn(turn)
                 
                 if metrics:
                     metrics.llm_complete = time.time()
@@ -307,6 +522,170 @@ class VoiceAgentService:
                 "error": str(e), 
                 "response": error_msg
             }}
+        
+        finally:
+            if calls_recorded and not results_recorded:
+                await self._record_interrupted_tools(turn, function_calls, tool_tasks)
+            for task in tool_tasks.values():
+                if not task.done():
+                    task.cancel()
+            
+            # A speculation this turn never claimed (fast path, cache, error) is dropped
+            speculative_prefetcher.finish_turn(call_sid)
+            
+            # ⚡ One pipeline for all of the turn's writes - also runs on barge-in,
+            # so an executed tool call is never missing from the history
+            await async_redis_service.commit_turn(turn)
+            self._schedule_call_summary(turn)
+
+    def _start_writers(
+        self,
+        turn: TurnContext,
+        function_calls: List[Dict[str, Any]],
+        tool_tasks: Dict[str, asyncio.Task]
+    ) -> None:
+        """Start the turn's writer tools, chained so they run one after another in call order"""
+        last_writer: Optional[asyncio.Task] = None
+        for call in function_calls:
+            if call["name"] not in READ_ONLY_FUNCTIONS:
+                last_writer = asyncio.create_task(self._run_tool(turn, call, after=last_writer))
+                tool_tasks[call["id"]] = last_writer
+
+    async def _record_interrupted_tools(
+        self,
+        turn: TurnContext,
+        function_calls: List[Dict[str, Any]],
+        tool_tasks: Dict[str, asyncio.Task]
+    ) -> None:
+        """
+        Barge-in (or an error) after the tool calls were recorded: let writers that
+        already started finish - their DB commit happens regardless - and answer
+        every call so the tool chain stays complete in the history
+        """
+        writers = [
+            tool_tasks[call["id"]] for call in function_calls
+            if call["name"] not in READ_ONLY_FUNCTIONS and call["id"] in tool_tasks
+        ]
+        if writers:
+            try:
+                await asyncio.shield(asyncio.gather(*writers, return_exceptions=True))
+            except asyncio.CancelledError:
+                logger.warning("⚠️ Cancelled again while waiting for writer tools")
+        
+        for call in function_calls:
+            task = tool_tasks.get(call["id"])
+            if task and task.done() and not task.cancelled() and task.exception() is None:
+                result = task.result()
+                self._update_session_from_function(turn, call["name"], call["arguments"], result)
+            else:
+                result = {"success": False, "error": "Interrupted before completion"}
+            turn.add_message("tool", content=json.dumps(result), tool_call_id=call["id"], name=call["name"])
+        logger.info(f"   🔧 Recorded {len(function_calls)} interrupted tool call(s)")
+
+    async def _run_fast_path(
+        self,
+        turn: TurnContext,
+        action: FastPathAction,
+        metrics: 'LatencyMetrics' = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Answer a turn decided by the fast-path router: templated reply, or one tool + template"""
+        if metrics:
+            metrics.fast_path = action.route
+        
+        if action.updates:
+            turn.update(action.updates)
+        
+        result = None
+        reply = action.reply
+        
+        if action.tool_name:
+            call = {
+                "name": action.tool_name,
+                "arguments": action.arguments,
+                "id": f"call_fast_{uuid.uuid4().hex[:16]}"
+            }
+            # Recorded like an LLM tool call so the LLM sees it on later turns
+            turn.add_message("assistant", tool_calls=[{
+                "id": call["id"],
+                "type": "function",
+                "function": {"name": call["name"], "arguments": json.dumps(call["arguments"])}
+            }])
+            
+            if metrics:
+                metrics.tool_name = call["name"]
+                metrics.tool_execution_start = time.time()
+            
+            task = asyncio.create_task(self._run_tool(turn, call))
+            try:
+                # A writer (booking) is shielded from barge-in: it commits either way
+                result = await (task if call["name"] in READ_ONLY_FUNCTIONS else asyncio.shield(task))
+            except asyncio.CancelledError:
+                # The caller's commit_turn in process_user_speech_streaming persists this
+                await self._record_interrupted_tools(turn, [call], {call["id"]: task})
+                task.cancel()
+                raise
+            
+            if metrics:
+                metrics.tool_execution_end = time.time()
+            
+            turn.add_message("tool", content=json.dumps(result), tool_call_id=call["id"], name=call["name"])
+            self._update_session_from_function(turn, call["name"], call["arguments"], result)
+            reply = action.render(result, turn.session)
+        
+        turn.add_message("assistant", reply)
+        yield {"type": "text", "data": reply}
+        
+        if metrics:
+            metrics.llm_complete = time.time()
+        
+        await async_redis_service.commit_turn(turn)
+        
+        yield {"type": "complete", "data": {
+            "success": result.get("success", False) if result else True,
+            "response": reply,
+            "function_called": bool(action.tool_name),
+            "function_name": action.tool_name,
+            "function_result": result,
+            "fast_path": action.route
+        }}
+
+    async def _run_tool(
+        self,
+        turn: TurnContext,
+        function_call: Dict[str, Any],
+        after: Optional[asyncio.Task] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute one tool call without blocking the event loop.
+        Read-only tools use the tool cache and a private DB session so they can
+        run in parallel; writers wait for the previous writer (`after`) and use
+        the call's own session.
+        """
+        function_name = function_call["name"]
+        function_args = function_call["arguments"]
+        start_time = time.time()
+        
+        if function_name not in READ_ONLY_FUNCTIONS:
+            if after:
+                await asyncio.gather(after, return_exceptions=True)
+            return await self.ai_tools.execute_function_async(function_name, function_args)
+        
+        # ⚡ Check tool cache
+        args_hash = async_redis_service.hash_query(json.dumps(function_args, sort_keys=True))
+        cached_tool_result = (await async_redis_service.get_cached_tool_results([(function_name, args_hash)]))[0]
+        
+        if cached_tool_result:
+            logger.info(f"⚡ Tool cache hit: {function_name}")
+            return cached_tool_result
+        
+        function_result = await self.ai_tools.execute_function_async(function_name, function_args, isolated=True)
+        
+        # ⚡ Cache tool result (5 min TTL) - never a timeout
+        if not function_result.get("timed_out"):
+            turn.cache_tool_result(function_name, args_hash, function_result, ttl=300)
+        
+        logger.debug(f"   {function_name}: {(time.time() - start_time) * 1000:.0f}ms")
+        return function_result
 
     async def process_user_speech(
         self, 
@@ -392,30 +771,115 @@ class VoiceAgentService:
             logger.error(f"Error resolving doctor ID: {e}")
             return None
 
-    async def _update_session_from_function(
+    def _update_session_from_function(
         self,
-        call_sid: str,
+        turn: TurnContext,
         function_name: str,
         arguments: Dict[str, Any],
         result: Dict[str, Any]
-    ):
+    ) -> None:
+        """Record booking details from a tool call (written with the turn's pipeline)"""
         updates = {}
+        success = isinstance(result, dict) and result.get("success")
+        
+        if function_name == "get_available_doctors" and success:
+            updates["current_step"] = "selecting_doctor"
+            updates["offered_doctors"] = [
+                {"doctor_id": doc.get("doctor_id"), "name": doc.get("name")}
+                for doc in result.get("doctors", [])
+            ]
+            if arguments.get("user_context"):
+                updates["reason"] = arguments["user_context"]
+        
+        elif function_name == "get_doctor_schedule" and success:
+            updates.update({
+                "selected_doctor_id": result.get("doctor_id") or arguments.get("doctor_id"),
+                "current_step": "selecting_date"
+            })
         
-        if function_name == "book_appointment" and result.get("success"):
+        elif function_name == "get_available_slots" and success:
+            updates.update({
+                "selected_doctor_id": result.get("doctor_id") or arguments.get("doctor_id"),
+                "selected_date": result.get("date") or arguments.get("date"),
+                "offered_hours": sorted({int(slot.split(":")[0]) for slot in result.get("slots", [])}),
+                "current_step": "selecting_time"
+            })
+        
+        elif function_name == "get_appointment_details":
+            updates.update({
+                "patient_name": arguments.get("patient_name"),
+                "patient_phone": arguments.get("patient_phone")
+            })
+            if success:
+                updates["current_step"] = "checking_appointment"
+        
+        elif function_name == "book_appointment_in_hour_range":
             updates.update({
                 "patient_name": arguments.get("patient_name"),
                 "patient_phone": arguments.get("patient_phone"),
                 "selected_doctor_id": arguments.get("doctor_id"),
                 "selected_date": arguments.get("appointment_date"),
-                "selected_time": arguments.get("appointment_time"),
-                "reason": arguments.get("reason", ""),
-                "appointment_id": result.get("appointment_id"),
-                "status": "completed",
-                "current_step": "confirmed"
+                "reason": arguments.get("reason") or None
             })
+            if success:
+                appointment = result.get("appointment", {})
+                updates.update({
+                    "selected_time": appointment.get("appointment_time"),
+                    "appointment_id": appointment.get("id"),
+                    "status": "completed",
+                    "current_step": "confirmed"
+                })
+            else:
+                # Usually the hour was full - the reply offers alternatives
+                updates["current_step"] = "selecting_time"
         
+        updates = {key: value for key, value in updates.items() if value not in (None, "")}
         if updates:
-            redis_service.update_session(call_sid, updates)
+            turn.update(updates)
+
+    def _schedule_call_summary(self, turn: TurnContext) -> None:
+        """
+        ⚡ Off the critical path: fold turns trimmed from the window into the
+        session's call facts, so long calls keep a bounded prompt without
+        forgetting who the patient is or what they chose.
+        """
+        window = turn.window
+        if not voice_config.CALL_SUMMARY_ENABLED or window is None or not window.evicted or not turn.session:
+            return
+        
+        running = self.summary_tasks.get(turn.call_sid)
+        if running and not running.done():
+            return  # evicted messages wait for the next run
+        
+        facts = {key: turn.session.get(key) for key in CALL_FACT_FIELDS + ("call_summary",)}
+        self.summary_tasks[turn.call_sid] = asyncio.create_task(
+            self._summarize_call_facts(turn.call_sid, facts, window.drain_evicted())
+        )
+
+    async def _summarize_call_facts(
+        self,
+        call_sid: str,
+        facts: Dict[str, Any],
+        messages: List[Dict[str, Any]]
+    ) -> None:
+        start_time = time.time()
+        result = await openai_service.summarize_call_facts(facts, messages, list(CALL_FACT_FIELDS))
+        if not result:
+            return
+        
+        # Tool-recorded values win; the summary only fills gaps
+        updates = {
+            key: result[key]
+            for key in CALL_FACT_FIELDS
+            if not facts.get(key) and result.get(key) not in (None, "")
+        }
+        if isinstance(result.get("call_summary"), str) and result["call_summary"].strip():
+            updates["call_summary"] = result["call_summary"].strip()
+        
+        if updates:
+            await async_redis_service.update_session(call_sid, updates)
+        logger.info(f"📝 Call facts: folded {len(messages)} older message(s) in "
+                    f"{(time.time() - start_time) * 1000:.0f}ms ({', '.join(updates) or 'no changes'})")
 
     def _group_slots_by_hour(self, slots: List[str]) -> Dict[int, List[str]]:
         hourly_slots = defaultdict(list)
@@ -428,8 +892,20 @@ class VoiceAgentService:
         return dict(sorted(hourly_slots.items()))
 
     async def end_call(self, call_sid: str) -> Dict[str, Any]:
+        self.windows.pop(call_sid, None)
+        speculative_prefetcher.end_call(call_sid)
+        if voice_config.SPECULATIVE_LLM_ENABLED:
+            logger.info(f"🔮 Speculative LLM: {speculative_prefetcher.get_stats()}")
+        if semantic_cache.enabled:
+            logger.info(f"⚡ Semantic cache: {semantic_cache.get_stats()}")
+        if specialization_classifier.enabled:
+            logger.info(f"⚡ Specialization classifier: {specialization_classifier.get_stats()}")
+        logger.info(f"⚡ Query embeddings: {embedding_provider.get_stats()}")
+        summary_task = self.summary_tasks.pop(call_sid, None)
+        if summary_task and not summary_task.done():
+            summary_task.cancel()
         try:
-            session = redis_service.get_session(call_sid)
+            session = await async_redis_service.get_session(call_sid, full_history=True)
 
             db_session = self.db.query(CallSession).filter(
                 CallSession.call_sid == call_sid
@@ -449,7 +925,7 @@ class VoiceAgentService:
             if session and session.get("appointment_id") and voice_config.ENABLE_SMS_CONFIRMATION:
                 await self._send_confirmation_sms(session)
 
-            redis_service.delete_session(call_sid)
+            await async_redis_service.delete_session(call_sid)
             
             logger.debug(f"Call ended: {call_sid}")
             return {"success": True}
@@ -475,7 +951,9 @@ class VoiceAgentService:
             date = session.get("selected_date", "")
             time = session.get("selected_time", "")
 
-            doctor = DoctorService.get_doctor_by_id(self.db, doctor_id)
+            if not doctor_roster.is_loaded:
+                await run_blocking(doctor_roster.warm)
+            doctor = doctor_roster.get(doctor_id) or await run_blocking(DoctorService.get_doctor_by_id, self.db, doctor_id)
             doctor_name = doctor.name if doctor else "Doctor"
 
             twilio_service.send_appointment_confirmation_sms(
@@ -495,20 +973,21 @@ class VoiceAgentService:
     def _extract_doctor_from_speech(self, user_text: str, available_doctors: List[Dict]) -> str:
         user_lower = user_text.lower()
 
-        ordinals = {
-            'first': 0, '1st': 0, 'one': 0,
-            'second': 1, '2nd': 1, 'two': 1,
-            'third': 2, '3rd': 2, 'three': 2
-        }
-        
-        for word, index in ordinals.items():
-            if word in user_lower and index < len(available_doctors):
-                return available_doctors[index]["doctor_id"]
-
+        # Names first - "the one with Mathew" names a doctor, it doesn't pick the first
         for doctor in available_doctors:
-            name_parts = doctor["name"].lower().split()
+            name_parts = doctor["name"].lower().replace('dr.', '').split()
             for part in name_parts:
-                if len(part) > 2 and part in user_lower:
+                if len(part) > 2 and re.search(rf"\b{re.escape(part)}\b", user_lower):
                     return doctor["doctor_id"]
+
+        # An ordinal only counts when it is the whole pick ("the second one")
+        index = ordinal_pick(user_lower.strip().rstrip(".!"), len(available_doctors))
+        if index is not None:
+            return available_doctors[index]["doctor_id"]
         
         return None
+
+    def _match_offered_doctor(self, user_text: str, available_doctors: List[Dict]) -> Optional[str]:
+        """Doctor picked from the options just read out (fast path)"""
+        return (self._extract_doctor_from_speech(user_text, available_doctors)
+                or self._resolve_doctor_id(user_text, available_doctors))
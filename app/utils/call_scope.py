@@ -0,0 +1,75 @@
+# app/utils/call_scope.py - Per-call cancellation scope for LLM / tool / TTS tasks
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Dict, Optional, Set
+
+logger = logging.getLogger("voice")
+
+
+class CallTaskScope:
+    """
+    ⚡ Owns every asyncio task working on behalf of one call.
+    Barge-in cancels them all at once, which aborts in-flight OpenAI and
+    ElevenLabs streams (their finally blocks close the HTTP responses) instead
+    of letting abandoned generations run to completion and keep billing.
+    """
+
+    def __init__(self, call_sid: str):
+        self.call_sid = call_sid
+        self._tasks: Dict[asyncio.Task, str] = {}
+        self.cancelled_count = 0
+        self.last_cancel_at: Optional[float] = None
+
+    def spawn(self, coro: Awaitable, kind: str = "turn") -> asyncio.Task:
+        """Start a task owned by this call"""
+        task = asyncio.create_task(coro)
+        self._tasks[task] = kind
+        task.add_done_callback(self._discard)
+        return task
+
+    def adopt(self, task: asyncio.Task, kind: str = "turn") -> asyncio.Task:
+        """Track a task that was created elsewhere"""
+        if not task.done():
+            self._tasks[task] = kind
+            task.add_done_callback(self._discard)
+        return task
+
+    def _discard(self, task: asyncio.Task) -> None:
+        self._tasks.pop(task, None)
+
+    def active(self, kind: Optional[str] = None) -> Set[asyncio.Task]:
+        return {t for t, k in self._tasks.items() if kind is None or k == kind}
+
+    def cancel_all(self, reason: str = "interruption", exclude: Optional[asyncio.Task] = None) -> int:
+        """Cancel every running task; returns how many were cancelled"""
+        self.last_cancel_at = time.time()
+        cancelled = 0
+
+        for task, kind in list(self._tasks.items()):
+            if task is exclude or task.done():
+                continue
+            task.cancel()
+            cancelled += 1
+            logger.debug(f"🛑 Cancelled {kind} task ({reason})")
+
+        self.cancelled_count += cancelled
+        if cancelled:
+            logger.info(f"🛑 Cancelled {cancelled} task(s) for {self.call_sid[-8:]} ({reason})")
+        return cancelled
+
+    async def wait_idle(self, timeout: float = 1.0) -> bool:
+        """Wait for cancelled tasks to unwind (streams closed); False on timeout"""
+        tasks = list(self._tasks)
+        if not tasks:
+            return True
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        return not pending
+
+    async def close(self) -> None:
+        """Cancel everything and wait for the tasks to unwind"""
+        tasks = list(self._tasks)
+        self.cancel_all("call ended")
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,135 @@
+# app/utils/conversation_window.py - Incremental, token-budgeted message window per call
+
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Set, Tuple
+
+logger = logging.getLogger("agent")
+
+# Rough OpenAI token estimate: ~4 chars per token plus per-message overhead
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(message: Dict[str, Any]) -> int:
+    """Cheap token estimate for one chat message (no tokenizer on the hot path)"""
+    chars = len(message.get("content") or "")
+    for call in message.get("tool_calls") or []:
+        function = call.get("function", {})
+        chars += len(function.get("name", "")) + len(function.get("arguments", ""))
+    return chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+class ConversationWindow:
+    """
+    ⚡ Validated tail of one call's conversation, maintained as messages arrive.
+
+    Every append is O(1) amortised: a tool message is kept only if it answers a
+    call of the assistant message that opened the current tool chain, and a chain
+    that never got all of its results (barge-in mid-tool) is dropped when the next
+    turn starts. The window is capped by an estimated token budget; when it runs
+    over, it is trimmed to TRIM_RATIO of the budget at a user-message boundary,
+    so the prompt prefix stays stable (prompt cache) for several turns. Trimmed
+    messages are kept in `evicted` for the call-facts summariser.
+    """
+
+    TRIM_RATIO = 0.75
+
+    def __init__(self, max_tokens: int = 2000):
+        self.max_tokens = max_tokens
+        self._messages: Deque[Tuple[Dict[str, Any], int]] = deque()
+        self._tokens = 0
+        self._pending_tool_ids: Set[str] = set()
+        self._chain_len = 0  # assistant tool_calls message + results so far
+        self.seeded = False
+        self.dropped = 0
+        self.evicted: List[Dict[str, Any]] = []  # trimmed messages awaiting summarisation
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @property
+    def tokens(self) -> int:
+        return self._tokens
+
+    def seed(self, history: Iterable[Dict[str, Any]]) -> None:
+        """Load the stored history once (e.g. first turn of the call)"""
+        self.extend(history)
+        self.seeded = True
+
+    def extend(self, messages: Iterable[Dict[str, Any]]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def append(self, message: Dict[str, Any]) -> bool:
+        """Add one message; False if it was dropped as an orphaned tool result"""
+        role = message.get("role")
+
+        if role == "tool":
+            tool_call_id = message.get("tool_call_id")
+            if not self._chain_len or tool_call_id not in self._pending_tool_ids:
+                self.dropped += 1
+                logger.debug(f"⚠️ Dropping orphaned tool message ({tool_call_id})")
+                return False
+            self._pending_tool_ids.discard(tool_call_id)
+            self._chain_len += 1
+            self._push(message)
+            return True
+
+        # Any other message closes the current tool chain
+        if self._pending_tool_ids:
+            self._drop_open_chain()
+        self._chain_len = 0
+
+        if role == "assistant" and message.get("tool_calls"):
+            self._pending_tool_ids = {call["id"] for call in message["tool_calls"]}
+            self._chain_len = 1
+
+        self._push(message)
+        self._trim()
+        return True
+
+    def messages(self) -> List[Dict[str, Any]]:
+        """OpenAI message list, O(window); an unanswered tool chain is left out"""
+        count = len(self._messages)
+        if self._pending_tool_ids:
+            count = max(0, count - self._chain_len)
+        return [message for message, _ in list(self._messages)[:count]]
+
+    def _push(self, message: Dict[str, Any]) -> None:
+        tokens = estimate_tokens(message)
+        self._messages.append((message, tokens))
+        self._tokens += tokens
+
+    def drain_evicted(self) -> List[Dict[str, Any]]:
+        """Messages trimmed since the last call (oldest first)"""
+        evicted, self.evicted = self.evicted, []
+        return evicted
+
+    def _pop_left(self) -> Dict[str, Any]:
+        message, tokens = self._messages.popleft()
+        self._tokens -= tokens
+        self.evicted.append(message)
+        return message
+
+    def _drop_open_chain(self) -> None:
+        """Remove a tool chain whose results never all arrived (invalid for OpenAI)"""
+        for _ in range(min(self._chain_len, len(self._messages))):
+            _, tokens = self._messages.pop()
+            self._tokens -= tokens
+        self.dropped += self._chain_len
+        logger.debug(f"⚠️ Dropped incomplete tool chain ({self._chain_len} messages)")
+        self._pending_tool_ids = set()
+        self._chain_len = 0
+
+    def _trim(self) -> None:
+        if self._tokens <= self.max_tokens:
+            return
+
+        target = int(self.max_tokens * self.TRIM_RATIO)
+        while self._tokens > target and len(self._messages) > 1:
+            self._pop_left()
+
+        # Start at a user message so no tool result or reply loses its context
+        while len(self._messages) > 1 and self._messages[0][0].get("role") != "user":
+            self._pop_left()
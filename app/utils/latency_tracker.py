@@ -26,6 +26,21 @@ class LatencyMetrics:
     llm_request_start: Optional[float] = None
     llm_first_response: Optional[float] = None
     llm_complete: Optional[float] = None
+    llm_stream_end: Optional[float] = None  # first (tool-aware) completion stream closed
+    
+    # Fast path (rule-based router answered without the LLM)
+    fast_path: Optional[str] = None
+    
+    # Model tiering ("fast" / "smart"); escalation_reason set when fast handed over to smart
+    llm_tier: Optional[str] = None
+    llm2_tier: Optional[str] = None
+    escalation_reason: Optional[str] = None
+    
+    # Semantic answer cache hit (similarity of the matched question)
+    semantic_cache_similarity: Optional[float] = None
+    
+    # Speculative first LLM call: how far ahead of the final transcript it started
+    speculation_lead_ms: Optional[float] = None
     
     # Tool execution timings
     tool_execution_start: Optional[float] = None
@@ -36,21 +51,46 @@ class LatencyMetrics:
     llm2_request_start: Optional[float] = None
     llm2_complete: Optional[float] = None
     
+    # Token usage across the turn's LLM calls (cached = served from OpenAI's prompt cache)
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    completion_tokens: int = 0
+    
     # TTS timings
     tts_request_start: Optional[float] = None
     tts_first_chunk: Optional[float] = None
     tts_complete: Optional[float] = None
     tts_chunks_count: int = 0
     
+    # Sentence-level streaming TTS
+    tts_streaming: bool = False
+    tts_segments_count: int = 0
+    response_text_complete: Optional[float] = None
+    
     # Audio streaming timings
     first_audio_sent: Optional[float] = None
     last_audio_sent: Optional[float] = None
     audio_frames_sent: int = 0
     total_audio_bytes: int = 0
-    
+    playback_complete: Optional[float] = None  # Twilio mark echo after the last frame
+
+    # Barge-in
+    interrupted_at: Optional[float] = None
+    silence_at: Optional[float] = None  # Twilio clear sent after cancelling the turn
+    cancel_unwound_at: Optional[float] = None  # LLM / TTS streams closed
+    cancelled_tasks: int = 0
+
     # End-to-end
     interaction_complete: Optional[float] = None
     
+    def add_usage(self, usage: Optional[Dict[str, int]]) -> None:
+        """Accumulate token usage reported by an LLM call"""
+        if not usage:
+            return
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.cached_prompt_tokens += usage.get("cached_tokens", 0)
+        self.completion_tokens += usage.get("completion_tokens", 0)
+    
     def calculate_metrics(self) -> Dict[str, float]:
         """Calculate derived latency metrics in milliseconds"""
         metrics = {}
@@ -66,10 +106,17 @@ class LatencyMetrics:
         if self.llm_request_start and self.llm_complete:
             metrics["llm_total"] = round((self.llm_complete - self.llm_request_start) * 1000, 0)
         
+        if self.speculation_lead_ms is not None:
+            metrics["speculation_lead"] = self.speculation_lead_ms
+        
         # Tool execution
         if self.tool_execution_start and self.tool_execution_end:
             metrics["tool_time"] = round((self.tool_execution_end - self.tool_execution_start) * 1000, 0)
         
+        # ⚡ Tool dispatched while the first completion was still streaming
+        if self.tool_execution_start and self.llm_stream_end and self.llm_stream_end > self.tool_execution_start:
+            metrics["tool_overlap"] = round((self.llm_stream_end - self.tool_execution_start) * 1000, 0)
+        
         # Second LLM (after tool)
         if self.llm2_request_start and self.llm2_complete:
             metrics["llm2_total"] = round((self.llm2_complete - self.llm2_request_start) * 1000, 0)
@@ -85,6 +132,13 @@ class LatencyMetrics:
         if self.speech_ended_at and self.first_audio_sent:
             metrics["time_to_first_audio"] = round((self.first_audio_sent - self.speech_ended_at) * 1000, 0)
         
+        # ⚡ TTFA gain from sentence streaming: buffered mode could not start TTS
+        # before the full reply existed, so its TTFA would have been at least
+        # response_text_complete + TTS first-chunk latency
+        if self.tts_streaming and self.response_text_complete and self.first_audio_sent and "tts_first_chunk" in metrics:
+            buffered_first_audio = self.response_text_complete + metrics["tts_first_chunk"] / 1000
+            metrics["ttfa_gain"] = round((buffered_first_audio - self.first_audio_sent) * 1000, 0)
+        
         # Total interaction time
         if self.speech_ended_at and self.interaction_complete:
             metrics["total_time"] = round((self.interaction_complete - self.speech_ended_at) * 1000, 0)
@@ -93,7 +147,28 @@ class LatencyMetrics:
         if self.first_audio_sent and self.last_audio_sent:
             metrics["audio_duration"] = round((self.last_audio_sent - self.first_audio_sent) * 1000, 0)
         
+        # Playback (from Twilio mark echo)
+        if self.first_audio_sent and self.playback_complete:
+            metrics["playback_total"] = round((self.playback_complete - self.first_audio_sent) * 1000, 0)
+        
+        if self.speech_ended_at and self.playback_complete:
+            metrics["time_to_playback_complete"] = round((self.playback_complete - self.speech_ended_at) * 1000, 0)
+        
+        # Barge-in: interruption detected -> caller hears silence / streams released
+        if self.interrupted_at and self.silence_at:
+            metrics["cancel_to_silence"] = round((self.silence_at - self.interrupted_at) * 1000, 0)
+
+        if self.interrupted_at and self.cancel_unwound_at:
+            metrics["cancel_unwind"] = round((self.cancel_unwound_at - self.interrupted_at) * 1000, 0)
+
+        # ⚡ Prompt cache effectiveness
+        if self.prompt_tokens:
+            metrics["prompt_tokens"] = self.prompt_tokens
+            metrics["cached_prompt_tokens"] = self.cached_prompt_tokens
+            metrics["prompt_cache_hit_pct"] = round(self.cached_prompt_tokens / self.prompt_tokens * 100, 1)
+        
         metrics["tts_chunks"] = self.tts_chunks_count
+        metrics["tts_segments"] = self.tts_segments_count
         metrics["audio_frames"] = self.audio_frames_sent
         metrics["audio_kb"] = round(self.total_audio_bytes / 1024, 1)
         
@@ -116,17 +191,40 @@ class LatencyMetrics:
         # Critical metrics first
         logger.info(f"⚡ TIME TO FIRST AUDIO: {ttfa}ms")
         logger.info(f"⏱️  TOTAL INTERACTION: {total}ms")
+        if "ttfa_gain" in metrics:
+            logger.info(f"🚀 TTFA GAIN (sentence streaming): {metrics['ttfa_gain']}ms over {self.tts_segments_count} segments")
         logger.info("-" * 100)
         
         # Detailed breakdown
+        if self.fast_path:
+            logger.info(f"   ⚡ Fast path: {self.fast_path} (no LLM)")
+        
+        if self.semantic_cache_similarity is not None:
+            logger.info(f"   ⚡ Semantic cache hit: similarity {self.semantic_cache_similarity} (no LLM)")
+        
         if "llm_total" in metrics:
-            logger.info(f"   LLM: {metrics['llm_total']}ms")
+            tier = f" [{self.llm_tier}]" if self.llm_tier else ""
+            logger.info(f"   LLM{tier}: {metrics['llm_total']}ms")
+        
+        if "speculation_lead" in metrics:
+            logger.info(f"   🔮 Speculative LLM hit: started {metrics['speculation_lead']}ms before the final transcript")
+        
+        if self.escalation_reason:
+            logger.info(f"   ⬆️ Escalated fast -> smart: {self.escalation_reason}")
         
         if self.tool_name and "tool_time" in metrics:
             logger.info(f"   Tool ({self.tool_name}): {metrics['tool_time']}ms")
         
+        if "tool_overlap" in metrics:
+            logger.info(f"   Tool started {metrics['tool_overlap']}ms before the LLM stream closed")
+        
         if "llm2_total" in metrics:
-            logger.info(f"   LLM (after tool): {metrics['llm2_total']}ms")
+            tier = f" [{self.llm2_tier}]" if self.llm2_tier else ""
+            logger.info(f"   LLM (after tool){tier}: {metrics['llm2_total']}ms")
+        
+        if "prompt_tokens" in metrics:
+            logger.info(f"   Prompt cache: {metrics['cached_prompt_tokens']}/{metrics['prompt_tokens']} tokens "
+                        f"({metrics['prompt_cache_hit_pct']}%)")
         
         if "tts_first_chunk" in metrics:
             logger.info(f"   TTS first chunk: {metrics['tts_first_chunk']}ms")
@@ -137,6 +235,14 @@ class LatencyMetrics:
         if "audio_duration" in metrics:
             logger.info(f"   Audio streaming: {metrics['audio_duration']}ms")
         
+        if "playback_total" in metrics:
+            logger.info(f"   Playback complete: {metrics['playback_total']}ms after first frame")
+
+        if "cancel_to_silence" in metrics:
+            unwind = metrics.get("cancel_unwind", "N/A")
+            logger.info(f"   🛑 Barge-in: silence in {metrics['cancel_to_silence']}ms, "
+                        f"{self.cancelled_tasks} task(s) unwound in {unwind}ms")
+
         logger.info("-" * 100)
         logger.info(f"   Audio: {metrics.get('tts_chunks', 0)} chunks, {metrics.get('audio_kb', 0)} KB")
         logger.info("=" * 100)
@@ -151,6 +257,11 @@ class LatencyMetrics:
             "interaction_id": self.interaction_id,
             "timestamp": self.timestamp.isoformat(),
             "tool_used": self.tool_name,
+            "fast_path": self.fast_path,
+            "semantic_cache_similarity": self.semantic_cache_similarity,
+            "llm_tier": self.llm_tier,
+            "llm2_tier": self.llm2_tier,
+            "escalation_reason": self.escalation_reason,
             "metrics": metrics
         }
 
@@ -206,10 +317,68 @@ class LatencyTracker:
                 "min_ttfa_ms": round(min(ttfa_values), 0),
                 "max_ttfa_ms": round(max(ttfa_values), 0),
             }
+            gain_values = [m["metrics"]["ttfa_gain"] for m in session_metrics if "ttfa_gain" in m["metrics"]]
+            if gain_values:
+                stats["avg_ttfa_gain_ms"] = round(sum(gain_values) / len(gain_values), 0)
+            lead_values = [m["metrics"]["speculation_lead"] for m in session_metrics if "speculation_lead" in m["metrics"]]
+            if lead_values:
+                stats["speculative_hits"] = len(lead_values)
+                stats["avg_speculation_lead_ms"] = round(sum(lead_values) / len(lead_values), 0)
+            fast_count = sum(1 for m in session_metrics if m.get("fast_path"))
+            if fast_count:
+                stats["fast_path_turns"] = fast_count
+            cache_hits = sum(1 for m in session_metrics if m.get("semantic_cache_similarity") is not None)
+            if cache_hits:
+                stats["semantic_cache_hits"] = cache_hits
+            silence_values = [m["metrics"]["cancel_to_silence"] for m in session_metrics if "cancel_to_silence" in m["metrics"]]
+            if silence_values:
+                stats["barge_ins"] = len(silence_values)
+                stats["avg_cancel_to_silence_ms"] = round(sum(silence_values) / len(silence_values), 0)
+            tier_stats = self.get_tier_stats(session_metrics)
+            if tier_stats:
+                stats["tiers"] = tier_stats
+            prompt_total = sum(m["metrics"].get("prompt_tokens", 0) for m in session_metrics)
+            if prompt_total:
+                cached_total = sum(m["metrics"].get("cached_prompt_tokens", 0) for m in session_metrics)
+                stats["prompt_cache_hit_pct"] = round(cached_total / prompt_total * 100, 1)
             logger.info(f"📈 SESSION STATS: {stats}")
             return stats
         
         return {}
+    
+    def get_tier_stats(self, session_metrics: Optional[List[Dict]] = None) -> Dict:
+        """Per-model-tier latency and fast -> smart escalation rate"""
+        session_metrics = self.completed_metrics if session_metrics is None else session_metrics
+        tiers: Dict[str, Dict] = {}
+        
+        for m in session_metrics:
+            if m.get("llm_tier") and "llm_first_token" in m["metrics"]:
+                tier = tiers.setdefault(m["llm_tier"], {"turns": 0, "llm_first_token": [], "llm2_total": []})
+                tier["turns"] += 1
+                tier["llm_first_token"].append(m["metrics"]["llm_first_token"])
+            if m.get("llm2_tier") and "llm2_total" in m["metrics"]:
+                tier = tiers.setdefault(m["llm2_tier"], {"turns": 0, "llm_first_token": [], "llm2_total": []})
+                tier["llm2_total"].append(m["metrics"]["llm2_total"])
+        
+        stats = {}
+        for name, tier in tiers.items():
+            stats[name] = {"turns": tier["turns"]}
+            for key in ("llm_first_token", "llm2_total"):
+                if tier[key]:
+                    stats[name][f"avg_{key}_ms"] = round(sum(tier[key]) / len(tier[key]), 0)
+        
+        # Escalated turns are recorded under "smart"; the rate is over turns that started fast
+        escalations = [m["escalation_reason"] for m in session_metrics if m.get("escalation_reason")]
+        started_fast = stats.get("fast", {}).get("turns", 0) + len(escalations)
+        if started_fast:
+            stats["escalation_rate_pct"] = round(len(escalations) / started_fast * 100, 1)
+            reasons: Dict[str, int] = {}
+            for reason in escalations:
+                key = reason.split(":")[0]
+                reasons[key] = reasons.get(key, 0) + 1
+            stats["escalation_reasons"] = reasons
+        
+        return stats
 
 
 # Global instance
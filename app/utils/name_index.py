@@ -0,0 +1,179 @@
+# app/utils/name_index.py - Phonetic + trigram index for fuzzy doctor-name lookup
+
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+# Spelling variants STT produces for Indian names, folded before keying
+# (order matters: longer patterns first)
+PHONETIC_RULES = [
+    (r"ksh", "ks"), (r"x", "ks"), (r"ph", "f"), (r"q", "k"),
+    (r"ck", "k"), (r"c(?=[eiy])", "s"), (r"sh", "s"), (r"ch", "c"), (r"c", "k"),
+    (r"([bdgjkt])h", r"\1"),   # aspirates: bh/dh/gh/jh/kh/th -> b/d/g/j/k/t
+    (r"w", "v"), (r"z", "j"),  # v/w and z/j are interchangeable in Indian English
+    (r"ee|ea|ie|y", "i"), (r"oo|ou", "u"), (r"aa", "a"),
+    (r"h$", ""),               # trailing h: Shah / Sha, Singh / Sing
+]
+VOWELS = set("aeiou")
+
+NAME_NOISE = {"dr", "doctor"}
+
+# Word pairs with the same phonetic key score at least this (keys shorter than
+# MIN_PHONETIC_KEY, e.g. "Shah" -> "s", are too ambiguous to count)
+PHONETIC_MATCH_SCORE = 0.85
+MIN_PHONETIC_KEY = 2
+MIN_WORD_LENGTH = 3
+# A name must share this many trigrams with a query word (or its phonetic key) to be scored
+MIN_SHARED_TRIGRAMS = 2
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase alphabetic words without titles ("Dr.", "Doctor")"""
+    return [word for word in re.findall(r"[a-z]+", (text or "").lower()) if word not in NAME_NOISE]
+
+
+def phonetic_key(word: str) -> str:
+    """
+    Metaphone-style key: spelling variants folded, vowels dropped after the
+    first letter, repeated letters collapsed ("Srivastava" / "Shrivastav" -> "srvstv")
+    """
+    word = word.lower()
+    for pattern, replacement in PHONETIC_RULES:
+        word = re.sub(pattern, replacement, word)
+    if not word:
+        return ""
+
+    key = [word[0]]
+    for char in word[1:]:
+        if char in VOWELS or char == "h":
+            continue
+        if char != key[-1]:
+            key.append(char)
+    return "".join(key)
+
+
+def trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class NameIndex:
+    """
+    ⚡ Prebuilt fuzzy name index: phonetic keys + trigram postings per name word.
+    search() only scores names that share a phonetic key or a trigram with the
+    query, so a lookup touches a handful of postings instead of running
+    SequenceMatcher over every doctor. add/remove keep it in sync incrementally.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._names: Dict[str, Tuple[str, ...]] = {}        # id -> name words
+        self._word_grams: Dict[str, Set[str]] = {}          # word -> its trigrams
+        self._word_keys: Dict[str, str] = {}                # word -> phonetic key
+        self._phonetic: Dict[str, Set[str]] = {}            # key -> ids
+        self._postings: Dict[str, Set[str]] = {}            # trigram -> ids
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._names
+
+    def add(self, item_id: str, name: str) -> None:
+        words = tuple(normalize_words(name))
+        with self._lock:
+            if item_id in self._names:
+                self._remove(item_id)
+            self._names[item_id] = words
+            for word in words:
+                key = self._word_keys.setdefault(word, phonetic_key(word))
+                self._phonetic.setdefault(key, set()).add(item_id)
+                grams = self._word_grams.setdefault(word, trigrams(word))
+                for gram in grams:
+                    self._postings.setdefault(gram, set()).add(item_id)
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            self._remove(item_id)
+
+    def _remove(self, item_id: str) -> None:
+        for word in self._names.pop(item_id, ()):
+            self._discard(self._phonetic, self._word_keys[word], item_id)
+            for gram in self._word_grams.get(word, ()):
+                self._discard(self._postings, gram, item_id)
+
+    @staticmethod
+    def _discard(table: Dict[str, Set[str]], key: str, item_id: str) -> None:
+        ids = table.get(key)
+        if ids is not None:
+            ids.discard(item_id)
+            if not ids:
+                del table[key]
+
+    def sync(self, names: Dict[str, str]) -> int:
+        """Bring the index in line with {id: name}; returns how many entries changed"""
+        changed = 0
+        for item_id in [item_id for item_id in self._names if item_id not in names]:
+            self.remove(item_id)
+            changed += 1
+        for item_id, name in names.items():
+            if self._names.get(item_id) != tuple(normalize_words(name)):
+                self.add(item_id, name)
+                changed += 1
+        return changed
+
+    def search(
+        self,
+        query: str,
+        limit: int = 3,
+        min_score: float = 0.6,
+        allowed: Optional[Set[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """Ranked (id, score) candidates, optionally only among `allowed` ids; score 0..1"""
+        query_words = [word for word in normalize_words(query) if len(word) >= MIN_WORD_LENGTH]
+        if not query_words:
+            return []
+
+        query_keys = {word: phonetic_key(word) for word in query_words}
+        query_grams = {word: trigrams(word) for word in query_words}
+        full_query = trigrams("".join(normalize_words(query)))
+
+        with self._lock:
+            candidates: Set[str] = set()
+            for word in query_words:
+                if len(query_keys[word]) >= MIN_PHONETIC_KEY:
+                    candidates |= self._phonetic.get(query_keys[word], set())
+                shared: Dict[str, int] = {}
+                for gram in query_grams[word]:
+                    for item_id in self._postings.get(gram, ()):
+                        shared[item_id] = shared.get(item_id, 0) + 1
+                candidates.update(item_id for item_id, count in shared.items() if count >= MIN_SHARED_TRIGRAMS)
+            if allowed is not None:
+                candidates &= allowed
+
+            scored = []
+            for item_id in candidates:
+                words = self._names[item_id]
+                best_per_word = [
+                    max(self._word_score(qword, query_keys[qword], query_grams[qword], word) for word in words)
+                    for qword in query_words
+                ] if words else [0.0]
+                score = max(_dice(full_query, trigrams("".join(words))), *best_per_word)
+                if score >= min_score:
+                    # Ties go to the name that matches more of the query ("raahul sarma")
+                    scored.append((item_id, round(score, 3), sum(best_per_word)))
+
+        scored.sort(key=lambda entry: (entry[1], entry[2]), reverse=True)
+        return [(item_id, score) for item_id, score, _ in scored[:limit]]
+
+    def _word_score(self, qword: str, qkey: str, qgrams: Set[str], word: str) -> float:
+        score = _dice(qgrams, self._word_grams[word])
+        if len(qkey) >= MIN_PHONETIC_KEY and qkey == self._word_keys[word]:
+            score = max(score, PHONETIC_MATCH_SCORE)
+        return score
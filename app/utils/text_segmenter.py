@@ -0,0 +1,91 @@
+# app/utils/text_segmenter.py - Sentence/clause splitter for streaming TTS
+
+import re
+from typing import List
+
+# ⚡ Pre-compiled boundary patterns
+SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s')
+CLAUSE_END = re.compile(r'[,;:—]\s')
+
+# Tokens that end with a period but never end a sentence
+ABBREVIATIONS = {
+    "dr", "mr", "mrs", "ms", "st", "vs", "etc", "e.g", "i.e",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec"
+}
+# Tokens that are abbreviations only in context: "No. 5", "3 p.m. on Monday"
+# - but "No." and "at 3 PM." are ordinary sentence endings
+NUMBER_ABBREVIATIONS = {"no"}
+TIME_ABBREVIATIONS = {"am", "pm", "a.m", "p.m"}
+
+
+class SentenceSegmenter:
+    """
+    Split a streaming LLM token feed into speakable segments.
+
+    Sentences are emitted as soon as their terminator arrives. Clauses
+    (comma, semicolon, colon) are only emitted once the buffer is long
+    enough to sound natural on its own.
+    """
+
+    def __init__(self, min_chars: int = 20, clause_min_chars: int = 60):
+        self.min_chars = min_chars
+        self.clause_min_chars = clause_min_chars
+        self._buffer = ""
+
+    def _is_abbreviation(self, text: str, end: int) -> bool:
+        """Check whether the period at text[end] closes an abbreviation or number"""
+        head = text[:end + 1].rstrip('.')
+        last_word = head.split()[-1].lower() if head.split() else ""
+        if last_word in ABBREVIATIONS:
+            return True
+        following = text[end + 1:].lstrip('.')
+        next_char = following.lstrip()[:1]
+        if last_word in NUMBER_ABBREVIATIONS:
+            return next_char.isdigit()
+        if last_word in TIME_ABBREVIATIONS:
+            return next_char.islower()
+        # "Dr" written as "Dr." followed by a name, or a single initial ("R.")
+        return len(last_word) == 1 and last_word.isalpha()
+
+    def _find_boundary(self) -> int:
+        """Return the index just past the first usable boundary, or -1"""
+        for match in SENTENCE_END.finditer(self._buffer):
+            end = match.end()
+            punct_at = match.start()
+            if self._buffer[punct_at] == '.' and self._is_abbreviation(self._buffer, punct_at):
+                continue
+            if len(self._buffer[:end].strip()) >= self.min_chars:
+                return end
+
+        if len(self._buffer) >= self.clause_min_chars:
+            for match in CLAUSE_END.finditer(self._buffer):
+                end = match.end()
+                if len(self._buffer[:end].strip()) >= self.min_chars:
+                    return end
+
+        return -1
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add a token chunk and return any segments that are now complete"""
+        if not chunk:
+            return []
+
+        self._buffer += chunk
+        segments = []
+
+        while True:
+            end = self._find_boundary()
+            if end < 0:
+                break
+            segment = self._buffer[:end].strip()
+            self._buffer = self._buffer[end:]
+            if segment:
+                segments.append(segment)
+
+        return segments
+
+    def flush(self) -> List[str]:
+        """Return whatever is left once the LLM stream has finished"""
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return [remainder] if remainder else []
@@ -16,6 +16,7 @@ COUNTRY_RULES = {
     '86': (11, None),       # China: 11 digits
     '81': (10, None),       # Japan: 10 digits
 }
+KNOWN_CODES = sorted(COUNTRY_RULES, key=len, reverse=True)
 
 
 def validate_phone_with_feedback(phone: str) -> Tuple[bool, str, str]:
@@ -35,8 +36,12 @@ def validate_phone_with_feedback(phone: str) -> Tuple[bool, str, str]:
     if not match:
         return False, phone, "Invalid format. Use: +[country code][number]"
     
-    country_code = match.group(1)
-    number = match.group(2)
+    # ⚡ Known country codes first - the greedy pattern reads +919876543210 as +919
+    digits = cleaned[1:]
+    known = [code for code in KNOWN_CODES if digits.startswith(code)]
+    exact = [code for code in known if len(digits) - len(code) == COUNTRY_RULES[code][0]]
+    country_code = (exact or known or [match.group(1)])[0]
+    number = digits[len(country_code):]
     num_len = len(number)
     
     # ⚡ O(1) lookup for known countries
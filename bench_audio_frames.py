@@ -0,0 +1,89 @@
+# bench_audio_frames.py - Microbenchmark: Twilio media frames per second per core
+#
+# Compares the legacy base64 path (TTS b64 -> decode -> slice -> b64 -> dict ->
+# json.dumps per frame) with the binary path (raw bytes -> memoryview slice ->
+# pre-templated frame). Runs single-threaded and reports CPU time, so the
+# numbers are frames per second per core.
+#
+# Usage: python bench_audio_frames.py [seconds_of_audio] [rounds]
+
+import base64
+import json
+import os
+import sys
+import time
+
+from app.utils.audio_utils import FRAME_BYTES, TwilioMediaEncoder
+
+STREAM_SID = "MZ" + "0" * 32
+CHUNK_BYTES = 4096  # typical ElevenLabs ulaw_8000 stream chunk
+
+
+def make_chunks(seconds: int):
+    audio = os.urandom(8000 * seconds)
+    return [audio[i:i + CHUNK_BYTES] for i in range(0, len(audio), CHUNK_BYTES)]
+
+
+def legacy_path(chunks_b64, sink):
+    frames = 0
+    for audio_b64 in chunks_b64:
+        audio_bytes = base64.b64decode(audio_b64)
+        sent = 0
+        while sent < len(audio_bytes):
+            frame = audio_bytes[sent: sent + FRAME_BYTES]
+            payload = base64.b64encode(frame).decode("ascii")
+            sink(json.dumps({
+                "event": "media",
+                "streamSid": STREAM_SID,
+                "media": {"payload": payload}
+            }))
+            sent += len(frame)
+            frames += 1
+    return frames
+
+
+def binary_path(chunks, sink):
+    encoder = TwilioMediaEncoder(STREAM_SID)
+    frames = 0
+    for chunk in chunks:
+        for message in encoder.frames(chunk):
+            sink(message)
+            frames += 1
+    return frames
+
+
+def run(name, func, data, rounds):
+    sink = [].append
+    best = None
+    frames = 0
+    for _ in range(rounds):
+        start = time.process_time()
+        frames = func(data, sink)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    fps = frames / best if best else float("inf")
+    print(f"{name:<8} {frames:>8} frames  {best * 1000:>8.1f} ms CPU  {fps:>12,.0f} frames/s/core")
+    return fps
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    chunks = make_chunks(seconds)
+    chunks_b64 = [base64.b64encode(c).decode("ascii") for c in chunks]
+
+    # Sanity check: both paths must produce identical payloads
+    legacy_out, binary_out = [], []
+    legacy_path(chunks_b64[:2], legacy_out.append)
+    binary_path(chunks[:2], binary_out.append)
+    assert [json.loads(m) for m in legacy_out] == [json.loads(m) for m in binary_out]
+
+    print(f"Audio: {seconds}s of ulaw_8000 in {len(chunks)} chunks, best of {rounds}")
+    legacy_fps = run("legacy", legacy_path, chunks_b64, rounds)
+    binary_fps = run("binary", binary_path, chunks, rounds)
+    print(f"Speed-up: {binary_fps / legacy_fps:.2f}x  (real-time need: 50 frames/s per call)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# tests/conftest.py - Minimal environment so app modules import without a .env
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for name, value in {
+    "OPENAI_API_KEY": "test-key",
+    "CALL_SESSION_TTL": "3600",
+    "MAX_CALL_DURATION": "1800",
+    "MAX_RETRY_ATTEMPTS": "3",
+    "VOICE_AGENT_ENABLED": "true",
+    "ENABLE_CALL_RECORDING": "false",
+    "ENABLE_SMS_CONFIRMATION": "false",
+    "REDIS_MAX_CONNECTIONS": "10",
+    "REDIS_SOCKET_TIMEOUT": "5",
+    "REDIS_SOCKET_CONNECT_TIMEOUT": "5",
+    "EMBEDDING_MODEL_NAME": "text-embedding-3-small",
+}.items():
+    os.environ.setdefault(name, value)
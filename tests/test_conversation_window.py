@@ -0,0 +1,89 @@
+from app.utils.conversation_window import ConversationWindow, estimate_tokens
+
+
+def user(text):
+    return {"role": "user", "content": text}
+
+
+def assistant(text):
+    return {"role": "assistant", "content": text}
+
+
+def tool_calls(*call_ids):
+    return {
+        "role": "assistant",
+        "tool_calls": [
+            {"id": call_id, "type": "function", "function": {"name": "get_available_slots", "arguments": "{}"}}
+            for call_id in call_ids
+        ],
+    }
+
+
+def tool_result(call_id):
+    return {"role": "tool", "tool_call_id": call_id, "name": "get_available_slots", "content": "{}"}
+
+
+def roles(window):
+    return [message["role"] for message in window.messages()]
+
+
+def test_token_estimate_counts_content_and_tool_calls():
+    assert estimate_tokens(user("x" * 40)) == 14
+    assert estimate_tokens(tool_calls("c1")) > estimate_tokens({"role": "assistant"})
+
+
+def test_complete_tool_chain_is_kept():
+    window = ConversationWindow()
+    window.extend([user("slots tomorrow?"), tool_calls("c1", "c2"), tool_result("c1"), tool_result("c2"),
+                   assistant("10 or 11 AM.")])
+    assert roles(window) == ["user", "assistant", "tool", "tool", "assistant"]
+    assert window.dropped == 0
+
+
+def test_open_tool_chain_is_hidden_then_dropped():
+    window = ConversationWindow()
+    window.extend([user("slots tomorrow?"), tool_calls("c1", "c2"), tool_result("c1")])
+    assert roles(window) == ["user"]
+
+    window.append(user("actually, Monday"))  # barge-in: c2 never answered
+    assert roles(window) == ["user", "user"]
+    assert window.dropped == 2
+
+
+def test_orphaned_tool_results_are_rejected():
+    window = ConversationWindow()
+    window.append(user("hi"))
+    assert not window.append(tool_result("c9"))
+
+    window.extend([tool_calls("c1"), tool_result("c1")])
+    assert not window.append(tool_result("c1"))  # answered already
+    assert not window.append(tool_result("c2"))  # not part of the chain
+    assert window.dropped == 3
+
+
+def test_token_count_tracks_appends_and_drops():
+    window = ConversationWindow()
+    window.extend([user("hello there"), tool_calls("c1")])
+    window.append(user("never mind"))
+    assert window.tokens == estimate_tokens(user("hello there")) + estimate_tokens(user("never mind"))
+
+
+def test_over_budget_trims_to_a_user_boundary():
+    window = ConversationWindow(max_tokens=100)
+    for turn in range(10):
+        window.extend([user(f"question {turn} " + "x" * 40), assistant(f"answer {turn} " + "y" * 40)])
+
+    assert window.tokens <= 100
+    assert window.messages()[0]["role"] == "user"
+    evicted = window.drain_evicted()
+    assert evicted[0]["content"].startswith("question 0")
+    assert len(evicted) + len(window) == 20
+    assert window.drain_evicted() == []
+
+
+def test_seed_marks_the_window_loaded():
+    window = ConversationWindow()
+    assert not window.seeded
+    window.seed([user("hi"), assistant("Hello!")])
+    assert window.seeded
+    assert len(window) == 2
@@ -0,0 +1,208 @@
+from datetime import date
+
+import pytest
+
+from app.services.fast_path_router import FastPathRouter, ordinal_pick
+
+TODAY = date(2026, 10, 16)  # a Friday
+
+
+@pytest.fixture
+def router():
+    return FastPathRouter(match_doctor=lambda text, doctors: None)
+
+
+def time_session(**overrides):
+    session = {
+        "current_step": "selecting_time",
+        "selected_doctor_id": "doc-1",
+        "selected_date": "2026-10-19",
+        "offered_hours": [10, 11],
+    }
+    session.update(overrides)
+    return session
+
+
+# ----------------------------------------------------------------------
+# collecting_name
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("text, name", [
+    ("John Smith", "John Smith"),
+    ("my name is priya sharma", "Priya Sharma"),
+    ("it's Will", "Will"),
+])
+def test_name_is_captured(router, text, name):
+    action = router.route(text, {"current_step": "collecting_name"})
+    assert action.updates["patient_name"] == name
+    assert action.updates["current_step"] == "collecting_phone"
+
+
+@pytest.mark.parametrize("text", [
+    "I dont know",
+    "I don't know",
+    "just a sec",
+    "not sure",
+    "book it for me",
+    "it is for my mother",
+    "John 2",
+    "cardiology",
+    "tomorrow",
+    "three pm",
+    "kidney stone",
+])
+def test_non_names_go_to_the_llm(router, text):
+    assert router.route(text, {"current_step": "collecting_name"}) is None
+
+
+# ----------------------------------------------------------------------
+# selecting_time
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("text, selected", [
+    ("the first one", "10:00"),
+    ("first", "10:00"),
+    ("the last one please", "11:00"),
+    ("11 am", "11:00"),
+    ("eleven", "11:00"),
+])
+def test_offered_hour_is_picked(router, text, selected):
+    action = router.route(text, time_session())
+    assert action.updates["selected_time"] == selected
+
+
+@pytest.mark.parametrize("text", [
+    "check with my wife first",
+    "first I need to check my calendar",
+    "the third one",
+    "5 PM",
+    "at 3",
+    "not 10, 11",
+    "no 10 is bad",
+    "11 or 10",
+])
+def test_time_pick_outside_the_offer_goes_to_the_llm(router, text):
+    assert router.route(text, time_session()) is None
+
+
+# ----------------------------------------------------------------------
+# selecting_doctor
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("text, index", [
+    ("the second one", 1),
+    ("first", 0),
+    ("last one please", 2),
+    ("the one with mathew", None),
+    ("not the first, the second", None),
+    ("first I need to check", None),
+])
+def test_ordinal_must_be_the_whole_pick(text, index):
+    assert ordinal_pick(text, 3) == index
+
+
+def test_doctor_correction_goes_to_the_llm():
+    calls = []
+    router = FastPathRouter(match_doctor=lambda text, doctors: calls.append(text) or "doc-1")
+    session = {"current_step": "selecting_doctor", "offered_doctors": [{"doctor_id": "doc-1", "name": "Dr. A"}]}
+    assert router.route("not the first, the second", session) is None
+    assert not calls
+
+
+# ----------------------------------------------------------------------
+# selecting_date
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("text, iso_date", [
+    ("tomorrow", "2026-10-17"),
+    ("monday", "2026-10-19"),
+    ("next friday", "2026-10-23"),
+    ("the 20th", "2026-10-20"),
+    ("the 3rd", "2026-11-03"),
+    ("22nd", "2026-10-22"),
+    ("october 28", "2026-10-28"),
+    ("5th of november", "2026-11-05"),
+    ("march 2", "2027-03-02"),
+])
+def test_date_is_parsed(text, iso_date):
+    assert FastPathRouter._parse_date(text, TODAY) == iso_date
+
+
+@pytest.mark.parametrize("text", [
+    "5 pm works",
+    "at 3",
+    "I have 2 kids",
+    "may I come at 5",
+    "the 5 pm slot",
+    "whenever",
+    "friday or monday",
+    "tomorrow or friday",
+    "the 20th or the 21st",
+])
+def test_bare_numbers_are_not_dates(text):
+    assert FastPathRouter._parse_date(text, TODAY) is None
+
+
+def test_date_turn_calls_slot_lookup(router):
+    session = {"current_step": "selecting_date", "selected_doctor_id": "doc-1"}
+    action = router.route("the 20th", session)
+    assert action.tool_name == "get_available_slots"
+    assert action.arguments["doctor_id"] == "doc-1"
+
+
+@pytest.mark.parametrize("text", [
+    "not monday, friday",
+    "not tomorrow, friday",
+    "monday, actually friday",
+    "friday or monday",
+])
+def test_date_correction_goes_to_the_llm(router, text):
+    session = {"current_step": "selecting_date", "selected_doctor_id": "doc-1"}
+    assert router.route(text, session) is None
+
+
+def test_date_turn_without_a_date_goes_to_the_llm(router):
+    session = {"current_step": "selecting_date", "selected_doctor_id": "doc-1"}
+    assert router.route("I have 2 kids", session) is None
+
+
+# ----------------------------------------------------------------------
+# confirming_booking / routing
+# ----------------------------------------------------------------------
+
+def confirm_session():
+    return time_session(
+        current_step="confirming_booking",
+        selected_time="11:00",
+        patient_name="Priya Sharma",
+        patient_phone="+15551234567",
+    )
+
+
+@pytest.mark.parametrize("text", ["yes please", "yeah", "ok, go ahead", "yes, that's right", "sure, book it"])
+def test_yes_books_with_the_session_slots(router, text):
+    action = router.route(text, confirm_session())
+    assert action.tool_name == "book_appointment_in_hour_range"
+    assert action.arguments["time_range"] == "11 AM"
+
+
+@pytest.mark.parametrize("text", [
+    "sure, but make it 4 PM instead",
+    "right, but change it to Friday",
+    "yes but for my mother",
+    "yeah no",
+    "correct me if wrong",
+    "okay actually another day",
+])
+def test_qualified_confirmations_go_to_the_llm(router, text):
+    assert router.route(text, confirm_session()) is None
+
+
+def test_no_declines_the_booking(router):
+    action = router.route("no", confirm_session())
+    assert action.route == "booking_declined"
+    assert action.tool_name is None
+
+
+def test_questions_always_go_to_the_llm(router):
+    assert router.route("what about the first one?", time_session()) is None
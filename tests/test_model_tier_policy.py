@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from app.services.model_tier_policy import ModelTierPolicy, FAST, SMART
+from app.services.openai_service import openai_service
+
+SCHEMAS = {
+    "get_available_slots": {
+        "name": "get_available_slots",
+        "parameters": {
+            "type": "object",
+            "properties": {"doctor_id": {"type": "string"}, "date": {"type": "string"}},
+            "required": ["doctor_id", "date"],
+        },
+    },
+    "book_appointment": {
+        "name": "book_appointment",
+        "parameters": {
+            "type": "object",
+            "properties": {"doctor_id": {"type": "string"}, "hour": {"type": "integer"}},
+            "required": ["doctor_id", "hour"],
+        },
+    },
+}
+READERS = {"get_available_slots"}
+
+
+@pytest.fixture
+def policy():
+    policy = ModelTierPolicy()
+    policy.enabled = True
+    policy.max_fast_words = 5
+    policy.long_context_tokens = 1000
+    policy.min_avg_logprob = -0.7
+    policy.confidence_tokens = 4
+    return policy
+
+
+# ----------------------------------------------------------------------
+# Tier choice and confidence
+# ----------------------------------------------------------------------
+
+def test_short_turn_runs_on_fast_tier(policy):
+    assert policy.first_call_tier("tomorrow please") == (FAST, "routine")
+
+
+def test_long_utterance_and_long_context_run_on_smart_tier(policy):
+    assert policy.first_call_tier("one two three four five six") == (SMART, "long_utterance")
+    assert policy.first_call_tier("hi", context_tokens=2000) == (SMART, "long_context")
+
+
+def test_tiering_disabled(policy):
+    policy.enabled = False
+    assert policy.first_call_tier("hi") == (SMART, "tiering_disabled")
+    assert policy.verbalise_tier() == (SMART, "tiering_disabled")
+
+
+def test_confidence_is_decided_by_sentence_or_token_count(policy):
+    assert policy.confidence_decided("Sure.", [-0.1])
+    assert policy.confidence_decided("Sure thing let me", [-0.1] * 4)
+    assert not policy.confidence_decided("Sure thing", [-0.1, -0.1])
+
+
+def test_low_confidence_is_the_average_logprob(policy):
+    assert policy.is_low_confidence([-2.0, -0.1])
+    assert not policy.is_low_confidence([-0.2, -0.3])
+    assert not policy.is_low_confidence([])
+
+
+# ----------------------------------------------------------------------
+# Tool call validation
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("call, error", [
+    ({"name": "get_available_slots", "arguments": {"doctor_id": "d1", "date": "2026-10-20"}}, None),
+    ({"name": "cancel_everything", "arguments": {}}, "unknown tool cancel_everything"),
+    ({"name": "get_available_slots", "arguments": "d1"}, "arguments are not an object"),
+    ({"name": "get_available_slots", "arguments": {"doctor_id": "d1"}}, "missing date"),
+    ({"name": "book_appointment", "arguments": {"doctor_id": "d1", "hour": "ten"}}, "hour should be integer"),
+])
+def test_validate_tool_call(call, error):
+    assert ModelTierPolicy.validate_tool_call(call, SCHEMAS) == error
+
+
+# ----------------------------------------------------------------------
+# stream_with_escalation
+# ----------------------------------------------------------------------
+
+def tool_call(call_id, name, **arguments):
+    return {"type": "tool_call", "data": {"id": call_id, "name": name, "arguments": arguments}}
+
+
+def done(finish_reason="tool_calls"):
+    return {"type": "done", "data": {"finish_reason": finish_reason}}
+
+
+def run_escalation(monkeypatch, fast_events, smart_events=()):
+    """Events of stream_with_escalation, each tagged with whether the fast stream had finished"""
+    progress = {"fast_done": False}
+
+    async def fake_stream(messages, functions=None, use_fast_model=False, **kwargs):
+        for event in (fast_events if use_fast_model else smart_events):
+            if use_fast_model and event["type"] == "done":
+                progress["fast_done"] = True
+            yield event
+
+    monkeypatch.setattr(openai_service, "stream_with_tools", fake_stream)
+
+    async def collect():
+        events = []
+        async for event in openai_service.stream_with_escalation(
+            [], functions=list(SCHEMAS.values()), tier=FAST, early_tools=READERS
+        ):
+            events.append((event, progress["fast_done"]))
+        return events
+
+    return asyncio.run(collect())
+
+
+def test_valid_read_call_is_released_before_the_stream_ends(monkeypatch):
+    events = run_escalation(monkeypatch, [
+        tool_call("c1", "get_available_slots", doctor_id="d1", date="2026-10-20"),
+        done(),
+    ])
+    first, fast_done = events[0]
+    assert first["data"]["id"] == "c1"
+    assert not fast_done
+
+
+def test_writer_call_is_held_until_the_stream_ends(monkeypatch):
+    events = run_escalation(monkeypatch, [
+        tool_call("c1", "book_appointment", doctor_id="d1", hour=10),
+        done(),
+    ])
+    first, fast_done = events[0]
+    assert first["data"]["id"] == "c1"
+    assert fast_done
+
+
+def test_escalation_revokes_released_calls(monkeypatch):
+    smart = [tool_call("s1", "get_available_slots", doctor_id="d1", date="2026-10-20"), done()]
+    events = run_escalation(monkeypatch, [
+        tool_call("c1", "get_available_slots", doctor_id="d1", date="2026-10-20"),
+        tool_call("c2", "book_appointment", doctor_id="d1"),
+        done(),
+    ], smart)
+    types = [event["type"] for event, _ in events]
+    assert types == ["tool_call", "escalated", "tool_call", "done"]
+    escalated = events[1][0]["data"]
+    assert escalated["reason"] == "invalid_tool_args: missing hour"
+    assert escalated["revoked"] == ["c1"]
+
+
+def test_empty_fast_reply_escalates(monkeypatch):
+    events = run_escalation(monkeypatch, [done("stop")], [{"type": "text", "data": "Hello."}, done("stop")])
+    assert events[0][0]["data"]["reason"] == "empty"
+    assert events[0][0]["data"]["revoked"] == []
@@ -0,0 +1,70 @@
+import pytest
+
+from app.utils.name_index import NameIndex, normalize_words, phonetic_key
+
+DOCTORS = {
+    "d1": "Dr. Rahul Sharma",
+    "d2": "Dr. Anjali Srivastava",
+    "d3": "Dr. Priya Shah",
+    "d4": "Dr. Vikram Singh",
+    "d5": "Dr. Rohit Sharma",
+}
+
+
+@pytest.fixture
+def index():
+    index = NameIndex()
+    index.sync(DOCTORS)
+    return index
+
+
+def test_titles_are_dropped():
+    assert normalize_words("Dr. Rahul SHARMA") == ["rahul", "sharma"]
+    assert normalize_words("doctor Singh") == ["singh"]
+
+
+@pytest.mark.parametrize("variant, canonical", [
+    ("shrivastav", "srivastava"),
+    ("sarma", "sharma"),
+    ("vikram", "wikram"),
+    ("sing", "singh"),
+])
+def test_spelling_variants_share_a_phonetic_key(variant, canonical):
+    assert phonetic_key(variant) == phonetic_key(canonical)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Rahul Sharma", "d1"),
+    ("doctor srivastav", "d2"),
+    ("Shrivastava", "d2"),
+    ("Vikram Sing", "d4"),
+    ("raahul sarma", "d1"),
+])
+def test_misheard_names_find_the_doctor(index, query, expected):
+    assert index.search(query, limit=1)[0][0] == expected
+
+
+def test_unrelated_query_finds_nothing(index):
+    assert index.search("appointment tomorrow") == []
+
+
+def test_short_words_alone_are_not_searched(index):
+    assert index.search("Dr. Al") == []
+
+
+def test_allowed_restricts_the_candidates(index):
+    results = index.search("Sharma", limit=5, allowed={"d5"})
+    assert [item_id for item_id, _ in results] == ["d5"]
+
+
+def test_sync_adds_renames_and_removes(index):
+    changed = index.sync({"d1": "Dr. Rahul Verma", "d2": DOCTORS["d2"], "d6": "Dr. Meera Iyer"})
+    assert changed == 5  # d3, d4, d5 removed; d1 renamed; d6 added
+    assert len(index) == 3
+    assert "d5" not in index
+    assert index.search("Verma", limit=1)[0][0] == "d1"
+    assert index.search("Rohit Sharma", allowed={"d5"}) == []
+
+
+def test_sync_without_changes_is_a_no_op(index):
+    assert index.sync(DOCTORS) == 0
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from app.services.semantic_cache import SemanticResponseCache
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture
+def cache():
+    cache = SemanticResponseCache()
+    cache.threshold = 0.9
+    cache.ttl = 60
+    cache.max_entries = 3
+    return cache
+
+
+def booking_session(**overrides):
+    session = {
+        "current_step": "selecting_time",
+        "selected_doctor_id": "doc-1",
+        "selected_date": "2026-10-20",
+        "offered_hours": [10, 11],
+    }
+    session.update(overrides)
+    return session
+
+
+# ----------------------------------------------------------------------
+# Scope
+# ----------------------------------------------------------------------
+
+def test_only_informational_intents_are_cacheable():
+    assert SemanticResponseCache.scope_for("doctor_search", {}) is None
+    assert SemanticResponseCache.scope_for("hybrid", {}) is None
+    assert SemanticResponseCache.scope_for("knowledge_base", {}) is not None
+
+
+def test_same_booking_state_shares_a_scope():
+    assert (SemanticResponseCache.scope_for("knowledge_base", booking_session())
+            == SemanticResponseCache.scope_for("knowledge_base", booking_session()))
+
+
+@pytest.mark.parametrize("change", [
+    {"current_step": "selecting_date"},
+    {"selected_doctor_id": "doc-2"},
+    {"selected_date": "2026-10-21"},
+    {"offered_hours": [14, 15]},
+])
+def test_booking_state_is_part_of_the_scope(change):
+    assert (SemanticResponseCache.scope_for("knowledge_base", booking_session(**change))
+            != SemanticResponseCache.scope_for("knowledge_base", booking_session()))
+
+
+# ----------------------------------------------------------------------
+# Lookup / store
+# ----------------------------------------------------------------------
+
+def test_similar_question_hits_within_its_scope(cache):
+    cache.store("a", unit(1, 0, 0), "what are your timings", "We're open 6 AM to 11 PM.")
+    response, similarity = cache.lookup("a", unit(1, 0.1, 0))
+    assert response == "We're open 6 AM to 11 PM."
+    assert similarity > 0.9
+
+
+def test_other_scope_or_dissimilar_question_misses(cache):
+    cache.store("a", unit(1, 0, 0), "what are your timings", "We're open 6 AM to 11 PM.")
+    assert cache.lookup("b", unit(1, 0, 0)) is None
+    assert cache.lookup("a", unit(0, 1, 0)) is None
+    assert cache.stats["misses"] == 2
+
+
+def test_near_duplicate_refreshes_the_entry(cache):
+    cache.store("a", unit(1, 0, 0), "timings", "old")
+    cache.store("a", unit(1, 0.05, 0), "the timings", "new")
+    assert len(cache.entries) == 1
+    assert cache.lookup("a", unit(1, 0, 0))[0] == "new"
+
+
+def test_expired_entries_are_dropped(cache):
+    cache.store("a", unit(1, 0, 0), "timings", "We're open 6 AM to 11 PM.")
+    entry = next(iter(cache.entries.values()))
+    entry["created_at"] -= cache.ttl + 1
+    assert cache.lookup("a", unit(1, 0, 0)) is None
+    assert not cache.entries and not cache.scopes
+    assert cache.stats["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    for index, vector in enumerate([unit(1, 0, 0), unit(0, 1, 0), unit(0, 0, 1)]):
+        cache.store("a", vector, f"q{index}", f"r{index}")
+    cache.lookup("a", unit(1, 0, 0))  # q0 is now the most recently used
+    cache.store("b", unit(1, 0, 0), "q3", "r3")
+
+    assert cache.stats["evictions"] == 1
+    assert [entry["query"] for entry in cache.entries.values()] == ["q2", "q0", "q3"]
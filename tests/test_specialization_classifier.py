@@ -0,0 +1,48 @@
+import pytest
+
+from app.services.specialization_classifier import SpecializationClassifier
+
+
+@pytest.fixture
+def classifier(monkeypatch):
+    classifier = SpecializationClassifier()
+    classifier.enabled = True
+    memo = {}
+    monkeypatch.setattr(classifier, "_memo_get", memo.get)
+    monkeypatch.setattr(classifier, "_memo_set", memo.__setitem__)
+    monkeypatch.setattr(classifier, "_ensure_centroids", lambda: False)
+    classifier.memo = memo
+    return classifier
+
+
+@pytest.mark.parametrize("symptom, expected", [
+    ("chest pain for the period of two days", ["Cardiology", "General Medicine"]),
+    ("stressed about my diabetes", ["General Medicine"]),
+    ("irregular heartbeat", ["Cardiology", "General Medicine"]),
+    ("severe anxiety and a panic attack", ["Psychiatry", "General Medicine"]),
+    ("my kid has a rash", ["Pediatrics", "Dermatology", "General Medicine"]),
+])
+def test_unambiguous_keywords_decide(classifier, symptom, expected):
+    assert classifier.classify(symptom) == expected
+
+
+@pytest.mark.parametrize("symptom", [
+    "heart burn after meals",
+    "heartburn after meals",
+    "missed my period",
+    "I need a doctor",
+    "kidney stones",
+])
+def test_ambiguous_or_missing_keywords_defer_to_the_llm(classifier, symptom):
+    assert classifier.classify(symptom) is None
+
+
+def test_keyword_hits_are_not_memoised(classifier):
+    classifier.classify("irregular heartbeat")
+    assert classifier.memo == {}
+
+
+def test_llm_answer_is_memoised_and_reused(classifier):
+    classifier.remember("heart burn after meals", ["Gastroenterology", "General Medicine"])
+    assert classifier.classify("Heart burn after meals!") == ["Gastroenterology", "General Medicine"]
+    assert classifier.stats["memo"] == 1
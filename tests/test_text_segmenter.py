@@ -0,0 +1,55 @@
+from app.utils.text_segmenter import SentenceSegmenter
+
+
+def feed_all(text, **kwargs):
+    segmenter = SentenceSegmenter(**kwargs)
+    return segmenter.feed(text), segmenter.flush()
+
+
+def test_sentence_closes_on_terminator():
+    segments, rest = feed_all("Your appointment is confirmed. See you soon")
+    assert segments == ["Your appointment is confirmed."]
+    assert rest == ["See you soon"]
+
+
+def test_pm_ends_a_sentence():
+    segments, _ = feed_all("Dr. Sharma can see you at 3 PM. Shall I book it?")
+    assert segments[0] == "Dr. Sharma can see you at 3 PM."
+
+
+def test_dotted_pm_followed_by_lowercase_is_not_a_boundary():
+    segments, rest = feed_all("I can book you at 3 p.m. on Monday if that works. Okay?", min_chars=5)
+    assert segments == ["I can book you at 3 p.m. on Monday if that works."]
+    assert rest == ["Okay?"]
+
+
+def test_no_ends_a_sentence():
+    segments, _ = feed_all("No. That slot is already taken, sorry.", min_chars=2)
+    assert segments[0] == "No."
+
+
+def test_no_before_a_number_is_an_abbreviation():
+    segments, rest = feed_all("Please go to room No. 5 on the first floor. Thanks", min_chars=5)
+    assert segments == ["Please go to room No. 5 on the first floor."]
+    assert rest == ["Thanks"]
+
+
+def test_title_abbreviation_does_not_split():
+    segments, _ = feed_all("Dr. Priya Desai is available tomorrow. Book it?")
+    assert segments == ["Dr. Priya Desai is available tomorrow."]
+
+
+def test_streamed_tokens_emit_as_soon_as_sentence_ends():
+    segmenter = SentenceSegmenter(min_chars=10)
+    emitted = []
+    for token in ["See", " you", " at", " 3", " PM", ".", " Anything", " else", "?"]:
+        emitted += segmenter.feed(token)
+    assert emitted == ["See you at 3 PM."]
+    assert segmenter.flush() == ["Anything else?"]
+
+
+def test_long_clause_is_split_on_comma():
+    text = "We have openings with cardiology and neurology this week, mornings are mostly free"
+    segments, rest = feed_all(text, clause_min_chars=60)
+    assert segments == ["We have openings with cardiology and neurology this week,"]
+    assert rest == ["mornings are mostly free"]